@@ -0,0 +1,64 @@
+"""
+Benchmark of validating every call versus only the outermost call of a
+deeply recursive function.
+
+This is not part of the unittests, as wall-clock timings are unreliable on
+loaded machines. Run it from the top directory of the code with
+`python -m benchmarks.recursion`.
+"""
+
+from py_validate.api import outermost_only, validate_inputs, validate_outputs
+
+from typing import Dict, List, Union
+
+import sys
+import time
+
+DEPTH = 500
+REPEAT = 10
+
+
+def make_tree(depth):
+    tree = {"value": 0, "children": []}
+    node = tree
+
+    for i in range(1, depth):
+        child = {"value": i, "children": []}
+        node["children"].append(child)
+        node = child
+
+    return tree
+
+
+def make_sum(outermost):
+    @validate_inputs(node=Dict[str, Union[int, List[Dict[str, object]]]])
+    @validate_outputs(-1, int)
+    def tree_sum(node):
+        return node["value"] + sum(tree_sum(child)
+                                   for child in node["children"])
+
+    if outermost:
+        tree_sum = outermost_only()(tree_sum)
+
+    return tree_sum
+
+
+def main():
+    tree = make_tree(DEPTH)
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 10 * DEPTH))
+
+    for outermost in (False, True):
+        tree_sum = make_sum(outermost)
+        start = time.perf_counter()
+
+        for _ in range(REPEAT):
+            tree_sum(tree)
+
+        elapsed = (time.perf_counter() - start) / REPEAT
+        print("{label}: {ms:.2f} ms per call".format(
+            label="outermost only" if outermost else "every call",
+            ms=elapsed * 1e3))
+
+
+if __name__ == "__main__":
+    main()
@@ -5,4 +5,4 @@ conda create -n validate python=$PYTHON_VERSION || exit 1
 source activate validate
 
 echo "Installing packages..."
-conda install numpy flake8 pytest
+conda install numpy pandas flake8 pytest
@@ -7,14 +7,43 @@ outputs before and after the function is called respectively.
 """
 
 from py_validate.backend import ValidatedFunction
+from py_validate.backend.annotations import update_from_annotations
+from py_validate.backend.arrays import (ArraySpec, ParallelArrayCheck,
+                                        bind_symbols, free_shared_array,
+                                        shared_array)
+from py_validate.backend.asyncs import AsyncValidator
+from py_validate.backend.budgets import TimeBudget
+from py_validate.backend.bulk import (ValidationStub, check_policy,
+                                      install_stubs)
+from py_validate.backend.buffers import BufferSpec
+from py_validate.backend.caching import IdentityCache
+from py_validate.backend.contracts import InheritContracts
+from py_validate.backend.files import FileSpec
+from py_validate.backend.frames import ColumnSpec, DataFrameSchema
 from py_validate.backend.helpers import DocSubstitution
 from py_validate.backend.base import validator_doc, output_len_doc
+from py_validate.backend.generics import set_generic_limits
+from py_validate.backend.profiling import ValidatorProfiler
+from py_validate.backend.registry import dump_registry, registered_functions
+from py_validate.backend.reporting import FailureReporter
+from py_validate.backend.scopes import trusted
+from py_validate.backend.specs import load_specs
 
-__all__ = ["validate_inputs", "validate_outputs"]
+import sys
+
+__all__ = ["ArraySpec", "AsyncValidator", "BufferSpec", "ColumnSpec",
+           "DataFrameSchema", "FailureReporter", "FileSpec", "IdentityCache",
+           "InheritContracts", "ParallelArrayCheck", "TimeBudget",
+           "ValidatorProfiler", "cache_identity", "dump_registry",
+           "filter_valid", "free_shared_array", "load_specs", "outermost_only",
+           "registered_functions", "set_generic_limits", "set_profiler",
+           "set_reporter", "shared_array", "time_budget", "trusted",
+           "validate_annotations", "validate_class", "validate_inputs",
+           "validate_module", "validate_outputs", "warn_only"]
 
 validator_type_doc = """Each validator can either be a shortcut string, type,
-or callable, which is used to check whether the value
-supplied for that argument is valid."""
+`typing` construct, or callable, which is used to check
+whether the value supplied for that argument is valid."""
 
 
 @DocSubstitution(tabs=2, validator_doc=validator_doc,
@@ -88,3 +117,391 @@ def validate_outputs(exp_output_len=None, *validators):
         return f
 
     return wrapper
+
+
+def validate_annotations(lazy=False):
+    """
+    Wrapper for validating the inputs and output of a function
+    against its type annotations.
+
+    Each annotated argument is validated as if it were passed to
+    `validate_inputs`, and the return annotation (if any) is used to
+    validate the entire returned value as if it were passed to
+    `validate_outputs` with an expected output length of -1. If output
+    validators are already set (i.e. `validate_outputs` is applied
+    first), the return annotation is not used, and if `validate_outputs`
+    is applied afterwards, its validators replace the return annotation.
+    As with static type checkers, a float annotation also accepts an int
+    (and a complex one an int or float), a TypedDict is checked as a dict,
+    and a Protocol that is not `runtime_checkable` is not checked.
+
+    String (i.e. forward reference) annotations are resolved only once.
+    Annotations on *args and **kwargs are ignored.
+
+    Parameters
+    ----------
+    lazy : bool, default False
+        Whether to resolve the annotations on the first call instead of
+        at decoration time. This keeps module import fast when many
+        functions are decorated, and allows annotations to refer to
+        names defined after the function.
+
+    Returns
+    -------
+    validator_decorator : callable
+        A function decorator that can be used to validate function inputs
+        and outputs, and can be stacked with `validate_inputs` and
+        `validate_outputs` for arguments that are not annotated.
+    """
+
+    def wrapper(f):
+        if not isinstance(f, ValidatedFunction):
+            f = ValidatedFunction(f)
+
+        if lazy:
+            f.defer_update(update_from_annotations)
+        else:
+            update_from_annotations(f)
+
+        return f
+
+    return wrapper
+
+
+def validate_class(policy="annotations", include=None, exclude=None):
+    """
+    Wrapper for validating every method of a class.
+
+    Methods are replaced by lightweight stubs, and the validation plan of
+    each is only built when it is first called (or accessed on an instance),
+    after which the stub replaces itself with the validated method. Large
+    classes thus cost next to nothing to validate at import time.
+
+    Parameters
+    ----------
+    policy : dict or "annotations", default "annotations"
+        How to validate each method. A dictionary maps argument names to
+        validators, which are applied to every method with an argument of
+        that name (validators set on a method with `validate_inputs` take
+        precedence). With "annotations", methods are validated against their
+        annotations, as with `validate_annotations`. Methods with nothing to
+        validate are left as they are.
+    include : iterable, default None
+        The names of the methods to validate. If None, every method whose
+        name does not start with an underscore is validated, including
+        static and class methods.
+    exclude : iterable, default None
+        The names of methods not to validate.
+
+    Returns
+    -------
+    class_decorator : callable
+        A class decorator that validates the methods of the class.
+
+    Raises
+    ------
+    TypeError : the policy was neither a dictionary nor "annotations".
+    ValueError : the policy had an invalid shortcut expression or array spec.
+    """
+
+    def wrapper(cls):
+        install_stubs(cls, policy, include=include, exclude=exclude)
+        return cls
+
+    check_policy(policy)
+    return wrapper
+
+
+def validate_module(module, policy="annotations", include=None, exclude=None):
+    """
+    Validate every function defined in a module.
+
+    Functions are replaced by lightweight stubs, and the validation plan of
+    each is only built when it is first called, after which the stub replaces
+    itself in the module with the validated function. This is usually called
+    at the end of the module itself, e.g. `validate_module(__name__)`, and
+    costs far less import time than decorating each function.
+
+    Parameters
+    ----------
+    module : module or str
+        The module, or its name.
+    policy : dict or "annotations", default "annotations"
+        How to validate each function. A dictionary maps argument names to
+        validators, which are applied to every function with an argument of
+        that name (validators set on a function with `validate_inputs` take
+        precedence). With "annotations", functions are validated against
+        their annotations, as with `validate_annotations`. Functions with
+        nothing to validate are left as they are.
+    include : iterable, default None
+        The names of the functions to validate. If None, every function
+        defined in the module whose name does not start with an underscore
+        is validated. Functions imported from other modules are skipped.
+    exclude : iterable, default None
+        The names of functions not to validate.
+
+    Returns
+    -------
+    names : list
+        The names of the functions that are validated.
+
+    Raises
+    ------
+    TypeError : the policy was neither a dictionary nor "annotations".
+    ValueError : the policy had an invalid shortcut expression or array spec.
+    """
+
+    if isinstance(module, str):
+        module = sys.modules[module]
+
+    return install_stubs(module, policy, include=include, exclude=exclude)
+
+
+def set_profiler(profiler):
+    """
+    Set the profiler that times validators of every validated function.
+
+    A profiler set on an individual function via its `set_profiler`
+    method takes precedence over this one.
+
+    Parameters
+    ----------
+    profiler : ValidatorProfiler, callable, or None
+        The profiler to use. A `ValidatorProfiler` aggregates timings into
+        histograms (which can be retrieved with its `dump` method) and can
+        sample a fraction of calls to keep overhead low. A callable is
+        called with the function name, argument name (e.g. "a" or
+        "Output 0"), and elapsed time in seconds for each validator on
+        every call. If None, profiling is disabled.
+    """
+
+    ValidatedFunction.set_default_profiler(profiler)
+
+
+def warn_only(reporter=None):
+    """
+    Wrapper for reporting validation failures of a function instead of
+    raising them.
+
+    Parameters
+    ----------
+    reporter : FailureReporter, callable, or None, default None
+        The reporter that failures go to, subject to its rate limits. A
+        callable is called with the function name, argument name, the
+        validation error, and the number of failures suppressed since the
+        last report. If None, a FailureReporter that logs warnings to the
+        "py_validate" logger is used.
+
+    Returns
+    -------
+    validator_decorator : callable
+        A function decorator that can be stacked with `validate_inputs`
+        and `validate_outputs`.
+    """
+
+    if reporter is None:
+        reporter = FailureReporter()
+
+    def wrapper(f):
+        if not isinstance(f, ValidatedFunction):
+            f = ValidatedFunction(f)
+
+        f.set_reporter(reporter)
+        return f
+
+    return wrapper
+
+
+def time_budget(budget):
+    """
+    Wrapper for running the validators of a function within a time budget.
+
+    Validators other than types then run on a worker thread. If one takes
+    longer than the budget, the budget's policy applies: the value passes,
+    fails validation, or passes with a warning. A validator that repeatedly
+    overruns the budget is disabled by the budget's circuit breaker.
+
+    Individual validators can also be put under a budget with the
+    `limit` method of a `TimeBudget`.
+
+    Parameters
+    ----------
+    budget : TimeBudget or float
+        The budget to use. A number is the budget in seconds,
+        with the default policy and circuit breaker.
+
+    Returns
+    -------
+    validator_decorator : callable
+        A function decorator that can be stacked with `validate_inputs`
+        and `validate_outputs`.
+    """
+
+    def wrapper(f):
+        if not isinstance(f, ValidatedFunction):
+            f = ValidatedFunction(f)
+
+        f.set_time_budget(budget)
+        return f
+
+    return wrapper
+
+
+def cache_identity(cache=True):
+    """
+    Wrapper for skipping validation of immutable objects that already
+    passed the validators of a function.
+
+    Once a specific object (e.g. a large tuple or frozenset) passes a
+    validator, later calls with the very same object skip that validator.
+    Objects are identified by identity, not equality, and must never be
+    mutated once they have been passed to the function.
+
+    Parameters
+    ----------
+    cache : IdentityCache or True, default True
+        The cache to use, which can be shared between functions and sets
+        which types of objects are cached and how many. If True, a new
+        IdentityCache with the default parameters is used.
+
+    Returns
+    -------
+    validator_decorator : callable
+        A function decorator that can be stacked with `validate_inputs`
+        and `validate_outputs`.
+    """
+
+    def wrapper(f):
+        if not isinstance(f, ValidatedFunction):
+            f = ValidatedFunction(f)
+
+        f.set_identity_cache(cache)
+        return f
+
+    return wrapper
+
+
+def outermost_only():
+    """
+    Wrapper for validating only the outermost call of a recursive function.
+
+    Calls made while the function is already running in the current thread
+    (or asyncio task) skip validation, so only the top-level call's inputs
+    and its final output are validated.
+
+    Returns
+    -------
+    validator_decorator : callable
+        A function decorator that can be stacked with `validate_inputs`
+        and `validate_outputs`.
+    """
+
+    def wrapper(f):
+        if not isinstance(f, ValidatedFunction):
+            f = ValidatedFunction(f)
+
+        f.set_outermost_only(True)
+        return f
+
+    return wrapper
+
+
+def set_reporter(reporter):
+    """
+    Set the reporter that validation failures of every validated function
+    go to instead of being raised.
+
+    A reporter set on an individual function (e.g. via `warn_only`)
+    takes precedence over this one.
+
+    Parameters
+    ----------
+    reporter : FailureReporter, callable, or None
+        The reporter to use (see `warn_only`). If None, validation
+        failures are raised as usual.
+    """
+
+    ValidatedFunction.set_default_reporter(reporter)
+
+
+def filter_valid(func, iterable, errors=False):
+    """
+    Lazily filter a stream of argument sets by a function's input validators.
+
+    The function itself is never called. Each item is only checked against
+    the input validators attached via `validate_inputs`, so this can be used
+    to screen rows in a pipeline before handing them off for processing.
+
+    Parameters
+    ----------
+    func : ValidatedFunction
+        A function decorated with `validate_inputs` and / or `validate_outputs`
+        whose input validators we are to check each item against.
+    iterable : iterable
+        An iterable of argument sets. Each argument set can either be a dict,
+        which is interpreted as keyword arguments, or any other iterable
+        (e.g. a tuple), which is interpreted as positional arguments.
+    errors : bool, default False
+        Whether to yield `(item, error)` pairs for every item instead of
+        only yielding the items that pass validation. For items that pass,
+        the error is None.
+
+    Returns
+    -------
+    valid_iter : generator
+        A generator yielding the items that pass validation, or `(item, error)`
+        pairs if `errors=True`. Items are consumed one at a time, so memory
+        usage is constant regardless of the length of `iterable`.
+
+    Raises
+    ------
+    TypeError : `func` was not a function decorated for validation.
+    """
+
+    if isinstance(func, ValidationStub):
+        func = func.resolve()
+
+    if not isinstance(func, ValidatedFunction):
+        raise TypeError("Expected a function decorated with "
+                        "validate_inputs or validate_outputs")
+
+    if func._deferred_updates:
+        func.apply_deferred_updates()
+
+    if func._shared_symbols:
+        # Dimension symbols of array specs are bound anew for each item.
+        def check(args, kwargs):
+            check_value = bind_symbols(func._check_value, {})
+            func._validate_inputs(args, kwargs, check_value)
+    else:
+        check = func._validate_inputs
+
+    return _filter_valid(check, iter(iterable), errors)
+
+
+def _filter_valid(check, iterator, errors):
+    """
+    Generator underlying `filter_valid`.
+
+    The validation call is bound once, and the `try` block is only entered
+    for its cost when an item actually fails, so passing items pay no
+    exception-handling overhead.
+    """
+
+    no_kwargs = {}
+
+    for item in iterator:
+        try:
+            if isinstance(item, dict):
+                check((), item)
+            else:
+                check(tuple(item), no_kwargs)
+        except Exception as e:
+            if errors:
+                yield item, e
+            continue
+
+        if errors:
+            yield item, None
+        else:
+            yield item
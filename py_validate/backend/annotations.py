@@ -0,0 +1,155 @@
+"""
+Helpers for building validators from function type annotations.
+"""
+
+import collections.abc
+import types
+import typing
+
+# Annotations that also accept the narrower numeric types (see PEP 484).
+_numeric_tower = {float: float | int, complex: complex | float | int}
+
+
+def _is_static_protocol(klass):
+    """
+    Check whether a class is a Protocol that is not `runtime_checkable`, and
+    thus does not support instance checks.
+    """
+
+    return (getattr(klass, "_is_protocol", False) and
+            not getattr(klass, "_is_runtime_protocol", False))
+
+
+def translate_annotation(hint):
+    """
+    Translate a type annotation into the validator for the values it
+    describes.
+
+    A `float` annotation also accepts an int, and a `complex` annotation
+    also accepts an int or float, as with static type checkers. A TypedDict
+    is checked as a dict, and a Protocol that is not `runtime_checkable`
+    (which does not support instance checks) is not checked at all.
+
+    Parameters
+    ----------
+    hint : object
+        The resolved annotation.
+
+    Returns
+    -------
+    validator : object
+        The annotation, or its translation if it (or any of its arguments)
+        has to be translated.
+    """
+
+    origin = typing.get_origin(hint)
+
+    if isinstance(hint, type) and origin is None:
+        if hint in _numeric_tower:
+            return _numeric_tower[hint]
+
+        if typing.is_typeddict(hint):
+            return dict
+
+        if _is_static_protocol(hint):
+            return typing.Any
+
+        return hint
+
+    if _is_static_protocol(origin):  # e.g. a generic Protocol
+        return typing.Any
+
+    args = typing.get_args(hint)
+
+    # The arguments of these are values, not annotations.
+    if (not args or origin is typing.Literal or
+            origin is collections.abc.Callable):
+        return hint
+
+    translated = tuple(translate_annotation(arg) for arg in args)
+
+    if all(arg is translated_arg
+           for arg, translated_arg in zip(args, translated)):
+        return hint
+
+    if origin is typing.Union or origin is types.UnionType:
+        return typing.Union[translated]
+
+    if isinstance(hint, types.GenericAlias):  # e.g. list[float]
+        return types.GenericAlias(origin, translated)
+
+    return hint.copy_with(translated)
+
+
+def get_validators(f):
+    """
+    Get the input and output validators described by a function's annotations.
+
+    Parameters
+    ----------
+    f : callable
+        The function whose annotations we are to resolve.
+
+    Returns
+    -------
+    validators : tuple
+        A tuple of the input validators (a dict mapping argument names to
+        their resolved annotations) and the output validator (the resolved
+        return annotation, or None if there is no return annotation). See
+        `translate_annotation` for how annotations are resolved.
+
+    Raises
+    ------
+    NameError : a string annotation could not be resolved.
+    """
+
+    hints = typing.get_type_hints(f)
+
+    code = f.__code__
+    arg_names = code.co_varnames[:code.co_argcount + code.co_kwonlyargcount]
+
+    input_validators = dict((name, translate_annotation(hints[name]))
+                            for name in arg_names if name in hints)
+    output_validator = hints.get("return")
+
+    if output_validator is not None:
+        output_validator = translate_annotation(output_validator)
+
+    return input_validators, output_validator
+
+
+def update_from_annotations(validated, skip_existing=False):
+    """
+    Update the validators of a ValidatedFunction from its annotations.
+
+    The return annotation is skipped if output validators (or an expected
+    output length) are already set, e.g. with `validate_outputs`, as these
+    describe the outputs more precisely. Outputs set later on likewise
+    replace those set from the return annotation.
+
+    Parameters
+    ----------
+    validated : ValidatedFunction
+        The wrapped function whose validators we are to update.
+    skip_existing : bool, default False
+        Whether to skip the annotations of arguments that already have
+        validators, rather than raising an error for them.
+    """
+
+    input_validators, output_validator = get_validators(validated.f)
+
+    if skip_existing:
+        existing = validated._input_validators
+        input_validators = {name: validator for name, validator
+                            in input_validators.items()
+                            if name not in existing}
+
+    validated.update_input_validators(**input_validators)
+
+    has_outputs = (bool(validated._output_validators) or
+                   validated._exp_output_len is not None)
+
+    if output_validator is not None and not has_outputs:
+        validated.update_exp_output_len(-1)
+        validated.update_output_validators(output_validator)
+        validated._annotated_outputs = True
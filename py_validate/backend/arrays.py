@@ -0,0 +1,846 @@
+"""
+Validators for NumPy array arguments.
+
+NumPy is an optional dependency, so it is only imported when one of
+these validators is actually used. The same goes for the (slow to import)
+executors and shared memory used to check large arrays in parallel.
+"""
+
+import functools
+import re
+import threading
+
+
+def import_numpy():
+    """
+    Import NumPy, raising an informative error if it is not installed.
+
+    Returns
+    -------
+    np : module
+        The NumPy module.
+
+    Raises
+    ------
+    ImportError : NumPy is not installed.
+    """
+
+    try:
+        import numpy as np
+    except ImportError:
+        raise ImportError("numpy not found. Please install "
+                          "with `pip install numpy`")
+
+    return np
+
+
+def all_even(chunk):
+    """
+    Vectorized check that all elements of an integer array are even.
+    """
+
+    return not (chunk % 2).any()
+
+
+def all_odd(chunk):
+    """
+    Vectorized check that all elements of an integer array are odd.
+    """
+
+    return bool((chunk % 2 == 1).all())
+
+
+def all_finite(chunk):
+    """
+    Vectorized check that all elements of an array are finite.
+    """
+
+    return bool(import_numpy().isfinite(chunk).all())
+
+
+class InRange(object):
+    """
+    Vectorized check that all elements of an array satisfy lo <= x < hi.
+
+    This is a class rather than a closure so that it can be
+    pickled and sent to worker processes.
+    """
+
+    def __init__(self, lo, hi):
+        self.lo = lo
+        self.hi = hi
+
+    def __call__(self, chunk):
+        # min() and max() avoid allocating boolean temporaries.
+        return bool(chunk.min() >= self.lo and chunk.max() < self.hi)
+
+    def __repr__(self):
+        return "range({lo}, {hi})".format(lo=self.lo, hi=self.hi)
+
+
+# For internal use only. The only thing that should
+# access this is "ParallelArrayCheck."
+array_checks = {"even": all_even, "odd": all_odd, "finite": all_finite}
+
+# Segments created by `shared_array`, keyed by the address of their buffer.
+_shared_segments = {}
+_shared_lock = threading.Lock()
+
+# Executors shared across checks, keyed by kind and number of workers.
+_executors = {}
+_executors_lock = threading.Lock()
+
+
+def shared_array(shape, dtype=float):
+    """
+    Create a NumPy array backed by shared memory.
+
+    A `ParallelArrayCheck` with `processes=True` can check such arrays (and
+    views of them) in worker processes without copying any of their data.
+
+    Parameters
+    ----------
+    shape : int or tuple
+        The shape of the array.
+    dtype : data-type, default float
+        The data type of the array.
+
+    Returns
+    -------
+    arr : numpy.ndarray
+        The (uninitialized) array. Call `free_shared_array` once it is
+        no longer needed to release the shared memory.
+    """
+
+    from multiprocessing.shared_memory import SharedMemory
+
+    np = import_numpy()
+    dtype = np.dtype(dtype)
+
+    size = int(np.prod(shape)) * dtype.itemsize
+    segment = SharedMemory(create=True, size=max(size, 1))
+
+    arr = np.ndarray(shape, dtype=dtype, buffer=segment.buf)
+
+    with _shared_lock:
+        _shared_segments[arr.__array_interface__["data"][0]] = segment
+
+    return arr
+
+
+def free_shared_array(arr):
+    """
+    Release the shared memory backing an array created by `shared_array`.
+
+    The memory is freed once all arrays (and views) using it are deleted.
+
+    Parameters
+    ----------
+    arr : numpy.ndarray
+        The array created by `shared_array`.
+
+    Raises
+    ------
+    ValueError : the array was not created by `shared_array`.
+    """
+
+    address = arr.__array_interface__["data"][0]
+
+    with _shared_lock:
+        segment = _shared_segments.pop(address, None)
+
+    if segment is None:
+        raise ValueError("Array was not created by shared_array")
+
+    segment.unlink()
+
+
+def _find_segment(arr):
+    """
+    Find the shared memory segment (and offset within it) backing an array.
+
+    Returns
+    -------
+    location : tuple or None
+        The name of the segment and the offset of the array's first
+        element within it, or None if the array is not in shared memory.
+    """
+
+    address = arr.__array_interface__["data"][0]
+
+    with _shared_lock:
+        for start, segment in _shared_segments.items():
+            if start <= address < start + segment.size:
+                return segment.name, address - start
+
+    return None
+
+
+def _check_shared_chunk(name, offset, shape, strides, dtype,
+                        start, stop, check):
+    """
+    Check rows [start, stop) of an array in shared memory (in a worker).
+    """
+
+    from multiprocessing.shared_memory import SharedMemory
+
+    np = import_numpy()
+
+    try:
+        segment = SharedMemory(name=name, track=False)
+    except TypeError:  # Python < 3.13
+        segment = SharedMemory(name=name)
+
+    try:
+        arr = np.ndarray(shape, dtype=dtype, buffer=segment.buf,
+                         offset=offset, strides=strides)
+        valid = bool(check(arr[start:stop]))
+
+        # The segment cannot be closed while the array still exists.
+        del arr
+    finally:
+        segment.close()
+
+    return valid
+
+
+def _get_executor(processes, workers):
+    """
+    Get the (lazily created) executor of a given kind and size.
+    """
+
+    key = (processes, workers)
+
+    with _executors_lock:
+        executor = _executors.get(key)
+
+        if executor is None:
+            from concurrent.futures import (ProcessPoolExecutor,
+                                            ThreadPoolExecutor)
+
+            klass = ProcessPoolExecutor if processes else ThreadPoolExecutor
+            executor = _executors[key] = klass(max_workers=workers)
+
+    return executor
+
+
+class ParallelArrayCheck(object):
+    """
+    Validator that checks a large NumPy array in chunks in parallel.
+
+    The array is split along its first axis into views (so no data is
+    copied), which are checked in a thread pool. NumPy releases the GIL in
+    most vectorized operations, so this scales across cores. Alternatively,
+    arrays created by `shared_array` can be checked in a process pool.
+
+    Checking stops as soon as any chunk fails: chunks that have yet to
+    start are cancelled, and a ValueError is raised.
+    """
+
+    def __init__(self, check, chunk_size=1 << 20, workers=None,
+                 processes=False):
+        """
+        Initialize a ParallelArrayCheck instance.
+
+        Parameters
+        ----------
+        check : str or callable
+            The vectorized check run on each chunk, which returns True if
+            all elements in the chunk are valid. Either a callable, or one
+            of the names "even", "odd", or "finite". With `processes=True`,
+            the callable must be picklable (e.g. defined at module level).
+        chunk_size : int > 0, default 1 << 20
+            The (approximate) number of elements per chunk. Arrays with
+            at most this many elements are checked directly.
+        workers : int or None, default None
+            The number of threads or processes to use. If None, the
+            executor's default (based on the number of CPUs) is used.
+        processes : bool, default False
+            Whether to check arrays created by `shared_array` in a process
+            pool. Other arrays are still checked in a thread pool.
+
+        Raises
+        ------
+        ValueError : an unknown check name or invalid chunk size was provided.
+        TypeError : the check was neither a name nor a callable.
+        """
+
+        if isinstance(check, str):
+            name = check
+            check = array_checks.get(check)
+
+            if check is None:
+                msg = "Unknown array check: '{name}'"
+                raise ValueError(msg.format(name=name))
+        elif callable(check):
+            name = getattr(check, "__name__", repr(check))
+        else:
+            raise TypeError("Array check must either be a name or callable")
+
+        if not isinstance(chunk_size, int) or chunk_size < 1:
+            raise ValueError("chunk_size must be a positive integer")
+
+        self.name = name
+        self.check = check
+        self.chunk_size = chunk_size
+        self.workers = workers
+        self.processes = processes
+
+    def __call__(self, arr):
+        """
+        Check an array.
+
+        Parameters
+        ----------
+        arr : numpy.ndarray
+            The array to check.
+
+        Returns
+        -------
+        valid : bool
+            True, if the check passes.
+
+        Raises
+        ------
+        TypeError : the value was not a NumPy array.
+        ValueError : the check failed for some chunk of the array.
+        """
+
+        np = import_numpy()
+
+        if not isinstance(arr, np.ndarray):
+            act_type = type(arr).__name__
+            msg = "Expected a numpy array but got: '{act_type}'"
+            raise TypeError(msg.format(act_type=act_type))
+
+        if arr.ndim == 0 or arr.size <= self.chunk_size:
+            if not self.check(arr):
+                self._raise_failure(0, len(arr) if arr.ndim else 1)
+
+            return True
+
+        rows = len(arr)
+        step = max(1, self.chunk_size // (arr.size // rows))
+
+        location = _find_segment(arr) if self.processes else None
+        executor = _get_executor(location is not None, self.workers)
+
+        futures = {}
+
+        for start in range(0, rows, step):
+            stop = min(start + step, rows)
+
+            if location is None:
+                future = executor.submit(self.check, arr[start:stop])
+            else:
+                name, offset = location
+                future = executor.submit(_check_shared_chunk, name, offset,
+                                         arr.shape, arr.strides,
+                                         arr.dtype.str, start, stop,
+                                         self.check)
+
+            futures[future] = (start, stop)
+
+        from concurrent.futures import as_completed
+
+        try:
+            for future in as_completed(futures):
+                if not future.result():
+                    self._raise_failure(*futures[future])
+        finally:
+            for future in futures:
+                future.cancel()
+
+        return True
+
+    def _raise_failure(self, start, stop):
+        """
+        Raise a ValueError for a chunk of rows that failed the check.
+        """
+
+        msg = "Array check '{name}' failed for rows [{start}:{stop}]"
+        raise ValueError(msg.format(name=self.name, start=start, stop=stop))
+
+
+# Array specs in string form e.g. "ndarray[float64, (n, 3), C]".
+ARRAY_SPEC_PREFIX = "ndarray["
+
+# The maximum number of parsed array specs that we keep around.
+# Identical specs used across decorators share one ArraySpec.
+ARRAY_SPEC_CACHE_SIZE = 1024
+
+# Dimension symbols (e.g. "n") in the shapes of array specs.
+_symbol_pattern = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+# Flags of array specs in string form, mapped to ArraySpec parameters.
+_spec_flags = {"C": ("order", "C"), "F": ("order", "F"),
+               "W": ("writeable", True), "R": ("writeable", False)}
+
+
+class ArraySpec(object):
+    """
+    Validator of the structure of a NumPy array: its dtype, shape,
+    memory layout, and writeability.
+
+    Checks only look at the array's metadata (never its data buffer),
+    so they take constant time regardless of the size of the array.
+
+    Dimensions of the shape can be symbols (e.g. "n"), which must have the
+    same length wherever they appear, including across the arguments and
+    outputs of a validated function (e.g. `x` and `y` both of length "n").
+    """
+
+    def __init__(self, dtype=None, shape=None, order=None, writeable=None):
+        """
+        Initialize an ArraySpec instance.
+
+        Parameters
+        ----------
+        dtype : data-type, default None
+            The dtype of the array e.g. "float64". An abstract NumPy type
+            (e.g. `numpy.floating` or "integer") matches all of its
+            subtypes. If None, any dtype is accepted.
+        shape : tuple, default None
+            The shape of the array. Each dimension is either an integer
+            length, a symbol (e.g. "n"), or None for any length. A single
+            "..." matches any number of dimensions. If None, any shape
+            is accepted.
+        order : {"C", "F"} or None, default None
+            Whether the array must be C- or Fortran-contiguous.
+        writeable : bool or None, default None
+            Whether the array must be writeable (True) or read-only (False).
+
+        Raises
+        ------
+        ImportError : NumPy is not installed.
+        TypeError : the dtype is not understood by NumPy.
+        ValueError : the shape or order is invalid.
+        """
+
+        np = import_numpy()
+        self._ndarray = np.ndarray
+
+        self.dtype = _parse_dtype(np, dtype)
+        self.shape = None if shape is None else _parse_shape(shape)
+        self.order = order
+        self.writeable = writeable
+
+        if order not in (None, "C", "F"):
+            raise ValueError("order must be 'C', 'F', or None")
+
+        if self.shape is None:
+            self.symbols = frozenset()
+        else:
+            self.symbols = frozenset(dim for dim in self.shape
+                                     if isinstance(dim, str) and dim != "...")
+
+        self._abstract = isinstance(self.dtype, type)
+        self._repr = self._render()
+
+    def __repr__(self):
+        return self._repr
+
+    def _render(self):
+        """
+        Render this spec in string form.
+        """
+
+        parts = [_dtype_name(self.dtype)]
+
+        if self.shape is not None:
+            dims = ["*" if dim is None else str(dim) for dim in self.shape]
+            parts.append("({dims}{comma})".format(
+                dims=", ".join(dims), comma="," if len(dims) == 1 else ""))
+
+        if self.order is not None:
+            parts.append(self.order)
+
+        if self.writeable is not None:
+            parts.append("W" if self.writeable else "R")
+
+        return "ndarray[{parts}]".format(parts=", ".join(parts))
+
+    def __call__(self, arr):
+        """
+        Check an array against this spec.
+
+        Returns
+        -------
+        valid : bool
+            True, if the array matches the spec.
+
+        Raises
+        ------
+        TypeError : the value was not an array, or had the wrong dtype.
+        ValueError : the array had the wrong shape, layout, or writeability.
+        """
+
+        self.check(arr, {} if self.symbols else None)
+        return True
+
+    def bind(self, bindings):
+        """
+        Get a validator checking arrays against this spec, in which the
+        lengths of symbols are shared via a dictionary.
+
+        Parameters
+        ----------
+        bindings : dict
+            Maps symbols to the lengths that they are bound to. Lengths of
+            symbols that are not yet bound are added to it.
+
+        Returns
+        -------
+        validator : callable
+            A validator taking the array to check.
+        """
+
+        def check_bound(arr):
+            self.check(arr, bindings)
+            return True
+
+        check_bound.__name__ = self._repr
+        return check_bound
+
+    def check(self, arr, bindings=None):
+        """
+        Check an array against this spec.
+
+        Parameters
+        ----------
+        arr : object
+            The array to check.
+        bindings : dict, default None
+            Maps symbols to the lengths that they are bound to (see `bind`).
+
+        Raises
+        ------
+        TypeError : the value was not an array, or had the wrong dtype.
+        ValueError : the array had the wrong shape, layout, or writeability.
+        """
+
+        if not isinstance(arr, self._ndarray):
+            act_type = type(arr).__name__
+            msg = "Expected a numpy array but got: '{act_type}'"
+            raise TypeError(msg.format(act_type=act_type))
+
+        dtype = self.dtype
+
+        if dtype is not None:
+            if self._abstract:
+                valid_dtype = issubclass(arr.dtype.type, dtype)
+            else:
+                valid_dtype = arr.dtype == dtype
+
+            if not valid_dtype:
+                msg = "Expected an array of dtype {exp} but got {act}"
+                raise TypeError(msg.format(exp=_dtype_name(dtype),
+                                           act=arr.dtype.name))
+
+        if self.shape is not None:
+            self._check_shape(arr.shape, bindings)
+
+        flags = arr.flags
+        order = self.order
+
+        if order is not None:
+            if not (flags.c_contiguous if order == "C"
+                    else flags.f_contiguous):
+                msg = "Expected a {order}-contiguous array"
+                raise ValueError(msg.format(order=order))
+
+        writeable = self.writeable
+
+        if writeable is not None and flags.writeable != writeable:
+            raise ValueError("Expected a writeable array" if writeable
+                             else "Expected a read-only array")
+
+    def _check_shape(self, shape, bindings):
+        """
+        Check the shape of an array, binding any symbols in the spec.
+        """
+
+        spec = self.shape
+
+        if "..." in spec:
+            split = spec.index("...")
+            head, tail = spec[:split], spec[split + 1:]
+
+            if len(shape) < len(head) + len(tail):
+                self._raise_shape(shape, bindings)
+
+            pairs = (list(zip(head, shape)) +
+                     list(zip(tail, shape[len(shape) - len(tail):])))
+        else:
+            if len(shape) != len(spec):
+                self._raise_shape(shape, bindings)
+
+            pairs = zip(spec, shape)
+
+        for dim, length in pairs:
+            if dim is None:
+                continue
+
+            if isinstance(dim, str):
+                bound = bindings.get(dim)
+
+                if bound is None:
+                    bindings[dim] = length
+                    continue
+
+                dim = bound
+
+            if dim != length:
+                self._raise_shape(shape, bindings)
+
+    def _raise_shape(self, shape, bindings):
+        """
+        Raise a ValueError for an array with the wrong shape.
+        """
+
+        dims = []
+
+        for dim in self.shape:
+            if dim is None:
+                dims.append("*")
+            elif isinstance(dim, str) and bindings and dim in bindings:
+                dims.append("{dim}={length}".format(
+                    dim=dim, length=bindings[dim]))
+            else:
+                dims.append(str(dim))
+
+        msg = "Expected an array of shape ({exp}) but got {act}"
+        raise ValueError(msg.format(exp=", ".join(dims), act=shape))
+
+
+def _parse_dtype(np, dtype):
+    """
+    Parse the dtype of an array spec into a dtype or an abstract type.
+    """
+
+    if dtype is None or dtype == "*":
+        return None
+
+    if isinstance(dtype, type) and issubclass(dtype, np.generic):
+        if dtype.__subclasses__():  # abstract e.g. numpy.floating
+            return dtype
+
+    try:
+        return np.dtype(dtype)
+    except TypeError:
+        abstract = (getattr(np, dtype, None) if isinstance(dtype, str)
+                    else None)
+
+        if isinstance(abstract, type) and issubclass(abstract, np.generic):
+            return abstract
+
+        raise TypeError("Invalid dtype for array spec: {dtype}"
+                        .format(dtype=dtype))
+
+
+def _dtype_name(dtype):
+    """
+    Get the display name of a dtype (or abstract type) in an array spec.
+    """
+
+    if dtype is None:
+        return "*"
+
+    if isinstance(dtype, type):
+        return dtype.__name__
+
+    return dtype.name
+
+
+def _parse_shape(shape):
+    """
+    Validate the shape of an array spec.
+    """
+
+    shape = tuple(shape)
+
+    for dim in shape:
+        valid = (dim is None or dim == "..." or
+                 (isinstance(dim, int) and not isinstance(dim, bool) and
+                  dim >= 0) or
+                 (isinstance(dim, str) and _symbol_pattern.match(dim)))
+
+        if not valid:
+            raise ValueError("Invalid dimension in array spec: {dim!r}"
+                             .format(dim=dim))
+
+    if shape.count("...") > 1:
+        raise ValueError("Array spec can contain at most one '...'")
+
+    return shape
+
+
+def _split_top_level(text):
+    """
+    Split text on commas that are not inside parentheses.
+    """
+
+    parts = []
+    depth = 0
+    start = 0
+
+    for index, char in enumerate(text):
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "," and depth == 0:
+            parts.append(text[start:index].strip())
+            start = index + 1
+
+    parts.append(text[start:].strip())
+    return parts
+
+
+@functools.lru_cache(maxsize=ARRAY_SPEC_CACHE_SIZE)
+def parse_array_spec(spec):
+    """
+    Parse an array spec in string form into an ArraySpec.
+
+    The result is cached so that any given spec is only parsed once.
+
+    The string form is "ndarray[dtype, (shape), flags...]", e.g.
+    "ndarray[float64, (n, 3), C]". The dtype can be "*" for any dtype.
+    The shape (optional, or "*" for any shape) lists integer lengths,
+    symbols, "*" for any length, and "..." for any number of dimensions.
+    The optional flags are "C" or "F" for C- or Fortran-contiguity, and
+    "W" or "R" for writeable or read-only arrays.
+
+    Parameters
+    ----------
+    spec : str
+        The array spec in string form.
+
+    Returns
+    -------
+    array_spec : ArraySpec
+        The parsed array spec.
+
+    Raises
+    ------
+    ValueError : the array spec is invalid.
+    """
+
+    msg = "Invalid array spec '{spec}': {reason}"
+
+    if not (spec.startswith(ARRAY_SPEC_PREFIX) and spec.endswith("]")):
+        raise ValueError(msg.format(spec=spec, reason="expected "
+                                    "'ndarray[dtype, (shape), flags...]'"))
+
+    parts = _split_top_level(spec[len(ARRAY_SPEC_PREFIX):-1])
+    kwargs = {"dtype": parts[0] or None}
+
+    for part in parts[1:]:
+        if part.startswith("(") and part.endswith(")") or part == "*":
+            if "shape" in kwargs:
+                raise ValueError(msg.format(spec=spec,
+                                            reason="multiple shapes"))
+
+            if part == "*":
+                kwargs["shape"] = None
+                continue
+
+            dims = [dim.strip() for dim in part[1:-1].split(",")]
+
+            if dims[-1] == "":  # e.g. "(n,)" or "()"
+                dims.pop()
+
+            kwargs["shape"] = tuple(None if dim == "*" else
+                                    int(dim) if dim.isdigit() else dim
+                                    for dim in dims)
+        elif part in _spec_flags:
+            name, value = _spec_flags[part]
+
+            if name in kwargs:
+                raise ValueError(msg.format(spec=spec, reason="conflicting "
+                                            "flag '{flag}'".format(flag=part)))
+
+            kwargs[name] = value
+        else:
+            raise ValueError(msg.format(spec=spec, reason="unexpected "
+                                        "'{part}'".format(part=part)))
+
+    try:
+        return ArraySpec(**kwargs)
+    except (TypeError, ValueError) as e:
+        raise ValueError(msg.format(spec=spec, reason=e))
+
+
+def resolve_array_spec(validator):
+    """
+    Parse a validator into an ArraySpec if it is an array spec string.
+
+    Parameters
+    ----------
+    validator : object
+        The validator.
+
+    Returns
+    -------
+    resolved : object
+        The parsed ArraySpec, or the validator itself if it is not an
+        array spec string.
+    """
+
+    if isinstance(validator, str) and validator.startswith(ARRAY_SPEC_PREFIX):
+        return parse_array_spec(validator)
+
+    return validator
+
+
+def shares_symbols(validators):
+    """
+    Check whether any dimension symbol appears in more than one ArraySpec.
+
+    Parameters
+    ----------
+    validators : iterable
+        The validators of a function.
+
+    Returns
+    -------
+    shared : bool
+        Whether symbols have to be bound across the values of a call.
+    """
+
+    seen = set()
+
+    for validator in validators:
+        if isinstance(validator, ArraySpec):
+            if seen & validator.symbols:
+                return True
+
+            seen |= validator.symbols
+
+    return False
+
+
+def bind_symbols(check_value, bindings):
+    """
+    Wrap a value check such that array specs share symbol lengths.
+
+    Parameters
+    ----------
+    check_value : callable
+        The check taking the argument name, value, and validator.
+    bindings : dict
+        Maps symbols to the lengths they are bound to during the call.
+
+    Returns
+    -------
+    bound_check_value : callable
+        The check, binding symbols in array specs.
+    """
+
+    def bound_check_value(arg, val, validator):
+        if type(validator) is ArraySpec and validator.symbols:
+            validator = validator.bind(bindings)
+
+        check_value(arg, val, validator)
+
+    return bound_check_value
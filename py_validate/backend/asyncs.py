@@ -0,0 +1,107 @@
+"""
+Support for `async def` validators on `async def` validated functions.
+
+Async validators (e.g. checks that query a service) cannot run inside the
+synchronous validation loop. Instead, they are collected while the other
+validators run, and are then awaited concurrently with `asyncio.gather`.
+`asyncio` is slow to import, so it is only imported once an async validator
+is awaited.
+"""
+
+import inspect
+
+
+class AsyncValidator(object):
+    """
+    Wrapper around an async validator that sets a timeout for the check.
+
+    A check that takes longer than the timeout fails with a TimeoutError.
+    """
+
+    def __init__(self, check, timeout=None):
+        """
+        Initialize an AsyncValidator instance.
+
+        Parameters
+        ----------
+        check : callable
+            The `async def` function that checks a value. Like synchronous
+            validators, it returns True if the check passes, and raises
+            OR returns False if the check fails.
+        timeout : float > 0 or None, default None
+            The number of seconds after which the check fails. If None,
+            the check is awaited for as long as it takes.
+
+        Raises
+        ------
+        TypeError : the check was not an `async def` function.
+        ValueError : the timeout was not positive.
+        """
+
+        if not inspect.iscoroutinefunction(check):
+            raise TypeError("Expected an async function for the check")
+
+        if timeout is not None and not timeout > 0:
+            raise ValueError("timeout must be positive or None")
+
+        self.check = check
+        self.timeout = timeout
+
+    def __repr__(self):
+        name = getattr(self.check, "__name__", repr(self.check))
+        return "AsyncValidator({name}, timeout={timeout})".format(
+            name=name, timeout=self.timeout)
+
+
+def is_async_validator(validator):
+    """
+    Check whether a validator has to be awaited.
+
+    Parameters
+    ----------
+    validator : object
+        The validator to check.
+
+    Returns
+    -------
+    is_async : bool
+        Whether the validator is an `async def` function or AsyncValidator.
+    """
+
+    return (isinstance(validator, AsyncValidator) or
+            inspect.iscoroutinefunction(validator))
+
+
+async def await_check(validator, val):
+    """
+    Await an async validator on a value, subject to its timeout.
+
+    Parameters
+    ----------
+    validator : callable or AsyncValidator
+        The async validator.
+    val : object
+        The value to check.
+
+    Returns
+    -------
+    is_valid : object
+        The result of the check.
+
+    Raises
+    ------
+    TimeoutError : the check did not finish within its timeout.
+    """
+
+    if not isinstance(validator, AsyncValidator):
+        return await validator(val)
+
+    import asyncio
+
+    timeout = validator.timeout
+
+    try:
+        return await asyncio.wait_for(validator.check(val), timeout)
+    except asyncio.TimeoutError:
+        raise TimeoutError("Validator timed out after {timeout} seconds"
+                           .format(timeout=timeout))
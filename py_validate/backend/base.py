@@ -2,9 +2,31 @@
 Base class that underlies the validation wrappers for input and output.
 """
 
-from .helpers import DocSubstitution, FrozenDict
-from .shortcuts import NegateShortcut, get_shortcut
-
+from .arrays import bind_symbols, resolve_array_spec, shares_symbols
+from .asyncs import AsyncValidator, await_check, is_async_validator
+from .budgets import UNCHECKED, as_budget
+from .caching import as_identity_cache
+from .generics import GenericMismatch, compile_generic, is_generic
+from .helpers import DocSubstitution, FrozenDict, short_repr
+from .interning import (empty_map, empty_tuple, intern_map, intern_tuple,
+                        output_names)
+from .profiling import as_profiler, timed
+from .registry import register
+from .reporting import as_reporter
+from .scopes import is_trusted
+from .shortcuts import get_shortcut
+
+import contextvars
+import importlib
+import inspect
+import sys
+import threading
+import time
+import types
+
+
+# Guards applying deferred updates, so that each is only applied once.
+_update_lock = threading.RLock()
 
 validator_doc = """If a string is provided, that means we are using a shortcut,
 which maps to a callable that returns None and raises an
@@ -20,11 +42,25 @@ Currently, valid shortcuts are:
 3) even - The input must be an even integer.
 4) odd - The input must be an odd integer.
 
+Shortcuts can be negated with "~" and combined into expressions
+with "&" and "|" alongside the parametric checks "range(lo, hi)",
+"len<=N", "re:pattern", and "in:{a,b,c}", e.g. "integer & range(0, 100)".
+Each expression is parsed once and cached.
+
 If a type is provided, we check if the variable is an instance
 of that type, and we raise a TypeError if there is a type mismatch.
 
+If a `typing` construct is provided (e.g. List[Dict[str, int]],
+Optional[str], Union, Literal, Tuple, or Mapping), we check the
+structure of the variable against it, sampling the elements of
+large containers, and we raise a TypeError if there is a mismatch.
+
 If a callable is provided, we expect the callable to return True
-if the check passes and raise OR return False if the check fails."""
+if the check passes and raise OR return False if the check fails.
+
+If the function is an `async def` function, `async def` callables
+(optionally wrapped in an `AsyncValidator` to set a timeout) can
+also be provided. These are awaited concurrently with one another."""
 
 output_len_doc = """exp_output_len : int > 0, -1, or None
     The expected number of elements in the result.
@@ -39,11 +75,40 @@ output_len_doc = """exp_output_len : int > 0, -1, or None
     whereas in the latter, we verify the elements of the tuple."""
 
 
+class OutputLengthError(ValueError):
+    """
+    Exception class for when a function returns an unexpected number of
+    outputs.
+    """
+
+    pass
+
+
 class ValidatedFunction(object):
     """
     Wrapper class around functions for supporting input and output validation.
     """
 
+    # The profiler used by instances for which none was set (see
+    # `set_profiler` and `set_default_profiler`), or None to not profile.
+    _profiler = None
+
+    # The reporter used by instances for which none was set (see `set_reporter`
+    # and `set_default_reporter`), or None to raise validation failures.
+    _reporter = None
+
+    # The time budget and identity cache of instances for which none was set.
+    _budget = None
+    _identity_cache = None
+
+    # For instances that only validate their outermost call (see
+    # `set_outermost_only`), whether `f` is running in the current context.
+    _outermost = None
+
+    # Whether the outputs were set from the return annotation, in which case
+    # explicit outputs (e.g. from `validate_outputs`) replace them.
+    _annotated_outputs = False
+
     def __init__(self, f):
         """
         Initialize a ValidatedFunction instance.
@@ -57,10 +122,27 @@ class ValidatedFunction(object):
 
         self.f = self._validate_callable(f)
         self.var_names = f.__code__.co_varnames
+        self._is_async = inspect.iscoroutinefunction(f)
 
+        # Validator maps and tuples are interned, so that functions with
+        # identical specs share them. They are replaced, never modified.
         self._exp_output_len = None
-        self._output_validators = tuple()
-        self._input_validators = FrozenDict()
+        self._output_validators = empty_tuple
+        self._output_names = empty_tuple
+        self._output_plan = None
+        self._input_validators = empty_map
+        self._input_names = empty_tuple
+        self._deferred_updates = ()
+
+        # Whether array specs share dimension symbols, which then have to
+        # be bound across the values of each call (see `bind_symbols`).
+        self._shared_symbols = False
+
+        # Keep abstract methods abstract once validated.
+        if getattr(f, "__isabstractmethod__", False):
+            self.__isabstractmethod__ = True
+
+        register(self)
 
     @staticmethod
     def _validate_callable(f):
@@ -99,21 +181,529 @@ class ValidatedFunction(object):
         Before calling the function, the inputs are validated, and after the
         function is called, the outputs are validated. If all checks pass, the
         output of the function call is returned.
+
+        Inside a `trusted` scope, `f` is called without any validation.
+
+        If a reporter is set, validation failures are reported instead of
+        raised. Values are then re-validated one by one in order to report
+        each failing one, which keeps the passing path free of any overhead.
+
+        If `f` is an `async def` function, a coroutine is returned that
+        validates the inputs and outputs around awaiting `f` (see
+        `_call_async`).
+
+        If only the outermost call is validated, calls made while `f` is
+        already running in the current thread (or asyncio task) call `f`
+        without any validation.
         """
 
-        self._validate_inputs(*args, **kwargs)
-        result = self.f(*args, **kwargs)
+        if is_trusted():
+            return self.f(*args, **kwargs)
+
+        outermost = self._outermost
+
+        if outermost is not None and outermost.get():
+            return self.f(*args, **kwargs)
+
+        if self._is_async:
+            return self._call_async(args, kwargs)
 
-        is_tuple = type(result).__name__ == "tuple"
-        iter_result = is_tuple and self._exp_output_len != -1
+        if self._deferred_updates:
+            self.apply_deferred_updates()
 
-        if iter_result:
-            self._validate_outputs(*result)
+        profiler = self._profiler
+        check_value = self._check_value
+
+        if profiler is not None:
+            func_name = self._profile_name(profiler)
+
+            if profiler.sample(func_name):
+                check_value = timed(check_value, profiler, func_name)
+
+        bindings = {} if self._shared_symbols else None
+
+        if bindings is not None:
+            check_value = bind_symbols(check_value, bindings)
+
+        try:
+            self._validate_inputs(args, kwargs, check_value)
+        except Exception:
+            if self._reporter is None:
+                raise
+
+            self._validate_inputs(args, kwargs,
+                                  self._reporting_check(bindings))
+
+        if outermost is None:
+            result = self.f(*args, **kwargs)
         else:
-            self._validate_outputs(result)
+            token = outermost.set(True)
+
+            try:
+                result = self.f(*args, **kwargs)
+            finally:
+                outermost.reset(token)
+
+        output_plan = self._output_plan
+
+        if output_plan is not None:
+            try:
+                output_plan(self, result, check_value)
+            except Exception:
+                if self._reporter is None:
+                    raise
+
+                try:
+                    output_plan(self, result,
+                                self._reporting_check(bindings))
+                except OutputLengthError as e:
+                    self._reporter.report(self._name(), "Outputs", e)
 
         return result
 
+    async def _call_async(self, args, kwargs):
+        """
+        Coroutine underlying calls to `f` when it is an `async def` function.
+
+        Validation follows `__call__`, except that in each step (inputs, then
+        outputs), async validators are awaited concurrently once the other
+        validators have run. The latency of a step is thus that of its
+        slowest async validator, not the sum of all of them.
+
+        If a reporter is set, values are validated in reporting mode from the
+        start, as re-validating them would repeat the async validators' I/O.
+        """
+
+        if self._deferred_updates:
+            self.apply_deferred_updates()
+
+        reporter = self._reporter
+        profiler = self._profiler
+        profile_name = None
+
+        if profiler is not None:
+            profile_name = self._profile_name(profiler)
+
+            if not profiler.sample(profile_name):
+                profiler = None
+
+        bindings = {} if self._shared_symbols else None
+
+        if reporter is not None:
+            check_value = self._reporting_check(bindings)
+        elif profiler is not None:
+            check_value = timed(self._check_value, profiler, profile_name)
+        else:
+            check_value = self._check_value
+
+        if bindings is not None and reporter is None:
+            check_value = bind_symbols(check_value, bindings)
+
+        await self._validate_async(self._validate_inputs, (args, kwargs),
+                                   check_value, reporter, profiler)
+
+        outermost = self._outermost
+
+        if outermost is None:
+            result = await self.f(*args, **kwargs)
+        else:
+            token = outermost.set(True)
+
+            try:
+                result = await self.f(*args, **kwargs)
+            finally:
+                outermost.reset(token)
+
+        output_plan = self._output_plan
+
+        if output_plan is not None:
+            await self._validate_async(output_plan, (self, result),
+                                       check_value, reporter, profiler)
+
+        return result
+
+    async def _validate_async(self, validate, params, check_value,
+                              reporter=None, profiler=None):
+        """
+        Run a validation step, awaiting its async validators concurrently.
+
+        Parameters
+        ----------
+        validate : callable
+            The validation step (i.e. `_validate_inputs` or an output plan),
+            which is called with `params` and a value check.
+        params : tuple
+            The parameters for the validation step.
+        check_value : callable
+            The function with which to check values with other validators.
+        reporter : FailureReporter, default None
+            The reporter that failures of async validators go to. If
+            None, the first failure (in argument order) is raised.
+        profiler : ValidatorProfiler, default None
+            The profiler recording the time spent in async validators.
+        """
+
+        pending = []
+
+        def collect_value(arg, val, validator):
+            if is_async_validator(validator):
+                pending.append((arg, val, validator))
+            else:
+                check_value(arg, val, validator)
+
+        func_name = self._name()
+
+        try:
+            validate(*params, collect_value)
+        except OutputLengthError as e:
+            if reporter is None:
+                raise
+
+            reporter.report(func_name, "Outputs", e)
+
+        if not pending:
+            return
+
+        import asyncio
+
+        profile_name = (None if profiler is None else
+                        self._profile_name(profiler))
+        errors = await asyncio.gather(
+            *[self._check_value_async(arg, val, validator,
+                                      profiler, profile_name)
+              for arg, val, validator in pending],
+            return_exceptions=True)
+
+        for (arg, _, _), error in zip(pending, errors):
+            if error is None:
+                continue
+
+            if reporter is None:
+                raise error
+
+            reporter.report(func_name, arg, error)
+
+    @staticmethod
+    async def _check_value_async(arg, val, validator, profiler=None,
+                                 func_name=None):
+        """
+        Check whether a value provided for an argument is valid, using
+        an async validator.
+
+        Parameters
+        ----------
+        arg : str
+            The name of the argument.
+        val : object
+            The value of the argument.
+        validator : callable or AsyncValidator
+            The `async def` function (or AsyncValidator wrapping one) with
+            which to validate the argument.
+        profiler : ValidatorProfiler, default None
+            The profiler recording the time spent in the validator.
+        func_name : str, default None
+            The name of the validated function in the profiler.
+
+        Raises
+        ------
+        TimeoutError : the validator did not finish within its timeout.
+        ValueError : the validator failed with `val`.
+        """
+
+        start = time.perf_counter()
+
+        try:
+            is_valid = await await_check(validator, val)
+        except Exception as e:
+            _raise_exception_failure(arg, e, val)
+        finally:
+            if profiler is not None:
+                profiler.record(func_name, arg, time.perf_counter() - start)
+
+        if is_valid is False:
+            raise _invalid_value(arg, val)
+
+    def _reporting_check(self, bindings=None):
+        """
+        Get a value check that reports failures to the reporter.
+
+        Parameters
+        ----------
+        bindings : dict, default None
+            The lengths of the dimension symbols bound during the call,
+            if array specs share any (see `bind_symbols`).
+        """
+
+        check_value = self._check_value
+
+        if bindings is not None:
+            check_value = bind_symbols(check_value, bindings)
+
+        return self._reporter.wrap(check_value, self._name())
+
+    def _name(self):
+        """
+        Get the qualified name of `f` for reporting purposes.
+        """
+
+        name = self.__dict__.get("_qualified_name")
+
+        if name is None:
+            name = self._qualified_name = "{module}.{name}".format(
+                module=getattr(self.f, "__module__", None),
+                name=getattr(self.f, "__qualname__", self.f.__name__))
+
+        return name
+
+    def _profile_name(self, profiler, register=True):
+        """
+        Get the name under which a profiler profiles this instance (see
+        `ValidatorProfiler.unique_name`), or None if it has none and
+        `register` is False.
+        """
+
+        profiled = self.__dict__.get("_profiled")
+
+        if profiled is None or profiled[0] is not profiler:
+            if not register:
+                return None
+
+            profiled = self._profiled = (profiler,
+                                         profiler.unique_name(self._name()))
+
+        return profiled[1]
+
+    def __reduce__(self):
+        """
+        Reduce this instance for pickling (e.g. to send it to a process pool).
+
+        If this instance is reachable by its qualified name in its module
+        (i.e. it was decorated at module level), it is pickled by reference.
+        Otherwise, it is pickled as a compact spec made up of `f` and its
+        validators, which then must themselves be picklable (shortcuts,
+        types, and `typing` constructs are). The reporter, time budget, and
+        identity cache set for this instance are pickled by their parameters
+        (so e.g. the handler of a reporter must be picklable too), and start
+        afresh. Profilers, and the defaults set for all instances, are not
+        pickled: the unpickled instance uses the defaults of its process.
+        """
+
+        module = getattr(self.f, "__module__", None)
+        qualname = getattr(self.f, "__qualname__", None)
+
+        if module is not None and qualname is not None:
+            if _lookup(module, qualname) is self:
+                return _restore_by_reference, (module, qualname)
+
+        spec = (self.f, dict(self._input_validators), self._exp_output_len,
+                self._output_validators, tuple(self._deferred_updates),
+                self._outermost is not None,
+                {name: self.__dict__[name] for name in _config_attributes
+                 if name in self.__dict__})
+        return _restore_from_spec, spec
+
+    def __get__(self, instance, owner=None):
+        """
+        Bind this instance to an instance of a class, like a function,
+        when it is used as a method.
+        """
+
+        if instance is None:
+            return self
+
+        return types.MethodType(self, instance)
+
+    def unchecked(self, *args, **kwargs):
+        """
+        Call `f` without validating its inputs or outputs.
+
+        This is intended for callers that have already checked the data
+        that they are passing in.
+        """
+
+        return self.f(*args, **kwargs)
+
+    def set_profiler(self, profiler):
+        """
+        Set the profiler that times the validators of this function.
+
+        Parameters
+        ----------
+        profiler : ValidatorProfiler, callable, or None
+            The profiler to use. A callable is called with the function name,
+            argument name (e.g. "a" or "Output 0"), and elapsed time in
+            seconds for each validator on every call. If None, this function
+            falls back to the default profiler (see `set_default_profiler`).
+        """
+
+        profiler = as_profiler(profiler)
+
+        if profiler is None:
+            self.__dict__.pop("_profiler", None)
+        else:
+            self._profiler = profiler
+
+    @classmethod
+    def set_default_profiler(cls, profiler):
+        """
+        Set the profiler for all functions for which none was set.
+
+        Parameters
+        ----------
+        profiler : ValidatorProfiler, callable, or None
+            The profiler to use (see `set_profiler`). If None,
+            these functions are no longer profiled.
+        """
+
+        cls._profiler = as_profiler(profiler)
+
+    def set_reporter(self, reporter):
+        """
+        Set the reporter that validation failures of this function go to.
+
+        When a reporter is set, failures are reported (subject to the
+        reporter's rate limits) instead of raised i.e. "warn-only" mode.
+
+        Parameters
+        ----------
+        reporter : FailureReporter, callable, or None
+            The reporter to use. A callable is used as the handler of a
+            FailureReporter with the default rate limits. If None, this
+            function falls back to the default reporter (see
+            `set_default_reporter`).
+        """
+
+        reporter = as_reporter(reporter)
+
+        if reporter is None:
+            self.__dict__.pop("_reporter", None)
+        else:
+            self._reporter = reporter
+
+    @classmethod
+    def set_default_reporter(cls, reporter):
+        """
+        Set the reporter for all functions for which none was set.
+
+        Parameters
+        ----------
+        reporter : FailureReporter, callable, or None
+            The reporter to use (see `set_reporter`). If None, validation
+            failures of these functions are raised as usual.
+        """
+
+        cls._reporter = as_reporter(reporter)
+
+    def set_time_budget(self, budget):
+        """
+        Set the time budget within which the validators of this function run.
+
+        Validators other than types then run on a worker thread, and the
+        budget's policy applies if they overrun it (see `TimeBudget`).
+
+        Parameters
+        ----------
+        budget : TimeBudget, float, or None
+            The budget to use. A number is the budget in seconds, with the
+            default policy and circuit breaker. If None, validators are
+            no longer limited.
+        """
+
+        self._budget = as_budget(budget)
+        self._wrap_check_value()
+
+    def set_outermost_only(self, outermost_only):
+        """
+        Set whether only the outermost call of this function is validated.
+
+        Recursive calls (i.e. calls made while this function is already
+        running in the current thread or asyncio task) then skip validation
+        of their inputs and outputs, so that validating e.g. a tree walk
+        costs as much as validating its top-level call.
+
+        Parameters
+        ----------
+        outermost_only : bool
+            Whether to only validate the outermost call.
+        """
+
+        if not outermost_only:
+            self.__dict__.pop("_outermost", None)
+        elif self.__dict__.get("_outermost") is None:
+            name = "py_validate.outermost[{name}]".format(name=self._name())
+            self._outermost = contextvars.ContextVar(name, default=False)
+
+    def set_identity_cache(self, cache):
+        """
+        Set the cache of objects that already passed the validators of this
+        function, such that checking them again is skipped.
+
+        Parameters
+        ----------
+        cache : IdentityCache, bool, or None
+            The cache to use, which can be shared between functions (see
+            `IdentityCache`). If True, a new IdentityCache is used. If
+            False or None, objects are no longer cached.
+        """
+
+        self._identity_cache = as_identity_cache(cache)
+        self._wrap_check_value()
+
+    def _wrap_check_value(self):
+        """
+        Wrap `_check_value` for this instance according to its time budget
+        and identity cache.
+
+        The wrapped check shadows the `_check_value` staticmethod for this
+        instance only, so functions without either do not pay for them.
+        """
+
+        check_value = ValidatedFunction._check_value
+
+        if self._budget is not None:
+            check_value = self._budget.wrap(check_value, self._name())
+
+        # Outermost, so that cached objects are not sent to a worker thread.
+        if self._identity_cache is not None:
+            check_value = self._identity_cache.wrap(check_value)
+
+        if check_value is ValidatedFunction._check_value:
+            self.__dict__.pop("_check_value", None)
+        else:
+            self._check_value = check_value
+
+    def defer_update(self, update):
+        """
+        Defer an update to the validators until the function is first called.
+
+        This allows expensive work (e.g. resolving annotations) to be moved
+        out of decoration time, which is usually module import time.
+
+        Parameters
+        ----------
+        update : callable
+            A function that takes this ValidatedFunction instance and updates
+            its validators via its `update_*` methods.
+        """
+
+        self._deferred_updates += (update,)
+
+    def apply_deferred_updates(self):
+        """
+        Apply (and clear) any updates deferred with `defer_update`.
+
+        Each update is only cleared once it has been applied, so an update
+        that fails (e.g. an annotation that cannot be resolved yet) is tried
+        again on the next call, rather than leaving the function unvalidated.
+        """
+
+        with _update_lock:
+            while self._deferred_updates:
+                update = self._deferred_updates[0]
+                update(self)
+
+                self._deferred_updates = self._deferred_updates[1:]
+
     @DocSubstitution(tabs=2, output_len_doc=output_len_doc)
     def update_exp_output_len(self, exp_output_len):
         """
@@ -125,6 +715,9 @@ class ValidatedFunction(object):
         """
 
         if exp_output_len is not None:
+            if self._annotated_outputs:
+                self._clear_annotated_outputs()
+
             if not isinstance(exp_output_len, int):
                 raise TypeError("Expected an integer for "
                                 "expected output length")
@@ -134,6 +727,7 @@ class ValidatedFunction(object):
                                  "must be positive or -1")
 
         self._exp_output_len = exp_output_len
+        self._select_output_plan()
 
     def update_input_validators(self, **validators):
         """
@@ -146,32 +740,188 @@ class ValidatedFunction(object):
         ----------
         validators : kwargs
             The new input validators to add / update in the existing ones.
+            Array specs in string form (e.g. "ndarray[float64, (n, 3)]")
+            are parsed here, once.
 
         Raises
         ------
         ValueError : validators were attempted to be set for a variable that
-                     already has validators set for it.
+                     already has validators set for it, or an array spec
+                     was invalid.
         """
 
+        input_validators = FrozenDict(self._input_validators)
+
         try:
-            self._input_validators.update(**validators)
+            input_validators.update(
+                (var_name, resolve_array_spec(validator))
+                for var_name, validator in validators.items())
         except KeyError as e:
             raise ValueError("Validator(s) for input "
                              "{var} already set.".format(var=str(e)))
 
+        self._input_validators = intern_map(input_validators)
+        self._input_names = intern_tuple(self._input_validators)
+        self._update_shared_symbols()
+
     def update_output_validators(self, *validators):
         """
         Update the output validators.
 
-        This function will append new validators to the existing ones.
+        This function will append new validators to the existing ones,
+        unless those were set from the return annotation, in which case
+        they are replaced.
 
         Parameters
         ----------
         validators : args
-            The new output validators to add to the existing ones.
+            The new output validators to add to the existing ones. Array
+            specs in string form are parsed here, once.
+
+        Raises
+        ------
+        ValueError : an array spec was invalid.
+        """
+
+        if validators and self._annotated_outputs:
+            self._clear_annotated_outputs()
+
+        self._output_validators = intern_tuple(
+            self._output_validators +
+            tuple(resolve_array_spec(validator) for validator in validators))
+        self._output_names = output_names(len(self._output_validators))
+        self._select_output_plan()
+        self._update_shared_symbols()
+
+    def _clear_annotated_outputs(self):
+        """
+        Clear the outputs set from the return annotation.
+        """
+
+        self._annotated_outputs = False
+        self._exp_output_len = None
+        self._output_validators = empty_tuple
+        self._output_names = empty_tuple
+
+    def check_accepts(self, arg_names):
+        """
+        Check that `f` accepts arguments of the given names. A function with
+        a **kwargs parameter accepts arguments of any name.
+
+        Parameters
+        ----------
+        arg_names : iterable
+            The names of the arguments.
+
+        Raises
+        ------
+        ValueError : `f` does not accept some of the arguments.
         """
 
-        self._output_validators = self._output_validators + validators
+        code = self.f.__code__
+
+        if code.co_flags & inspect.CO_VARKEYWORDS:
+            return
+
+        accepted = code.co_varnames[:code.co_argcount + code.co_kwonlyargcount]
+        missing = [name for name in arg_names if name not in accepted]
+
+        if missing:
+            msg = "{name} does not accept validated argument(s) {missing}"
+            raise ValueError(msg.format(name=self._name(), missing=missing))
+
+    def inherit(self, f):
+        """
+        Validate another function (e.g. an override of this method in a
+        subclass) exactly as this one.
+
+        The validation plan (validators, names, and output plan) is shared
+        with the new ValidatedFunction rather than rebuilt, as it is never
+        modified in place. Updating the validators of either function later
+        on only affects that function.
+
+        Parameters
+        ----------
+        f : callable
+            The function to validate.
+
+        Returns
+        -------
+        validated : ValidatedFunction
+            The validated function.
+
+        Raises
+        ------
+        ValueError : `f` does not accept an argument that is validated.
+        """
+
+        if self._deferred_updates:
+            self.apply_deferred_updates()
+
+        validated = ValidatedFunction(f)
+        validated.check_accepts(self._input_names)
+        validated._inherit_positions(self)
+
+        for name in _plan_attributes:
+            setattr(validated, name, getattr(self, name))
+
+        return validated
+
+    def _inherit_positions(self, other):
+        """
+        Name the positional arguments that `f` takes with *args after those
+        of another ValidatedFunction, so that they are validated as such.
+        """
+
+        code = self.f.__code__
+
+        if not code.co_flags & inspect.CO_VARARGS:
+            return
+
+        own = code.co_varnames[:code.co_argcount]
+        theirs = other.var_names
+
+        # Unless inherited themselves, these include the local variables.
+        if theirs is other.f.__code__.co_varnames:
+            theirs = theirs[:other.f.__code__.co_argcount]
+
+        if len(theirs) > len(own):
+            self.var_names = own + theirs[len(own):]
+
+    def _update_shared_symbols(self):
+        """
+        Determine whether array specs of the inputs and outputs share
+        dimension symbols, which then have to be bound in each call.
+        """
+
+        self._shared_symbols = shares_symbols(
+            list(self._input_validators.values()) +
+            list(self._output_validators))
+
+    def _select_output_plan(self):
+        """
+        Select how outputs are validated, based on the expected output
+        length and the output validators.
+
+        This is done once whenever either is updated, so that each call
+        only runs the checks relevant to its validation mode.
+        """
+
+        exp_output_len = self._exp_output_len
+        has_validators = any(validator is not None for validator
+                             in self._output_validators)
+
+        if exp_output_len is None or exp_output_len == -1:
+            if not has_validators:
+                plan = None
+            elif exp_output_len == -1:
+                plan = ValidatedFunction._validate_whole_output
+            else:
+                plan = ValidatedFunction._validate_any_outputs
+        else:
+            plan = ValidatedFunction._validate_fixed_outputs
+
+        self._output_plan = plan
 
     @staticmethod
     @DocSubstitution(tabs=3, validator_doc=validator_doc)
@@ -190,6 +940,12 @@ class ValidatedFunction(object):
 
             {validator_doc}
 
+        Returns
+        -------
+        unchecked : object
+            UNCHECKED if the validator let the value through without
+            checking it (see `TimeBudget.run`), or None otherwise.
+
         Raises
         ------
         TypeError : the argument had a type mismatch with `validator` OR
@@ -200,32 +956,30 @@ class ValidatedFunction(object):
         if validator is None:
             return
 
-        def raise_exception_failure(inp_name, exc):
-            """
-            Raise an informative failure if the validator raises an Exception.
-
-            Parameters
-            ----------
-            inp_name : str
-                The name of the input on which the validation failed.
-            exc : Exception
-                The error that was raised during execution of the validator.
-            """
-
-            exception_failure = "Failed validation for input '{inp_name}': "
-            raise type(exc)(exception_failure.format(
-                inp_name=inp_name) + str(exc))
+        # Fast path for plain classes (e.g. int), the most common validators.
+        # Generic aliases and `typing.Any` have other metaclasses.
+        if type(validator) is type and isinstance(val, validator):
+            return
 
         if isinstance(validator, str):
-            if validator.startswith("~"):
-                validator = NegateShortcut(validator[1:])
-            else:
-                validator = get_shortcut(validator)
+            validator = get_shortcut(validator)
 
             try:
                 validator(val)
             except Exception as e:
-                raise_exception_failure(arg, e)
+                _raise_exception_failure(arg, e, val)
+
+        elif is_generic(validator):
+            try:
+                compile_generic(validator)(val)
+            except GenericMismatch as e:
+                msg = ("Incorrect type for variable '{inp_name}': "
+                       "expected {exp_type} but got {act_type} instead")
+                error = TypeError(msg.format(inp_name=arg + e.location,
+                                             exp_type=e.expected,
+                                             act_type=e.actual))
+                error.value = val
+                raise error
 
         elif isinstance(validator, type):
             if not isinstance(val, validator):
@@ -234,71 +988,327 @@ class ValidatedFunction(object):
 
                 msg = ("Incorrect type for variable '{inp_name}': "
                        "expected {exp_type} but got {act_type} instead")
-                raise TypeError(msg.format(inp_name=arg,
-                                           exp_type=exp_type,
-                                           act_type=act_type))
+                error = TypeError(msg.format(inp_name=arg,
+                                             exp_type=exp_type,
+                                             act_type=act_type))
+                error.value = val
+                raise error
         elif callable(validator):
             try:
                 is_valid = validator(val)
             except Exception as e:
-                raise_exception_failure(arg, e)
+                _raise_exception_failure(arg, e, val)
 
             if is_valid is False:
-                msg = ("Invalid value for variable "
-                       "'{inp_name}': {val}")
-                raise ValueError(msg.format(inp_name=arg, val=val))
+                raise _invalid_value(arg, val)
+
+            if is_valid is UNCHECKED:
+                return is_valid
 
+            if is_valid is not True and inspect.iscoroutine(is_valid):
+                is_valid.close()  # never awaited
+
+                msg = ("Async validator for variable '{inp_name}' can "
+                       "only be used with an async function")
+                raise TypeError(msg.format(inp_name=arg))
+
+        elif isinstance(validator, AsyncValidator):
+            msg = ("Async validator for variable '{inp_name}' can "
+                   "only be used with an async function")
+            raise TypeError(msg.format(inp_name=arg))
         else:
             validator_type = type(validator).__name__
             raise TypeError("Validator must either be a shortcut, "
                             "callable, or type, not {v_type}"
                             .format(v_type=validator_type))
 
-    def _validate_inputs(self, *args, **kwargs):
+    def _validate_inputs(self, args, kwargs, check_value=None):
         """
         Validate the inputs to a function.
+
+        Parameters
+        ----------
+        args : tuple
+            The positional arguments to the function.
+        kwargs : dict
+            The keyword arguments to the function.
+        check_value : callable, default None
+            The function with which to check each value, which defaults
+            to `_check_value` (but may, for example, be timed).
         """
 
-        for index, val in enumerate(args):
-            # Too many arguments have been provided,
-            # but let Python handle this instead of us.
-            if index >= len(self.var_names):
-                break
+        validators = self._input_validators
+
+        # Without validators, there is nothing to check, and Python
+        # will raise on duplicate arguments when `f` is called.
+        if not validators:
+            return
+
+        if check_value is None:
+            check_value = self._check_value
+
+        # Loops below are written with indices instead of iterators so that
+        # validating a call allocates nothing on the passing path.
+        var_names = self.var_names
+        count = min(len(args), len(var_names))
+        index = 0
 
-            var_name = self.var_names[index]
+        # If too many arguments have been provided, let
+        # Python handle this instead of us (i.e. ignore them).
+        while index < count:
+            var_name = var_names[index]
 
-            if var_name in kwargs:
+            if kwargs and var_name in kwargs:
                 msg = ("{func_name}() got multiple values "
                        "for argument '{arg_name}'")
                 raise TypeError(msg.format(func_name=self.f.__name__,
                                            arg_name=var_name))
 
+            validator = validators.get(var_name)
+
+            if validator is not None:
+                check_value(var_name, args[index], validator)
+
             index += 1
 
-            validator = self._input_validators.get(var_name)
-            self._check_value(var_name, val, validator)
+        if kwargs:
+            input_names = self._input_names
+            count = len(input_names)
+            index = 0
+
+            while index < count:
+                var_name = input_names[index]
+
+                if var_name in kwargs:
+                    check_value(var_name, kwargs[var_name],
+                                validators[var_name])
+
+                index += 1
+
+    def _validate_whole_output(self, result, check_value):
+        """
+        Validate the output of a function as a single value.
+
+        This is the output plan when the expected output length is -1.
+
+        Parameters
+        ----------
+        result : object
+            The output of the function.
+        check_value : callable
+            The function with which to check the value.
+        """
+
+        validator = self._output_validators[0]
+
+        if validator is not None:
+            check_value(self._output_names[0], result, validator)
+
+    def _validate_any_outputs(self, result, check_value):
+        """
+        Validate the output(s) of a function, validating the elements of
+        a returned tuple as separate outputs.
+
+        This is the output plan when the expected output length is None.
+
+        Parameters
+        ----------
+        result : object
+            The output of the function.
+        check_value : callable
+            The function with which to check the value(s).
+        """
 
-        for var_name, val in kwargs.items():
-            validator = self._input_validators.get(var_name)
-            self._check_value(var_name, val, validator)
+        if type(result) is tuple:
+            self._validate_output_elements(result, check_value)
+        elif self._output_validators:
+            self._validate_whole_output(result, check_value)
 
-    def _validate_outputs(self, *args):
+    def _validate_fixed_outputs(self, result, check_value):
         """
-        Validate the outputs of a function.
+        Validate the outputs of a function that is expected to return
+        a specific number of outputs.
+
+        This is the output plan when the expected output length is given.
+
+        Parameters
+        ----------
+        result : object
+            The output of the function.
+        check_value : callable
+            The function with which to check the value(s).
+
+        Raises
+        ------
+        OutputLengthError : the function returned an unexpected number of
+                            outputs.
         """
 
-        if self._exp_output_len is not None and self._exp_output_len != -1:
-            if self._exp_output_len != len(args):
-                raise ValueError(
-                    "Expected {exp_count} items returned but "
-                    "got {act_count}".format(exp_count=self._exp_output_len,
-                                             act_count=len(args)))
+        exp_output_len = self._exp_output_len
+
+        if type(result) is tuple:
+            act_output_len = len(result)
+        else:
+            act_output_len = 1
 
-        for index, validator in enumerate(self._output_validators):
-            if index >= len(args):
-                break
+        if exp_output_len != act_output_len:
+            raise OutputLengthError(
+                "Expected {exp_count} items returned but "
+                "got {act_count}".format(exp_count=exp_output_len,
+                                         act_count=act_output_len))
+
+        if type(result) is tuple:
+            self._validate_output_elements(result, check_value)
+        elif self._output_validators:
+            self._validate_whole_output(result, check_value)
+
+    def _validate_output_elements(self, outputs, check_value):
+        """
+        Validate each element of a returned tuple as a separate output.
+
+        Parameters
+        ----------
+        outputs : tuple
+            The outputs of the function.
+        check_value : callable
+            The function with which to check each value.
+        """
+
+        output_names = self._output_names
+        output_validators = self._output_validators
+        count = min(len(outputs), len(output_validators))
+        index = 0
+
+        while index < count:
+            validator = output_validators[index]
+
+            if validator is not None:
+                check_value(output_names[index], outputs[index], validator)
+
+            index += 1
+
+
+def _lookup(module, qualname):
+    """
+    Look up an object by its module and qualified name, if it is imported.
+
+    Parameters
+    ----------
+    module : str
+        The name of the module containing the object.
+    qualname : str
+        The qualified name of the object within the module.
+
+    Returns
+    -------
+    obj : object
+        The object, or None if it could not be found.
+    """
+
+    obj = sys.modules.get(module)
+
+    for name in qualname.split("."):
+        obj = getattr(obj, name, None)
+
+    return obj
+
+
+def _restore_by_reference(module, qualname):
+    """
+    Restore a pickled ValidatedFunction by importing it from its module.
+    """
+
+    obj = importlib.import_module(module)
+
+    for name in qualname.split("."):
+        obj = getattr(obj, name)
+
+    return obj
+
+
+def _restore_from_spec(f, input_validators, exp_output_len,
+                       output_validators, deferred_updates,
+                       outermost_only=False, config=None):
+    """
+    Restore a pickled ValidatedFunction from its spec.
+    """
+
+    validated = ValidatedFunction(f)
+    validated.update_input_validators(**input_validators)
+    validated.update_exp_output_len(exp_output_len)
+    validated.update_output_validators(*output_validators)
+    validated.set_outermost_only(outermost_only)
+
+    if config:
+        validated.set_reporter(config.get("_reporter"))
+        validated.set_time_budget(config.get("_budget"))
+        validated.set_identity_cache(config.get("_identity_cache"))
+
+    for update in deferred_updates:
+        validated.defer_update(update)
+
+    return validated
+
+
+# The attributes holding the configuration set for a ValidatedFunction
+# instance, which is pickled along with its spec (see `__reduce__`).
+_config_attributes = ("_reporter", "_budget", "_identity_cache")
+
+# The attributes that make up the validation plan of a ValidatedFunction,
+# which can be shared between instances (see `inherit`).
+_plan_attributes = ("_exp_output_len", "_output_validators", "_output_names",
+                    "_output_plan", "_input_validators", "_input_names",
+                    "_shared_symbols", "_annotated_outputs")
+
+
+def _raise_exception_failure(inp_name, exc, val):
+    """
+    Raise an informative failure if the validator raises an Exception.
+
+    The offending value is kept on the raised error as its `value`
+    attribute.
+
+    Parameters
+    ----------
+    inp_name : str
+        The name of the input on which the validation failed.
+    exc : Exception
+        The error that was raised during execution of the validator.
+    val : object
+        The value on which the validation failed.
+    """
+
+    exception_failure = "Failed validation for input '{inp_name}': "
+    msg = exception_failure.format(inp_name=inp_name) + str(exc)
+
+    error = type(exc)(msg)
+    error.value = val
+    raise error
+
+
+def _invalid_value(inp_name, val):
+    """
+    Build the error for a value that a validator returned False for.
+
+    The value is truncated in the message (see `short_repr`), which keeps
+    rendering it cheap even for huge values, and is kept on the error as
+    its `value` attribute.
+
+    Parameters
+    ----------
+    inp_name : str
+        The name of the input on which the validation failed.
+    val : object
+        The value on which the validation failed.
+
+    Returns
+    -------
+    error : ValueError
+        The error to raise.
+    """
 
-            val = args[index]
-            var_name = "Output {i}".format(i=index)
+    msg = "Invalid value for variable '{inp_name}': {val}"
 
-            self._check_value(var_name, val, validator)
+    error = ValueError(msg.format(inp_name=inp_name, val=short_repr(val)))
+    error.value = val
+    return error
@@ -0,0 +1,477 @@
+"""
+Time budgets for expensive validators, with a circuit breaker.
+
+Validators under a budget run on a worker thread, and the caller waits
+for at most the budget once the validator has started. A thread cannot be
+interrupted, so a validator that overruns keeps running in the background;
+only a few runs of each validator may be in flight at once, and after
+repeated overruns, the circuit breaker disables it so that it stops tying
+up workers.
+"""
+
+from .reporting import get_logger
+from .shortcuts import get_shortcut
+
+import threading
+import time
+
+# What to do when a validator overruns its budget.
+POLICIES = ("pass", "fail", "warn")
+
+# Returned for values that were let through without being checked (because
+# their validator was disabled or overran its budget), so that they are not
+# mistaken for values that passed, e.g. by an IdentityCache.
+UNCHECKED = object()
+
+
+class BudgetExceeded(TimeoutError):
+    """
+    Exception class for when a validator overruns its time budget.
+    """
+
+    pass
+
+
+class TimeBudget(object):
+    """
+    Time budget for validators, with a circuit breaker per validator.
+
+    Each validator is identified by a name (e.g. "module.func:a" for the
+    argument "a" of a function). After `max_overruns` consecutive overruns,
+    the validator is disabled, i.e. its values pass without being checked,
+    until `reset_after` seconds have passed (if ever).
+    """
+
+    def __init__(self, seconds, policy="fail", max_overruns=5,
+                 reset_after=None, callback=None, workers=4,
+                 max_in_flight=None):
+        """
+        Initialize a TimeBudget instance.
+
+        Parameters
+        ----------
+        seconds : float > 0
+            The time that a validator may take to check a value, from when
+            it starts running on a worker. A validator that cannot start
+            within this time (because all workers are busy) is skipped
+            without counting as an overrun.
+        policy : {"pass", "fail", "warn"}, default "fail"
+            What to do when a validator overruns its budget: let the value
+            pass, fail validation with a BudgetExceeded error (a subclass of
+            TimeoutError), or let the value pass but log a warning to the
+            "py_validate" logger.
+        max_overruns : int > 0 or None, default 5
+            The number of consecutive overruns after which a validator is
+            disabled. If None, validators are never disabled.
+        reset_after : float > 0 or None, default None
+            The number of seconds after which a disabled validator is tried
+            again. One more overrun then disables it again. If None,
+            validators stay disabled until `reset` is called.
+        callback : callable, default None
+            A function called with the validator name and the event (either
+            "overrun" or "disabled"), e.g. to increment metrics counters.
+        workers : int > 0, default 4
+            The number of worker threads on which validators are run.
+        max_in_flight : int > 0 or None, default None
+            The number of runs of a validator that may be in flight at once,
+            including overruns still running in the background. Further
+            runs are skipped without counting as overruns. If None, half the
+            workers (and at least one).
+
+        Raises
+        ------
+        ValueError : one of the parameters was invalid.
+        """
+
+        if not seconds > 0:
+            raise ValueError("seconds must be positive")
+
+        if policy not in POLICIES:
+            raise ValueError("policy must be one of {policies}"
+                             .format(policies=", ".join(POLICIES)))
+
+        if max_overruns is not None and (not isinstance(max_overruns, int) or
+                                         max_overruns < 1):
+            raise ValueError("max_overruns must be a positive integer or None")
+
+        if reset_after is not None and not reset_after > 0:
+            raise ValueError("reset_after must be positive or None")
+
+        if not isinstance(workers, int) or workers < 1:
+            raise ValueError("workers must be a positive integer")
+
+        if max_in_flight is not None and (not isinstance(max_in_flight, int)
+                                          or max_in_flight < 1):
+            raise ValueError("max_in_flight must be a positive integer "
+                             "or None")
+
+        self.seconds = seconds
+        self.policy = policy
+        self.max_overruns = max_overruns
+        self.reset_after = reset_after
+        self.callback = callback
+        self.workers = workers
+        self.max_in_flight = max_in_flight
+
+        # Maps validator names to [consecutive overruns, time disabled
+        # (or None), calls, overruns, skipped calls, runs in flight].
+        self._states = {}
+
+        # Maps the names of validators limited with `limit` to how many
+        # validators were limited under that name.
+        self._limited = {}
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def run(self, name, check, *args):
+        """
+        Run a check within the budget.
+
+        Parameters
+        ----------
+        name : str
+            The name of the validator, for the circuit breaker and metrics.
+        check : callable
+            The check, which is called with `args`.
+
+        Returns
+        -------
+        result : object
+            The result of the check, or UNCHECKED if the check was disabled,
+            or overran or could not start with the "pass" or "warn" policy.
+
+        Raises
+        ------
+        BudgetExceeded : the check overran or could not start with the
+                         "fail" policy.
+        """
+
+        max_in_flight = self.max_in_flight
+
+        if max_in_flight is None:
+            max_in_flight = max(1, self.workers // 2)
+
+        with self._lock:
+            state = self._states.get(name)
+
+            if state is None:
+                state = self._states[name] = [0, None, 0, 0, 0, 0]
+
+            state[2] += 1
+
+            if state[1] is not None:
+                reset_after = self.reset_after
+
+                if (reset_after is None or
+                        time.monotonic() - state[1] < reset_after):
+                    state[4] += 1
+                    return UNCHECKED
+
+                # Try again, but disable straight away on another overrun.
+                state[0] = self.max_overruns - 1
+                state[1] = None
+
+            if state[5] >= max_in_flight:
+                return self._not_started(name, state)
+
+            state[5] += 1
+
+        started = threading.Event()
+
+        def task():
+            started.set()
+
+            try:
+                return check(*args)
+            finally:
+                with self._lock:
+                    state[5] -= 1
+
+        future = self._get_executor().submit(task)
+
+        # The budget only starts once the check does.
+        if not started.wait(self.seconds) and future.cancel():
+            with self._lock:
+                state[5] -= 1
+                return self._not_started(name, state)
+
+        from concurrent.futures import TimeoutError as FutureTimeoutError
+
+        try:
+            result = future.result(self.seconds)
+        except FutureTimeoutError:
+            if future.done():  # raised by the check itself
+                raise
+
+            return self._overrun(name, state)
+
+        with self._lock:
+            state[0] = 0
+
+        return result
+
+    def _not_started(self, name, state):
+        """
+        Record a run of a validator that could not start, because too many
+        of its runs were in flight or all workers were busy, and apply the
+        policy. Must be called with the lock held.
+        """
+
+        state[4] += 1
+
+        if self.policy == "fail":
+            raise BudgetExceeded("Validator could not start within its time "
+                                 "budget of {seconds} seconds"
+                                 .format(seconds=self.seconds))
+
+        if self.policy == "warn":
+            get_logger().warning("Validator %s could not start within its "
+                                 "time budget of %s seconds", name,
+                                 self.seconds)
+
+        return UNCHECKED
+
+    def _overrun(self, name, state):
+        """
+        Record an overrun of a validator, and apply the policy.
+        """
+
+        max_overruns = self.max_overruns
+
+        with self._lock:
+            state[0] += 1
+            state[3] += 1
+
+            disable = (max_overruns is not None and state[1] is None and
+                       state[0] >= max_overruns)
+
+            if disable:
+                state[1] = time.monotonic()
+
+        callback = self.callback
+
+        if callback is not None:
+            callback(name, "overrun")
+
+        if disable:
+            get_logger().warning("Disabled validator %s after %d "
+                                 "consecutive time budget overruns", name,
+                                 max_overruns)
+
+            if callback is not None:
+                callback(name, "disabled")
+
+        if self.policy == "fail":
+            raise BudgetExceeded("Validator exceeded its time budget "
+                                 "of {seconds} seconds"
+                                 .format(seconds=self.seconds))
+
+        if self.policy == "warn":
+            get_logger().warning("Validator %s exceeded its time budget of "
+                                 "%s seconds", name, self.seconds)
+
+        return UNCHECKED
+
+    def _get_executor(self):
+        """
+        Get the (lazily created) executor on which validators are run.
+
+        `concurrent.futures` is slow to import, so it is only imported here.
+        """
+
+        executor = self._executor
+
+        if executor is None:
+            with self._lock:
+                if self._executor is None:
+                    from concurrent.futures import ThreadPoolExecutor
+
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.workers,
+                        thread_name_prefix="py_validate-budget")
+
+                executor = self._executor
+
+        return executor
+
+    def limit(self, validator, name=None):
+        """
+        Put a single validator under this budget.
+
+        Parameters
+        ----------
+        validator : str or callable
+            The shortcut or callable validator.
+        name : str, default None
+            The name of the validator, for the circuit breaker and metrics.
+            Defaults to the name of the validator, numbered if another
+            validator was limited by this budget under the same name (e.g.
+            "<lambda>#2"), so that each has its own circuit breaker.
+
+        Returns
+        -------
+        budgeted_validator : BudgetedValidator
+            A callable validator that runs `validator` within this budget.
+        """
+
+        return BudgetedValidator(self, validator, name)
+
+    def _unique_name(self, name):
+        """
+        Number a validator name if it was already used by `limit`.
+        """
+
+        with self._lock:
+            count = self._limited.get(name, 0) + 1
+            self._limited[name] = count
+
+        if count == 1:
+            return name
+
+        return "{name}#{count}".format(name=name, count=count)
+
+    def __reduce__(self):
+        """
+        Reduce this instance for pickling, e.g. along with a validated
+        function sent to a process pool. Only its parameters are pickled,
+        so metrics and circuit breakers start afresh.
+        """
+
+        return TimeBudget, (self.seconds, self.policy, self.max_overruns,
+                            self.reset_after, self.callback, self.workers,
+                            self.max_in_flight)
+
+    def wrap(self, check_value, func_name):
+        """
+        Wrap a value check such that it runs within this budget.
+
+        Values with no validator or with a type as their validator (which
+        is cheap to check) are checked directly.
+
+        Parameters
+        ----------
+        check_value : callable
+            The check taking the argument name, value, and validator.
+        func_name : str
+            The qualified name of the validated function.
+
+        Returns
+        -------
+        budgeted_check_value : callable
+            The check, within this budget. It returns UNCHECKED for values
+            that were let through without being checked.
+        """
+
+        def budgeted_check_value(arg, val, validator):
+            if validator is None or type(validator) is type:
+                return check_value(arg, val, validator)
+
+            name = "{func_name}:{arg}".format(func_name=func_name, arg=arg)
+
+            try:
+                return self.run(name, check_value, arg, val, validator)
+            except BudgetExceeded as e:
+                msg = "Failed validation for input '{inp_name}': {e}"
+                raise BudgetExceeded(msg.format(inp_name=arg, e=e))
+
+        return budgeted_check_value
+
+    def dump(self):
+        """
+        Dump the metrics of each validator run within this budget.
+
+        Returns
+        -------
+        metrics : dict
+            A JSON-serializable dictionary mapping validator names to the
+            number of calls ("calls"), overruns ("overruns"), and calls
+            skipped while disabled or because the check could not start
+            ("skipped"), and whether the validator is currently disabled
+            ("disabled").
+        """
+
+        with self._lock:
+            return {name: {"calls": state[2], "overruns": state[3],
+                           "skipped": state[4],
+                           "disabled": state[1] is not None}
+                    for name, state in self._states.items()}
+
+    def reset(self):
+        """
+        Clear all metrics, and re-enable all disabled validators.
+        """
+
+        with self._lock:
+            self._states.clear()
+
+
+class BudgetedValidator(object):
+    """
+    Callable validator that runs another validator within a TimeBudget.
+    """
+
+    def __init__(self, budget, validator, name=None):
+        """
+        Initialize a BudgetedValidator instance.
+
+        Parameters
+        ----------
+        budget : TimeBudget
+            The budget within which to run the validator.
+        validator : str or callable
+            The shortcut or callable validator.
+        name : str, default None
+            The name of the validator (see `TimeBudget.limit`).
+
+        Raises
+        ------
+        TypeError : the validator was neither a shortcut nor a callable.
+        """
+
+        if isinstance(validator, str):
+            check = get_shortcut(validator)
+        elif callable(validator):
+            check = validator
+        else:
+            raise TypeError("Budgeted validator must either be "
+                            "a shortcut or callable")
+
+        if name is None:
+            name = budget._unique_name(getattr(check, "__name__",
+                                               repr(check)))
+
+        self.budget = budget
+        self.check = check
+        self.name = name
+
+    def __call__(self, val):
+        return self.budget.run(self.name, self.check, val)
+
+
+def as_budget(budget):
+    """
+    Convert a budget argument into a TimeBudget.
+
+    Parameters
+    ----------
+    budget : TimeBudget, float, or None
+        The budget to use. A number is the time budget in seconds,
+        with the default policy and circuit breaker.
+
+    Returns
+    -------
+    time_budget : TimeBudget or None
+        The budget to use, or None to not limit validators.
+
+    Raises
+    ------
+    TypeError : the budget was neither a TimeBudget nor a number.
+    """
+
+    if budget is None or isinstance(budget, TimeBudget):
+        return budget
+
+    if isinstance(budget, (int, float)) and not isinstance(budget, bool):
+        return TimeBudget(budget)
+
+    raise TypeError("Budget must either be a TimeBudget, number, or None")
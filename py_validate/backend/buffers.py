@@ -0,0 +1,222 @@
+"""
+Validators for buffer-protocol arguments e.g. bytes, bytearray, memoryview,
+array.array, and mmap objects.
+
+Buffers are inspected through a `memoryview`, so the buffer is never copied
+as a whole: the format and size checks only look at the view's metadata, and
+value scans run over zero-copy slices of the buffer, one chunk at a time.
+Scanning a memory-mapped file thus works even if the file is larger than RAM.
+"""
+
+from .arrays import import_numpy
+
+import re
+
+# Named scans, mapped to a regular expression matching an invalid byte.
+# Regular expressions search a memoryview directly, so chunks are scanned
+# without being copied, and the first match gives the failing offset.
+buffer_scans = {
+    "ascii": re.compile(b"[\\x80-\\xff]"),
+    "printable": re.compile(b"[^\\x20-\\x7e\\t\\n\\r]"),
+    "nonzero": re.compile(b"\\x00"),
+}
+
+
+class BufferSpec(object):
+    """
+    Validator of a bytes-like object, through a memoryview of its buffer.
+    """
+
+    def __init__(self, format=None, itemsize=None, min_len=None,
+                 max_len=None, alignment=None, readonly=None, scans=None,
+                 chunk_size=1 << 20):
+        """
+        Initialize a BufferSpec instance.
+
+        Parameters
+        ----------
+        format : str, default None
+            The `struct` format of the buffer's items, e.g. "B" for bytes
+            or "d" for doubles. If None, any format is accepted.
+        itemsize : int, default None
+            The size of the buffer's items in bytes. If None, any itemsize
+            is accepted.
+        min_len : int, default None
+            The minimum number of items in the buffer.
+        max_len : int, default None
+            The maximum number of items in the buffer.
+        alignment : int, default None
+            The alignment in bytes of the start of the buffer e.g. 8 or 64.
+            Checking it requires NumPy.
+        readonly : bool, default None
+            Whether the buffer must be read-only (True) or writeable
+            (False). If None, either is accepted.
+        scans : str, callable, or list, default None
+            Checks of the buffer's bytes. Either one of the names "ascii",
+            "printable", or "nonzero", or a callable that takes a chunk of
+            the buffer (a memoryview of bytes) and returns True if all of
+            its bytes are valid. Scans stop at the first invalid chunk.
+        chunk_size : int > 0, default 1 << 20
+            The number of bytes scanned at a time.
+
+        Raises
+        ------
+        ValueError : an unknown scan name or invalid parameter was provided.
+        TypeError : a scan was neither a name nor a callable.
+        """
+
+        if scans is None:
+            scans = ()
+        elif isinstance(scans, str) or callable(scans):
+            scans = (scans,)
+
+        self.scans = []
+
+        for scan in scans:
+            if isinstance(scan, str):
+                if scan not in buffer_scans:
+                    raise ValueError("Unknown buffer scan: '{name}'"
+                                     .format(name=scan))
+            elif not callable(scan):
+                raise TypeError("Buffer scan must either be a name "
+                                "or callable")
+
+            self.scans.append(scan)
+
+        for name, value in (("itemsize", itemsize), ("alignment", alignment),
+                            ("chunk_size", chunk_size)):
+            if value is not None and (not isinstance(value, int) or
+                                      value < 1):
+                raise ValueError("{name} must be a positive integer"
+                                 .format(name=name))
+
+        self.format = None if format is None else format.lstrip("@")
+        self.itemsize = itemsize
+        self.min_len = min_len
+        self.max_len = max_len
+        self.alignment = alignment
+        self.readonly = readonly
+        self.chunk_size = chunk_size
+
+    def __call__(self, obj):
+        """
+        Check a bytes-like object.
+
+        Returns
+        -------
+        valid : bool
+            True, if the object's buffer matches the spec.
+
+        Raises
+        ------
+        TypeError : the object did not support the buffer protocol, or its
+                    items had the wrong format or size.
+        ValueError : the buffer had the wrong length, alignment, or
+                     writeability, or failed a scan.
+        """
+
+        try:
+            view = memoryview(obj)
+        except TypeError:
+            act_type = type(obj).__name__
+            msg = "Expected a bytes-like object but got: '{act_type}'"
+            raise TypeError(msg.format(act_type=act_type))
+
+        # Releasing the view straight away lets e.g. an mmap be closed,
+        # or a bytearray be resized, once the check is done.
+        with view:
+            self._check_view(view)
+
+        return True
+
+    def _check_view(self, view):
+        """
+        Check the metadata of a memoryview, then scan its bytes.
+        """
+
+        exp_format = self.format
+
+        if exp_format is not None:
+            act_format = view.format.lstrip("@")
+
+            if act_format != exp_format:
+                msg = "Expected a buffer of format '{exp}' but got '{act}'"
+                raise TypeError(msg.format(exp=exp_format, act=act_format))
+
+        if self.itemsize is not None and view.itemsize != self.itemsize:
+            msg = "Expected a buffer of itemsize {exp} but got {act}"
+            raise TypeError(msg.format(exp=self.itemsize, act=view.itemsize))
+
+        length = view.nbytes // view.itemsize
+
+        if self.min_len is not None and length < self.min_len:
+            msg = "Expected a buffer of at least {exp} items but got {act}"
+            raise ValueError(msg.format(exp=self.min_len, act=length))
+
+        if self.max_len is not None and length > self.max_len:
+            msg = "Expected a buffer of at most {exp} items but got {act}"
+            raise ValueError(msg.format(exp=self.max_len, act=length))
+
+        readonly = self.readonly
+
+        if readonly is not None and view.readonly != readonly:
+            raise ValueError("Expected a read-only buffer" if readonly
+                             else "Expected a writeable buffer")
+
+        if self.alignment is not None and view.nbytes:
+            if not view.c_contiguous:
+                raise ValueError("Expected a contiguous buffer to align")
+
+            address = _buffer_address(view)
+
+            if address % self.alignment:
+                msg = "Expected a buffer aligned to {alignment} bytes"
+                raise ValueError(msg.format(alignment=self.alignment))
+
+        if self.scans:
+            if not view.c_contiguous:
+                raise ValueError("Expected a contiguous buffer to scan")
+
+            self._scan(view.cast("B") if view.ndim != 1 or
+                       view.format != "B" else view)
+
+    def _scan(self, view):
+        """
+        Run the scans over zero-copy chunks of a memoryview of bytes.
+
+        All scans are run on a chunk before moving on to the next, so that
+        each chunk of a memory-mapped file is only paged in once.
+        """
+
+        chunk_size = self.chunk_size
+        nbytes = view.nbytes
+
+        for start in range(0, nbytes, chunk_size):
+            stop = min(start + chunk_size, nbytes)
+
+            with view[start:stop] as chunk:
+                for scan in self.scans:
+                    if isinstance(scan, str):
+                        match = buffer_scans[scan].search(chunk)
+
+                        if match is not None:
+                            offset = start + match.start()
+                            msg = ("Buffer scan '{name}' failed "
+                                   "at byte {offset}")
+                            raise ValueError(msg.format(name=scan,
+                                                        offset=offset))
+                    elif not scan(chunk):
+                        name = getattr(scan, "__name__", repr(scan))
+                        msg = ("Buffer scan '{name}' failed for "
+                               "bytes [{start}:{stop}]")
+                        raise ValueError(msg.format(name=name, start=start,
+                                                    stop=stop))
+
+
+def _buffer_address(view):
+    """
+    Get the memory address of the start of a buffer, without copying it.
+    """
+
+    np = import_numpy()
+    return np.frombuffer(view, dtype=np.uint8).ctypes.data
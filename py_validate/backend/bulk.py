@@ -0,0 +1,282 @@
+"""
+Bulk validation of every method of a class or function of a module.
+
+Rather than building a ValidatedFunction for each member up front, members
+are replaced by lightweight stubs that only hold the function and where it
+lives. A stub builds the validation plan of its function on the first call
+(or attribute access), and then replaces itself with the ValidatedFunction,
+so that later calls go straight to it.
+"""
+
+from .annotations import update_from_annotations
+from .arrays import resolve_array_spec
+from .base import ValidatedFunction, _lookup, _restore_by_reference
+from .shortcuts import get_shortcut
+
+import threading
+
+# Guards building the plans of stubs, so that each is only built once.
+_build_lock = threading.Lock()
+
+
+class ValidationStub(object):
+    """
+    Placeholder for a function whose validation plan is built on first use.
+    """
+
+    __slots__ = ("f", "owner", "name", "policy", "method_type", "_validated",
+                 "__weakref__")
+
+    def __init__(self, f, owner, name, policy, method_type=None):
+        """
+        Initialize a ValidationStub instance.
+
+        Parameters
+        ----------
+        f : callable
+            The function (or ValidatedFunction) to validate.
+        owner : class or module
+            The class or module that holds the function.
+        name : str
+            The name of the function in its owner.
+        policy : dict or "annotations"
+            How to validate the function (see `install_stubs`).
+        method_type : type, default None
+            Either `staticmethod` or `classmethod` if the function is wrapped
+            in one in its class.
+        """
+
+        self.f = f
+        self.owner = owner
+        self.name = name
+        self.policy = policy
+        self.method_type = method_type
+        self._validated = None
+
+    def resolve(self):
+        """
+        Get the ValidatedFunction of this stub, building it if need be.
+
+        Once built, the ValidatedFunction replaces this stub in its owner
+        (unless the owner's attribute has since been reassigned).
+
+        Returns
+        -------
+        validated : ValidatedFunction
+            The validated function.
+        """
+
+        validated = self._validated
+
+        if validated is not None:
+            return validated
+
+        with _build_lock:
+            if self._validated is None:
+                self._validated = build_plan(self.f, self.policy)
+
+                raw = vars(self.owner).get(self.name)
+                method_type = self.method_type
+
+                if raw is self or (method_type is not None and
+                                   isinstance(raw, method_type) and
+                                   raw.__func__ is self):
+                    setattr(self.owner, self.name, self._validated if
+                            method_type is None else
+                            method_type(self._validated))
+
+        return self._validated
+
+    def __call__(self, *args, **kwargs):
+        return self.resolve()(*args, **kwargs)
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+
+        return self.resolve().__get__(instance, owner)
+
+    def __getattr__(self, name):
+        # e.g. `set_profiler` or `unchecked`, so that the stub can be used
+        # as the ValidatedFunction that it stands in for.
+        if name.startswith("__") or name in ValidationStub.__slots__:
+            raise AttributeError(name)
+
+        return getattr(self.resolve(), name)
+
+    def __reduce__(self):
+        f = self.f
+        module = getattr(f, "__module__", None)
+        qualname = getattr(f, "__qualname__", None)
+
+        if module is not None and qualname is not None:
+            if _lookup(module, qualname) is self:
+                return _restore_by_reference, (module, qualname)
+
+        return self.resolve().__reduce__()
+
+    def __repr__(self):
+        return "<ValidationStub of {name}>".format(
+            name=getattr(self.f, "__qualname__", self.name))
+
+
+def build_plan(f, policy):
+    """
+    Build the ValidatedFunction of a function according to a policy.
+
+    Parameters
+    ----------
+    f : callable
+        The function (or ValidatedFunction) to validate.
+    policy : dict or "annotations"
+        How to validate the function (see `install_stubs`).
+
+    Returns
+    -------
+    validated : ValidatedFunction
+        The validated function.
+    """
+
+    validated = f if isinstance(f, ValidatedFunction) else ValidatedFunction(f)
+
+    if validated._deferred_updates:
+        validated.apply_deferred_updates()
+
+    # Validators set on the function itself take precedence.
+    if policy == "annotations":
+        update_from_annotations(validated, skip_existing=True)
+    else:
+        existing = validated._input_validators
+        validated.update_input_validators(**{
+            name: validator for name, validator
+            in policy_validators(validated.f, policy).items()
+            if name not in existing})
+
+    return validated
+
+
+def policy_validators(f, policy):
+    """
+    Get the validators of a policy that apply to the arguments of a function.
+
+    Parameters
+    ----------
+    f : callable
+        The function.
+    policy : dict or "annotations"
+        How to validate the function (see `install_stubs`).
+
+    Returns
+    -------
+    validators : dict
+        The validators in the policy for arguments of the function, or an
+        empty dictionary if the policy is "annotations" and the function
+        has no annotations (i.e. there is nothing to validate).
+    """
+
+    if policy == "annotations":
+        return getattr(f, "__annotations__", None) or {}
+
+    code = f.__code__
+    arg_names = code.co_varnames[:code.co_argcount + code.co_kwonlyargcount]
+
+    return {name: policy[name] for name in arg_names if name in policy}
+
+
+def check_policy(policy):
+    """
+    Check a policy for validating functions in bulk.
+
+    Shortcut expressions and array specs in the policy are checked here,
+    once, rather than for each function.
+
+    Parameters
+    ----------
+    policy : dict or "annotations"
+        How to validate each function (see `install_stubs`).
+
+    Raises
+    ------
+    TypeError : the policy was neither a dictionary nor "annotations".
+    ValueError : the policy had an invalid shortcut expression or array spec.
+    """
+
+    if isinstance(policy, dict):
+        for validator in policy.values():
+            if isinstance(validator, str):
+                if resolve_array_spec(validator) is validator:
+                    get_shortcut(validator)
+    elif policy != "annotations":
+        raise TypeError("Policy must either be a dictionary mapping "
+                        "argument names to validators or 'annotations'")
+
+
+def install_stubs(owner, policy, include=None, exclude=None):
+    """
+    Replace the functions of a class or module with validation stubs.
+
+    Parameters
+    ----------
+    owner : class or module
+        The class whose methods (including static and class methods), or the
+        module whose functions (defined in that module), to validate.
+    policy : dict or "annotations"
+        How to validate each function. A dictionary maps argument names to
+        validators, which are applied to every function with an argument of
+        that name. With "annotations", functions are validated against their
+        annotations, as with `validate_annotations`. Functions with nothing
+        to validate are left as they are.
+    include : iterable, default None
+        The names of the functions to validate. If None, every function
+        whose name does not start with an underscore is validated.
+    exclude : iterable, default None
+        The names of functions not to validate.
+
+    Returns
+    -------
+    names : list
+        The names of the functions that were replaced by stubs.
+
+    Raises
+    ------
+    TypeError : the policy was neither a dictionary nor "annotations".
+    ValueError : the policy had an invalid shortcut expression or array spec.
+    """
+
+    check_policy(policy)
+
+    exclude = frozenset(exclude or ())
+    members = vars(owner)
+    module = None if isinstance(owner, type) else owner.__name__
+    names = []
+
+    for name in list(members if include is None else include):
+        if name in exclude or (include is None and name.startswith("_")):
+            continue
+
+        raw = members.get(name)
+        method_type = type(raw) if isinstance(raw, (staticmethod,
+                                                    classmethod)) else None
+        f = raw.__func__ if method_type is not None else raw
+
+        if isinstance(f, ValidatedFunction):
+            target = f.f
+        elif callable(f) and hasattr(f, "__code__"):
+            target = f
+        else:
+            continue
+
+        # Functions imported from other modules are left to those modules.
+        if module is not None and getattr(target, "__module__",
+                                          None) != module:
+            continue
+
+        if not policy_validators(target, policy):
+            continue
+
+        stub = ValidationStub(f, owner, name, policy, method_type)
+        names.append(name)
+        setattr(owner, name, stub if method_type is None else
+                method_type(stub))
+
+    return names
@@ -0,0 +1,263 @@
+"""
+Identity-keyed cache of values that have already passed validation.
+
+Large immutable values (e.g. frozen configs or tuples of records) are often
+passed to validated functions over and over again. Once such a value has
+passed a validator, the cache lets later checks of the very same object
+against that validator be skipped.
+"""
+
+from collections import OrderedDict
+
+from .budgets import UNCHECKED
+
+import threading
+import weakref
+
+# The types of values that are cached by default.
+DEFAULT_TYPES = (tuple, frozenset, str, bytes)
+
+
+class IdentityCache(object):
+    """
+    Bounded cache of the validators that specific objects have passed.
+
+    Objects are identified by their `id`. An `id` can be reused once its
+    object is collected, so an entry must not outlive its object. Objects
+    that support weak references are thus tracked with one, whose callback
+    evicts the entry when the object is collected. Other objects (e.g.
+    tuples and strings) are pinned by the cache until they are evicted,
+    so their `id` cannot be reused while they are cached.
+
+    Only the most recently used `maxsize` objects are kept. Cached objects
+    must never be mutated (including any objects that they contain), or
+    they will not be validated again.
+    """
+
+    def __init__(self, maxsize=1024, types=DEFAULT_TYPES):
+        """
+        Initialize an IdentityCache instance.
+
+        Parameters
+        ----------
+        maxsize : int > 0, default 1024
+            The maximum number of objects kept in the cache.
+        types : tuple, default DEFAULT_TYPES
+            The types of values to cache. These should be (deeply)
+            immutable e.g. frozen dataclasses.
+
+        Raises
+        ------
+        ValueError : `maxsize` was not a positive integer.
+        """
+
+        if not isinstance(maxsize, int) or maxsize < 1:
+            raise ValueError("maxsize must be a positive integer")
+
+        self.maxsize = maxsize
+        self.types = tuple(types)
+
+        self.hits = 0
+        self.misses = 0
+
+        # Maps the id of an object to [weak reference or the object itself,
+        # whether the former, set of validators that the object passed].
+        self._entries = OrderedDict()
+
+        # Reentrant, as evicting an entry can collect objects whose weak
+        # reference callbacks then evict their own entries.
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def passed(self, val, validator):
+        """
+        Check whether an object has already passed a validator.
+
+        Parameters
+        ----------
+        val : object
+            The object to look up.
+        validator : object
+            The validator to look up.
+
+        Returns
+        -------
+        has_passed : bool
+            Whether the object is known to have passed the validator.
+        """
+
+        key = id(val)
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None:
+                self.misses += 1
+                return False
+
+            target, weak, validators = entry
+
+            if (target() if weak else target) is not val:
+                self.misses += 1
+                return False
+
+            try:
+                has_passed = validator in validators
+            except TypeError:  # unhashable validator
+                has_passed = False
+
+            if has_passed:
+                self.hits += 1
+                self._entries.move_to_end(key)
+            else:
+                self.misses += 1
+
+        return has_passed
+
+    def add(self, val, validator):
+        """
+        Record that an object passed a validator.
+
+        Parameters
+        ----------
+        val : object
+            The object that passed.
+        validator : object
+            The validator that it passed.
+        """
+
+        try:
+            hash(validator)
+        except TypeError:  # cannot be looked up
+            return
+
+        key = id(val)
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is not None:
+                target, weak, validators = entry
+
+                if (target() if weak else target) is val:
+                    validators.add(validator)
+                    self._entries.move_to_end(key)
+                    return
+
+            if type(val).__weakrefoffset__:
+                target = weakref.ref(val, self._evictor(key))
+                weak = True
+            else:
+                target = val
+                weak = False
+
+            self._entries[key] = [target, weak, {validator}]
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def _evictor(self, key):
+        """
+        Build the weak reference callback that evicts an entry.
+        """
+
+        entries = self._entries
+        lock = self._lock
+
+        def evict(ref):
+            with lock:
+                entry = entries.get(key)
+
+                if entry is not None and entry[0] is ref:
+                    del entries[key]
+
+        return evict
+
+    def clear(self):
+        """
+        Clear the cache and its statistics.
+        """
+
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __reduce__(self):
+        """
+        Reduce this instance for pickling, e.g. along with a validated
+        function sent to a process pool. Only its parameters are pickled,
+        as the identity of an object is specific to its process.
+        """
+
+        return IdentityCache, (self.maxsize, self.types)
+
+    def wrap(self, check_value):
+        """
+        Wrap a value check such that checks of cached objects are skipped.
+
+        Values of other types, and values with no validator or with a type
+        as their validator (which is cheap to check), are always checked.
+        Values that were let through without being checked (e.g. by a time
+        budget, see `TimeBudget.run`) are not cached.
+
+        Parameters
+        ----------
+        check_value : callable
+            The check taking the argument name, value, and validator.
+
+        Returns
+        -------
+        cached_check_value : callable
+            The check, skipping objects that already passed.
+        """
+
+        types = self.types
+
+        def cached_check_value(arg, val, validator):
+            if (validator is None or type(validator) is type or
+                    not isinstance(val, types)):
+                return check_value(arg, val, validator)
+
+            if self.passed(val, validator):
+                return
+
+            if check_value(arg, val, validator) is not UNCHECKED:
+                self.add(val, validator)
+
+        return cached_check_value
+
+
+def as_identity_cache(cache):
+    """
+    Convert a cache argument into an IdentityCache.
+
+    Parameters
+    ----------
+    cache : IdentityCache, bool, or None
+        The cache to use. If True, a new IdentityCache with the default
+        parameters is created. If False or None, no cache is used.
+
+    Returns
+    -------
+    identity_cache : IdentityCache or None
+        The cache to use, or None to not cache.
+
+    Raises
+    ------
+    TypeError : the cache was neither an IdentityCache nor a bool.
+    """
+
+    if cache is None or cache is False:
+        return None
+
+    if cache is True:
+        return IdentityCache()
+
+    if isinstance(cache, IdentityCache):
+        return cache
+
+    raise TypeError("Cache must either be an IdentityCache, bool, or None")
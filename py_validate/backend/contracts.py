@@ -0,0 +1,160 @@
+"""
+Inheritance of the validators of methods by their overrides in subclasses.
+
+Validators declared on a method (typically an abstract one) form a contract
+that every override in a subclass is validated against as well. Overrides
+share the validation plan of the method that they override, so the plan is
+built once for the whole class hierarchy rather than once per subclass.
+"""
+
+from .base import ValidatedFunction
+from .bulk import ValidationStub
+
+
+def _unwrap(raw):
+    """
+    Get the ValidatedFunction behind a class attribute, if any, along with
+    the `staticmethod` or `classmethod` type wrapping it.
+    """
+
+    method_type = type(raw) if isinstance(raw, (staticmethod,
+                                                classmethod)) else None
+    f = raw.__func__ if method_type is not None else raw
+
+    if isinstance(f, ValidationStub):
+        f = f.resolve()
+
+    return f, method_type
+
+
+def find_contract(cls, name):
+    """
+    Find the contract that a method of a class inherits, if any.
+
+    Parameters
+    ----------
+    cls : type
+        The class defining the method.
+    name : str
+        The name of the method.
+
+    Returns
+    -------
+    contract : ValidatedFunction or None
+        The ValidatedFunction of the nearest base class that defines the
+        method, or None if the method is not validated there.
+    """
+
+    for base in cls.__mro__[1:]:
+        raw = vars(base).get(name)
+
+        if raw is not None:
+            contract = _unwrap(raw)[0]
+            validated = isinstance(contract, ValidatedFunction)
+
+            return contract if validated else None
+
+    return None
+
+
+def inherit_contracts(cls):
+    """
+    Validate the methods that a class overrides against the validators of the
+    methods that they override.
+
+    Overrides that are validated themselves keep their own validators, and
+    gain those of the contract for arguments (or outputs) that they do not
+    validate yet.
+
+    Parameters
+    ----------
+    cls : type
+        The class whose methods we are to validate.
+
+    Returns
+    -------
+    names : list
+        The names of the methods that inherited a contract.
+
+    Raises
+    ------
+    ValueError : an override did not accept an argument of its contract.
+    """
+
+    names = []
+
+    for name, raw in list(vars(cls).items()):
+        f, method_type = _unwrap(raw)
+
+        if not (callable(f) and hasattr(f, "__code__") or
+                isinstance(f, ValidatedFunction)):
+            continue
+
+        contract = find_contract(cls, name)
+
+        if contract is None or f is contract:
+            continue
+
+        if isinstance(f, ValidatedFunction):
+            _merge_contract(f, contract)
+            validated = f
+        else:
+            validated = contract.inherit(f)
+
+        names.append(name)
+        setattr(cls, name, validated if method_type is None else
+                method_type(validated))
+
+    return names
+
+
+def _merge_contract(validated, contract):
+    """
+    Add the validators of a contract that a ValidatedFunction lacks.
+    """
+
+    if contract._deferred_updates:
+        contract.apply_deferred_updates()
+
+    if validated._deferred_updates:
+        validated.apply_deferred_updates()
+
+    existing = validated._input_validators
+    validators = {name: validator for name, validator
+                  in contract._input_validators.items()
+                  if name not in existing}
+
+    validated.check_accepts(validators)
+    validated._inherit_positions(contract)
+    validated.update_input_validators(**validators)
+
+    if validated._exp_output_len is None and not validated._output_validators:
+        validated.update_exp_output_len(contract._exp_output_len)
+        validated.update_output_validators(*contract._output_validators)
+
+
+class InheritContracts(object):
+    """
+    Mixin class whose subclasses validate their overrides of validated
+    methods the same way as the methods that they override.
+
+    For example, every override of the `area` method below is validated
+    against the validators declared on it:
+
+        class Shape(InheritContracts, abc.ABC):
+
+            @abc.abstractmethod
+            @validate_inputs(scale="number")
+            @validate_outputs(1, "number")
+            def area(self, scale):
+                pass
+
+        class Square(Shape):
+
+            def area(self, scale):
+                return self.side ** 2 * scale
+    """
+
+    def __init_subclass__(cls, **kwargs):
+        super(InheritContracts, cls).__init_subclass__(**kwargs)
+        inherit_contracts(cls)
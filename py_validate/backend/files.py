@@ -0,0 +1,239 @@
+"""
+Validators for file path and file object arguments.
+
+Files are checked without reading them: their existence and size come from
+`os.stat`, and magic bytes are checked by reading only the few bytes at the
+start (and, for some formats, the end) of the file. Results for paths are
+cached by path, modification time, and size, so repeated checks of an
+unchanged file only cost a `stat` call.
+"""
+
+from collections import OrderedDict
+
+from .helpers import bounded_repr
+
+import io
+import os
+import stat
+import threading
+
+# Magic bytes of common data file formats, as (header, trailer) pairs.
+magic_formats = {
+    "gzip": (b"\x1f\x8b", None),
+    "bz2": (b"BZh", None),
+    "zip": (b"PK\x03\x04", None),
+    "npy": (b"\x93NUMPY", None),
+    "parquet": (b"PAR1", b"PAR1"),
+    "hdf5": (b"\x89HDF\r\n\x1a\n", None),
+    "png": (b"\x89PNG\r\n\x1a\n", None),
+    "pdf": (b"%PDF-", None),
+}
+
+
+class FileSpec(object):
+    """
+    Validator of a file, given either as a path or as a binary file object.
+    """
+
+    def __init__(self, min_size=None, max_size=None, magic=None,
+                 cache_size=1024):
+        """
+        Initialize a FileSpec instance.
+
+        Parameters
+        ----------
+        min_size : int, default None
+            The minimum size of the file in bytes.
+        max_size : int, default None
+            The maximum size of the file in bytes.
+        magic : str, bytes, or tuple, default None
+            The magic bytes that the file must start with. Either one of the
+            names in `magic_formats` (e.g. "parquet" or "gzip"), the header
+            bytes, or a (header, trailer) pair of bytes (either of which can
+            be None) that the file must start and end with.
+        cache_size : int >= 0, default 1024
+            The maximum number of paths whose passing results are cached,
+            keyed by path, modification time, and size. If 0, results are
+            not cached. File objects are never cached.
+
+        Raises
+        ------
+        ValueError : an unknown format name or invalid parameter was provided.
+        TypeError : the magic bytes were neither a name nor bytes.
+        """
+
+        if magic is None:
+            name, header, trailer = None, None, None
+        elif isinstance(magic, str):
+            if magic not in magic_formats:
+                raise ValueError("Unknown file format: '{name}'"
+                                 .format(name=magic))
+
+            name = magic
+            header, trailer = magic_formats[magic]
+        elif isinstance(magic, bytes):
+            name, header, trailer = None, magic, None
+        elif (isinstance(magic, tuple) and len(magic) == 2 and
+              all(part is None or isinstance(part, bytes) for part in magic)):
+            name = None
+            header, trailer = magic
+        else:
+            raise TypeError("Magic must either be a format name, bytes, "
+                            "or a (header, trailer) pair of bytes")
+
+        if not isinstance(cache_size, int) or cache_size < 0:
+            raise ValueError("cache_size must be a non-negative integer")
+
+        self.min_size = min_size
+        self.max_size = max_size
+        self.format = name
+        self.header = header
+        self.trailer = trailer
+        self.cache_size = cache_size
+
+        # Keys (path, modification time, size) of files that passed.
+        self._passed = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __call__(self, file):
+        """
+        Check a file.
+
+        Parameters
+        ----------
+        file : str, bytes, os.PathLike, or file object
+            The path to the file, or a binary file object supporting `seek`.
+            The position of a file object is restored after the check.
+
+        Returns
+        -------
+        valid : bool
+            True, if the file matches the spec.
+
+        Raises
+        ------
+        TypeError : the value was neither a path nor a binary file object.
+        ValueError : the file did not exist, was not a regular file, had the
+                     wrong size, or did not have the expected magic bytes.
+        """
+
+        if isinstance(file, (str, bytes, os.PathLike)):
+            self._check_path(os.fspath(file))
+        elif isinstance(file, io.IOBase) or hasattr(file, "seek"):
+            self._check_file_object(file)
+        else:
+            act_type = type(file).__name__
+            msg = "Expected a path or file object but got: '{act_type}'"
+            raise TypeError(msg.format(act_type=act_type))
+
+        return True
+
+    def _check_path(self, path):
+        """
+        Check a file given by its path, using the cache if possible.
+        """
+
+        try:
+            info = os.stat(path)
+        except FileNotFoundError:
+            raise ValueError("File not found: {path!r}".format(path=path))
+
+        if not stat.S_ISREG(info.st_mode):
+            raise ValueError("Expected a regular file: {path!r}"
+                             .format(path=path))
+
+        key = (os.path.abspath(path), info.st_mtime_ns, info.st_size)
+
+        if self.cache_size:
+            with self._lock:
+                if key in self._passed:
+                    self._passed.move_to_end(key)
+                    return
+
+        self._check_size(info.st_size)
+
+        if self.header is not None or self.trailer is not None:
+            with open(path, "rb") as f:
+                self._check_magic(f, info.st_size)
+
+        if self.cache_size:
+            with self._lock:
+                self._passed[key] = True
+
+                while len(self._passed) > self.cache_size:
+                    self._passed.popitem(last=False)
+
+    def _check_file_object(self, f):
+        """
+        Check an open binary file object, restoring its position afterwards.
+        """
+
+        position = f.tell()
+
+        try:
+            try:
+                size = os.fstat(f.fileno()).st_size
+            except (AttributeError, OSError, io.UnsupportedOperation):
+                size = f.seek(0, os.SEEK_END)
+
+            self._check_size(size)
+
+            if self.header is not None or self.trailer is not None:
+                self._check_magic(f, size)
+        finally:
+            f.seek(position)
+
+    def _check_size(self, size):
+        """
+        Check the size of a file in bytes.
+        """
+
+        if self.min_size is not None and size < self.min_size:
+            msg = "Expected a file of at least {exp} bytes but got {act}"
+            raise ValueError(msg.format(exp=self.min_size, act=size))
+
+        if self.max_size is not None and size > self.max_size:
+            msg = "Expected a file of at most {exp} bytes but got {act}"
+            raise ValueError(msg.format(exp=self.max_size, act=size))
+
+    def _check_magic(self, f, size):
+        """
+        Check the magic bytes at the start and end of a binary file object,
+        reading only those bytes.
+        """
+
+        header = self.header
+        trailer = self.trailer
+
+        if header is not None:
+            f.seek(0)
+            self._compare_magic("header", header, f.read(len(header)))
+
+        if trailer is not None:
+            f.seek(max(size - len(trailer), 0))
+            self._compare_magic("trailer", trailer, f.read(len(trailer)))
+
+    def _compare_magic(self, part, expected, actual):
+        """
+        Compare the actual magic bytes of a file against the expected ones.
+        """
+
+        if not isinstance(actual, bytes):
+            raise TypeError("Expected a binary file object")
+
+        if actual != expected:
+            described = ("a {name} file".format(name=self.format)
+                         if self.format is not None else
+                         "a file with {part} {exp}".format(
+                             part=part, exp=bounded_repr(expected)))
+            msg = "Expected {described} but got {part} {act}"
+            raise ValueError(msg.format(described=described, part=part,
+                                        act=bounded_repr(actual)))
+
+    def clear_cache(self):
+        """
+        Clear the cache of files that passed.
+        """
+
+        with self._lock:
+            self._passed.clear()
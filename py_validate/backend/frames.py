@@ -0,0 +1,420 @@
+"""
+Validators for pandas DataFrame arguments.
+
+Checking a DataFrame row by row with a callable is slow. A DataFrameSchema
+instead checks the presence and dtypes of columns in O(columns), and the
+values of each column with vectorized operations.
+
+pandas is an optional dependency, so it is only imported when one of
+these validators is actually used.
+"""
+
+from .arrays import import_numpy
+from .shortcuts import NegateFailure, get_shortcut, mappings, parse_literal
+
+import re
+
+# The maximum number of failing row labels shown in failure messages.
+MAX_FAILING_ROWS = 5
+
+# Shortcut checks that are run on whole columns, with the same semantics
+# as their scalar counterparts in `shortcuts`. Other shortcuts and shortcut
+# expressions are run element by element.
+_range_pattern = re.compile(r"^range\(([^,()]+),([^,()]+)\)$")
+_member_pattern = re.compile(r"^in:\{(.*)\}$")
+
+
+def import_pandas():
+    """
+    Import pandas, raising an informative error if it is not installed.
+
+    Returns
+    -------
+    pd : module
+        The pandas module.
+
+    Raises
+    ------
+    ImportError : pandas is not installed.
+    """
+
+    try:
+        import pandas
+    except ImportError:
+        raise ImportError("pandas not found. Please install "
+                          "with `pip install pandas`")
+
+    return pandas
+
+
+class ColumnSpec(object):
+    """
+    Specification of a single column of a DataFrame.
+    """
+
+    def __init__(self, dtype=None, checks=None, nullable=False):
+        """
+        Initialize a ColumnSpec instance.
+
+        Parameters
+        ----------
+        dtype : data-type, default None
+            The dtype of the column e.g. "int64" or "category". If None,
+            any dtype is accepted.
+        checks : str or list of str, default None
+            Shortcuts or shortcut expressions that all values must pass
+            (see `get_shortcut`). The shortcuts "number", "integer", "even",
+            "odd", "range(lo, hi)", "in:{...}", and "re:pattern" are checked
+            on the whole column at once, and anything else element-wise.
+        nullable : bool, default False
+            Whether the column may contain null values (e.g. NaN or None).
+            Null values are not passed to the checks.
+
+        Raises
+        ------
+        ValueError : one of the checks was an invalid shortcut.
+        """
+
+        if dtype is not None:
+            dtype = import_pandas().api.types.pandas_dtype(dtype)
+
+        if checks is None:
+            checks = ()
+        elif isinstance(checks, str):
+            checks = (checks,)
+
+        self.dtype = dtype
+        self.checks = tuple(checks)
+        self.nullable = nullable
+
+        # Compiled at construction, so invalid shortcuts fail early.
+        self._checks = tuple((check, _compile_column_check(check))
+                             for check in self.checks)
+
+
+class DataFrameSchema(object):
+    """
+    Validator of the columns of a pandas DataFrame.
+
+    Columns are checked for presence and dtype in O(columns), regardless of
+    the number of rows. Values are checked with vectorized operations, and
+    can be checked on a random sample of the rows to cap the cost on
+    huge frames.
+    """
+
+    def __init__(self, columns, strict=False, sample=None, seed=None):
+        """
+        Initialize a DataFrameSchema instance.
+
+        Parameters
+        ----------
+        columns : dict
+            Maps column names to ColumnSpec instances. Any other value is
+            used as the `checks` of a ColumnSpec, and None only requires
+            that the column is present.
+        strict : bool, default False
+            Whether columns not in `columns` are rejected.
+        sample : int > 0 or None, default None
+            The maximum number of rows whose values are checked. Frames
+            with more rows have their values checked on a random sample of
+            this many rows. Column presence and dtypes are always checked.
+            If None, all rows are checked.
+        seed : int or None, default None
+            The seed for sampling rows. If set, the same rows are sampled
+            on every call. If None, different rows are sampled each time.
+
+        Raises
+        ------
+        ValueError : `sample` was invalid, or a column had invalid checks.
+        """
+
+        if sample is not None and (not isinstance(sample, int) or
+                                   sample < 1):
+            raise ValueError("sample must be a positive integer or None")
+
+        self.columns = {name: _as_column_spec(spec)
+                        for name, spec in columns.items()}
+        self.strict = strict
+        self.sample = sample
+        self.seed = seed
+
+        self._pd = import_pandas()
+
+    def __call__(self, df):
+        """
+        Check a DataFrame against this schema.
+
+        Returns
+        -------
+        valid : bool
+            True, if the DataFrame matches the schema.
+
+        Raises
+        ------
+        TypeError : the value was not a DataFrame, or a column had the wrong
+                    dtype for its spec or checks.
+        ValueError : columns were missing (or unexpected), or values failed
+                     their checks.
+        """
+
+        if not isinstance(df, self._pd.DataFrame):
+            act_type = type(df).__name__
+            msg = "Expected a pandas DataFrame but got: '{act_type}'"
+            raise TypeError(msg.format(act_type=act_type))
+
+        present = df.columns
+        missing = [name for name in self.columns if name not in present]
+
+        if missing:
+            raise ValueError("Missing columns: {names}".format(
+                names=", ".join(repr(name) for name in missing)))
+
+        if self.strict:
+            unexpected = [name for name in present
+                          if name not in self.columns]
+
+            if unexpected:
+                raise ValueError("Unexpected columns: {names}".format(
+                    names=", ".join(repr(name) for name in unexpected)))
+
+        dtypes = df.dtypes
+
+        for name, spec in self.columns.items():
+            dtype = dtypes[name]
+
+            if isinstance(dtype, self._pd.Series):
+                msg = "Expected a single column {name!r} but got {count}"
+                raise ValueError(msg.format(name=name, count=len(dtype)))
+
+            if spec.dtype is not None and dtype != spec.dtype:
+                msg = "Expected column {name!r} of dtype {exp} but got {act}"
+                raise TypeError(msg.format(name=name, exp=spec.dtype,
+                                           act=dtype))
+
+        positions = self._sample_positions(len(df))
+
+        for name, spec in self.columns.items():
+            if spec.nullable and not spec.checks:
+                continue
+
+            column = df[name]
+
+            if positions is not None:
+                column = column.iloc[positions]
+
+            self._check_column(name, spec, column)
+
+        return True
+
+    def _sample_positions(self, rows):
+        """
+        Get the (sorted) positions of the rows whose values are checked,
+        or None to check all rows.
+        """
+
+        sample = self.sample
+
+        if sample is None or rows <= sample:
+            return None
+
+        rng = import_numpy().random.default_rng(self.seed)
+        positions = rng.choice(rows, size=sample, replace=False)
+        positions.sort()
+
+        return positions
+
+    @staticmethod
+    def _check_column(name, spec, column):
+        """
+        Check the values of a column against its spec.
+        """
+
+        nulls = column.isna()
+
+        if nulls.any():
+            if not spec.nullable:
+                _raise_failing_rows(name, "not null", nulls)
+
+            column = column[~nulls]
+
+        for check, column_check in spec._checks:
+            failing = column_check(column)
+
+            if failing is not None and failing.any():
+                _raise_failing_rows(name, check, failing)
+
+
+def _as_column_spec(spec):
+    """
+    Convert the spec of a column in a DataFrameSchema into a ColumnSpec.
+    """
+
+    if isinstance(spec, ColumnSpec):
+        return spec
+
+    if spec is None:
+        return ColumnSpec(nullable=True)
+
+    return ColumnSpec(checks=spec)
+
+
+def _raise_failing_rows(name, check, failing):
+    """
+    Raise a ValueError listing (some of) the rows of a column that failed
+    a check, given as a boolean mask.
+    """
+
+    labels = failing.index[failing.to_numpy(dtype=bool)]
+    shown = ", ".join(repr(label) for label in labels[:MAX_FAILING_ROWS])
+
+    if len(labels) > MAX_FAILING_ROWS:
+        shown += ", ..."
+
+    msg = "Column {name!r} failed check '{check}' for {count} row(s): [{rows}]"
+    raise ValueError(msg.format(name=name, check=check, count=len(labels),
+                                rows=shown))
+
+
+def _compile_column_check(check):
+    """
+    Compile a shortcut into a check of a whole column.
+
+    The compiled check takes a Series (without nulls), and returns a boolean
+    mask of its failing values, or raises a TypeError if the column cannot
+    hold valid values at all (e.g. "even" on a column of floats).
+    """
+
+    if not isinstance(check, str):
+        raise TypeError("Column checks must be shortcuts")
+
+    expression = check.strip()
+
+    if expression in ("number", "integer", "even", "odd"):
+        return _vectorized(check, _type_checks[expression],
+                           mappings[expression])
+
+    match = _range_pattern.match(expression.replace(" ", ""))
+
+    if match is not None:
+        lo, hi = [parse_literal(bound) for bound in match.groups()]
+
+        if not isinstance(lo, str) and not isinstance(hi, str):
+            def out_of_range(column):
+                return (column < lo) | (column >= hi)
+
+            return _vectorized(check, ("number", out_of_range),
+                               get_shortcut(expression))
+
+    match = _member_pattern.match(expression)
+
+    if match is not None:
+        members = [parse_literal(member) for member
+                   in match.group(1).split(",") if member.strip()]
+
+        def not_member(column):
+            return ~column.isin(members)
+
+        return _vectorized(check, (None, not_member),
+                           get_shortcut(expression))
+
+    if expression.startswith("re:") and not expression[3:4] in ("'", '"'):
+        search = re.compile(expression[3:])
+
+        def no_match(column):
+            if column.dtype.kind == "O":  # possibly mixed with non-strings
+                found = column.map(lambda x: isinstance(x, str) and
+                                   search.search(x) is not None)
+            elif import_pandas().api.types.is_string_dtype(column.dtype):
+                found = column.str.contains(search, regex=True)
+            else:
+                _raise_dtype(check, column, "strings")
+
+            return ~found.astype(bool)
+
+        return no_match
+
+    return _elementwise(get_shortcut(expression))
+
+
+def _is_number(dtype):
+    """
+    Check whether a column dtype holds numbers (but not booleans).
+    """
+
+    api = import_pandas().api.types
+    return api.is_numeric_dtype(dtype) and not api.is_bool_dtype(dtype)
+
+
+def _is_integer(dtype):
+    """
+    Check whether a column dtype holds integers (but not booleans).
+    """
+
+    api = import_pandas().api.types
+    return api.is_integer_dtype(dtype) and not api.is_bool_dtype(dtype)
+
+
+# Maps vectorized shortcuts to the (kind of) dtype that their columns
+# must have, and a function returning the mask of failing values.
+_type_checks = {
+    "number": ("number", None),
+    "integer": ("integer", None),
+    "even": ("integer", lambda column: column % 2 != 0),
+    "odd": ("integer", lambda column: column % 2 != 1),
+}
+
+_dtype_kinds = {"number": _is_number, "integer": _is_integer}
+
+
+def _vectorized(check, type_check, scalar_check):
+    """
+    Build a column check from the dtype its column must have and the mask
+    of its failing values. Columns of dtype object (e.g. mixed Python
+    values) are instead checked element-wise with the scalar check.
+    """
+
+    kind, failing_mask = type_check
+    elementwise = _elementwise(scalar_check)
+
+    def check_column(column):
+        if column.dtype.kind == "O":
+            return elementwise(column)
+
+        if kind is not None and not _dtype_kinds[kind](column.dtype):
+            _raise_dtype(check, column,
+                         "numbers" if kind == "number" else "integers")
+
+        if failing_mask is None:
+            return None
+
+        return failing_mask(column)
+
+    return check_column
+
+
+def _elementwise(scalar_check):
+    """
+    Build a column check that runs a scalar shortcut on each value.
+    """
+
+    def check_column(column):
+        def fails(x):
+            try:
+                return scalar_check(x) is False
+            except (TypeError, ValueError, NegateFailure):
+                return True
+
+        return column.map(fails).astype(bool)
+
+    return check_column
+
+
+def _raise_dtype(check, column, expected):
+    """
+    Raise a TypeError for a column whose dtype cannot pass a check.
+    """
+
+    msg = ("Column {name!r} failed check '{check}': expected "
+           "{expected} but got dtype {dtype}")
+    raise TypeError(msg.format(name=column.name, check=check,
+                               expected=expected, dtype=column.dtype))
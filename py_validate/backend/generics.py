@@ -0,0 +1,519 @@
+"""
+Compiled structural checkers for `typing` generics used as validators.
+
+Each `typing` construct (e.g. `List[Dict[str, int]]` or `Optional[str]`) is
+compiled once into a tree of specialized checkers, which is then cached so
+that repeated uses of the same construct share a single compiled checker.
+"""
+
+import collections.abc
+import itertools
+import sys
+import types
+import typing
+
+from .helpers import bounded_repr, rename_function
+
+# The maximum number of compiled generic checkers that we keep around.
+GENERIC_CACHE_SIZE = 1024
+
+# Compiled checkers keyed by construct, for the limits currently set.
+_compiled = {}
+
+# Defaults for how deeply (in terms of nested containers) we inspect values
+# and how many elements of each container we sample. None means no limit.
+_limits = {"max_depth": None, "sample_size": 100}
+
+# Containers whose elements we can iterate over without consuming them.
+_element_containers = (list, set, frozenset, collections.deque,
+                       collections.abc.Sequence,
+                       collections.abc.MutableSequence,
+                       collections.abc.Set, collections.abc.MutableSet,
+                       collections.abc.Collection)
+_mapping_containers = (dict, collections.OrderedDict, collections.defaultdict,
+                       collections.abc.Mapping, collections.abc.MutableMapping)
+
+
+def set_generic_limits(max_depth=False, sample_size=False):
+    """
+    Configure how thoroughly values are checked against `typing` generics.
+
+    Parameters
+    ----------
+    max_depth : int or None, optional
+        The number of nested container levels whose elements are checked.
+        Containers beyond this depth are only checked for their own type.
+        If None, all levels described by the generic are checked.
+    sample_size : int or None, optional
+        The maximum number of elements checked in each container. Larger
+        containers are sampled at evenly spaced positions (or the first
+        `sample_size` elements if they do not support indexing), so that
+        checking a container does not become O(n) on every call. If 0, only
+        the types of containers are checked, not their elements. If None,
+        every element is checked.
+
+    Raises
+    ------
+    ValueError : a limit was neither None nor a non-negative integer.
+    """
+
+    for name, value in (("max_depth", max_depth),
+                        ("sample_size", sample_size)):
+        if value is False:  # not provided
+            continue
+
+        if value is not None and (not isinstance(value, int) or value < 0):
+            raise ValueError("{name} must be a non-negative "
+                             "integer or None".format(name=name))
+
+        _limits[name] = value
+
+    _compiled.clear()
+
+
+def is_generic(validator):
+    """
+    Check whether a validator is a `typing` construct that we can compile.
+
+    Parameters
+    ----------
+    validator : object
+        The validator to check.
+
+    Returns
+    -------
+    is_generic_validator : bool
+        Whether the validator should be checked structurally.
+    """
+
+    if validator is typing.Any:
+        return True
+
+    # Checked early, as this is the common case, and looking up a missing
+    # attribute (see below) allocates an AttributeError.
+    if isinstance(validator, type):
+        return typing.get_origin(validator) is not None
+
+    if isinstance(validator, typing.TypeVar):
+        return True
+
+    if typing.get_origin(validator) is not None:
+        return True
+
+    return hasattr(validator, "__supertype__")  # NewType
+
+
+class GenericMismatch(Exception):
+    """
+    Exception class for when a value does not match a `typing` generic.
+
+    The location records where in a nested value the mismatch occurred
+    (e.g. "[0]['key']"), relative to the value that was checked.
+    """
+
+    def __init__(self, expected, actual, location=""):
+        Exception.__init__(self, expected, actual, location)
+
+        self.expected = expected
+        self.actual = actual
+        self.location = location
+
+    def __str__(self):
+        msg = "expected {expected} but got {actual}{location}"
+        location = (" at {location}".format(location=self.location)
+                    if self.location else "")
+
+        return msg.format(expected=self.expected, actual=self.actual,
+                          location=location)
+
+
+def type_name(tp):
+    """
+    Get a compact display name for a type or `typing` construct.
+
+    Parameters
+    ----------
+    tp : object
+        The type or `typing` construct.
+
+    Returns
+    -------
+    name : str
+        The display name e.g. "int" or "List[Dict[str, int]]".
+    """
+
+    if isinstance(tp, type) and not typing.get_args(tp):
+        return tp.__name__
+
+    return repr(tp).replace("typing.", "")
+
+
+def compile_generic(tp):
+    """
+    Get the compiled checker for a `typing` construct.
+
+    The checker takes a single value and raises a `GenericMismatch` if the
+    value does not match. Checkers are cached by construct and by the limits
+    currently set with `set_generic_limits`.
+
+    Parameters
+    ----------
+    tp : object
+        The `typing` construct to compile.
+
+    Returns
+    -------
+    checker : callable
+        The compiled checker.
+
+    Raises
+    ------
+    TypeError : the construct is not supported.
+    """
+
+    try:
+        checker = _compiled.get(tp)
+    except TypeError:  # unhashable, so compile without caching
+        return _compile(tp, 0, _limits["max_depth"], _limits["sample_size"])
+
+    if checker is None:
+        checker = _compile(tp, 0, _limits["max_depth"], _limits["sample_size"])
+
+        if len(_compiled) >= GENERIC_CACHE_SIZE:
+            _compiled.clear()
+
+        _compiled[tp] = checker
+
+    return checker
+
+
+def _resolve_forward_ref(ref):
+    """
+    Resolve a forward reference (e.g. the "int" of `List["int"]`) in the
+    module that made it, if known, or else among the builtins.
+
+    Parameters
+    ----------
+    ref : str or typing.ForwardRef
+        The forward reference.
+
+    Returns
+    -------
+    resolved : object
+        The construct referred to, or the (ForwardRef) reference itself if
+        it could not be resolved.
+    """
+
+    if isinstance(ref, str):  # e.g. in list["int"]
+        ref = typing.ForwardRef(ref)
+
+    module = sys.modules.get(getattr(ref, "__forward_module__", None))
+    namespace = vars(module) if module is not None else {}
+
+    try:
+        return eval(ref.__forward_arg__, namespace)
+    except Exception:
+        return ref
+
+
+def _compile(tp, depth, max_depth, sample_size):
+    """
+    Recursively compile a type or `typing` construct into a checker.
+
+    Parameters
+    ----------
+    tp : object
+        The type or `typing` construct to compile.
+    depth : int
+        The number of container levels above this construct.
+    max_depth : int or None
+        The number of container levels whose elements we check.
+    sample_size : int or None
+        The maximum number of elements checked in each container.
+    """
+
+    if isinstance(tp, (str, typing.ForwardRef)):
+        # Forward references that cannot be resolved are not checked.
+        tp = _resolve_forward_ref(tp)
+
+        if isinstance(tp, typing.ForwardRef):
+            return _check_nothing
+
+    if tp is typing.Any or tp is object:
+        return _check_nothing
+
+    if tp is None or tp is type(None):
+        return _instance_checker(type(None), "None")
+
+    if isinstance(tp, typing.TypeVar):
+        if tp.__bound__ is not None:
+            return _compile(tp.__bound__, depth, max_depth, sample_size)
+
+        if tp.__constraints__:
+            return _compile(typing.Union[tp.__constraints__],
+                            depth, max_depth, sample_size)
+
+        return _check_nothing
+
+    supertype = getattr(tp, "__supertype__", None)
+
+    if supertype is not None:  # NewType
+        return _compile(supertype, depth, max_depth, sample_size)
+
+    origin = typing.get_origin(tp)
+    args = typing.get_args(tp)
+    name = type_name(tp)
+
+    if origin is None:
+        if isinstance(tp, type):
+            return _instance_checker(tp, name)
+
+        raise TypeError("Unsupported typing construct: {name}"
+                        .format(name=name))
+
+    if origin is typing.Union or origin is types.UnionType:
+        checkers = tuple(_compile(arg, depth, max_depth, sample_size)
+                         for arg in args)
+        return _union_checker(checkers, name)
+
+    if origin is typing.Literal:
+        return _literal_checker(args, name)
+
+    if origin is typing.ClassVar or origin is typing.Final:
+        return _compile(args[0], depth, max_depth, sample_size)
+
+    if origin is typing.Annotated:
+        return _compile(args[0], depth, max_depth, sample_size)
+
+    if not isinstance(origin, type):
+        raise TypeError("Unsupported typing construct: {name}"
+                        .format(name=name))
+
+    inspect_elements = bool(args) and (max_depth is None or depth < max_depth)
+
+    if not inspect_elements:
+        return _instance_checker(origin, name)
+
+    if origin is tuple:
+        if len(args) == 2 and args[1] is Ellipsis:
+            element = _compile(args[0], depth + 1, max_depth, sample_size)
+            return _elements_checker(origin, element, name, sample_size)
+
+        if args == ((),):  # Tuple[()]
+            args = ()
+
+        elements = tuple(_compile(arg, depth + 1, max_depth, sample_size)
+                         for arg in args)
+        return _fixed_tuple_checker(elements, name)
+
+    if origin is type:
+        return _subclass_checker(args[0], name)
+
+    if issubclass(origin, _mapping_containers):
+        if len(args) == 1 and issubclass(origin, collections.Counter):
+            args += (int,)  # Counter[str] counts with ints
+
+        if len(args) != 2:
+            return _instance_checker(origin, name)
+
+        key, value = (_compile(arg, depth + 1, max_depth, sample_size)
+                      for arg in args)
+
+        if key is _check_nothing and value is _check_nothing:
+            return _instance_checker(origin, name)
+
+        return _mapping_checker(origin, key, value, name, sample_size)
+
+    if issubclass(origin, _element_containers) and len(args) == 1:
+        element = _compile(args[0], depth + 1, max_depth, sample_size)
+
+        if element is _check_nothing:  # e.g. List[Any]
+            return _instance_checker(origin, name)
+
+        return _elements_checker(origin, element, name, sample_size)
+
+    # e.g. Iterator[int] or Callable[[int], str], whose elements
+    # cannot be inspected without consuming or calling the value.
+    return _instance_checker(origin, name)
+
+
+def _named(checker, name):
+    """
+    Give a compiled checker a descriptive name for profilers.
+    """
+
+    return rename_function(checker, "generic[{name}]".format(name=name))
+
+
+def _check_nothing(x):
+    """
+    Checker for constructs that every value matches (e.g. `typing.Any`).
+    """
+
+    pass
+
+
+def _instance_checker(klass, name):
+    """
+    Build a checker that a value is an instance of a class.
+    """
+
+    def check_instance(x):
+        if not isinstance(x, klass):
+            raise GenericMismatch(name, type(x).__name__)
+
+    return _named(check_instance, name)
+
+
+def _subclass_checker(klass, name):
+    """
+    Build a checker that a value is a subclass of a class (i.e. `Type[X]`).
+    """
+
+    def check_subclass(x):
+        if not (isinstance(x, type) and
+                (not isinstance(klass, type) or issubclass(x, klass))):
+            actual = x.__name__ if isinstance(x, type) else type(x).__name__
+            raise GenericMismatch(name, actual)
+
+    return _named(check_subclass, name)
+
+
+def _union_checker(checkers, name):
+    """
+    Build a checker that a value matches at least one alternative.
+    """
+
+    def check_union(x):
+        for checker in checkers:
+            try:
+                checker(x)
+                return
+            except GenericMismatch:
+                pass
+
+        raise GenericMismatch(name, type(x).__name__)
+
+    return _named(check_union, name)
+
+
+def _literal_checker(values, name):
+    """
+    Build a checker that a value is one of the literal values.
+
+    The type of the value must also match e.g. True does not match 1.
+    """
+
+    def check_literal(x):
+        for value in values:
+            if type(x) is type(value) and x == value:
+                return
+
+        raise GenericMismatch(name, bounded_repr(x))
+
+    return _named(check_literal, name)
+
+
+def _sample(x, sample_size, indexable):
+    """
+    Get (location, element) pairs for a sample of the elements of `x`.
+
+    Whether `x` supports indexing is determined once by the caller, which
+    avoids an (comparatively expensive) ABC instance check on every call.
+    """
+
+    if sample_size is None or len(x) <= sample_size:
+        return enumerate(x)
+
+    if sample_size == 0:
+        return ()
+
+    if indexable:
+        step = float(len(x)) / sample_size
+        indices = [int(i * step) for i in range(sample_size)]
+
+        return ((index, x[index]) for index in indices)
+
+    return enumerate(itertools.islice(x, sample_size))
+
+
+def _elements_checker(klass, element, name, sample_size):
+    """
+    Build a checker for a homogeneous container e.g. `List[int]`.
+    """
+
+    indexable = issubclass(klass, collections.abc.Sequence)
+
+    def check_elements(x):
+        if not isinstance(x, klass):
+            raise GenericMismatch(name, type(x).__name__)
+
+        for index, value in _sample(x, sample_size, indexable):
+            try:
+                element(value)
+            except GenericMismatch as e:
+                if indexable:
+                    location = "[{index}]".format(index=index)
+                else:
+                    location = "<element {value}>".format(
+                        value=bounded_repr(value))
+
+                e.location = location + e.location
+                raise
+
+    return _named(check_elements, name)
+
+
+def _fixed_tuple_checker(elements, name):
+    """
+    Build a checker for a fixed-length tuple e.g. `Tuple[int, str]`.
+    """
+
+    length = len(elements)
+
+    def check_fixed_tuple(x):
+        if not isinstance(x, tuple):
+            raise GenericMismatch(name, type(x).__name__)
+
+        if len(x) != length:
+            actual = "tuple of length {length}".format(length=len(x))
+            raise GenericMismatch(name, actual)
+
+        for index, (element, value) in enumerate(zip(elements, x)):
+            try:
+                element(value)
+            except GenericMismatch as e:
+                e.location = "[{index}]".format(index=index) + e.location
+                raise
+
+    return _named(check_fixed_tuple, name)
+
+
+def _mapping_checker(klass, key, value, name, sample_size):
+    """
+    Build a checker for a mapping e.g. `Dict[str, int]`.
+    """
+
+    def check_mapping(x):
+        if not isinstance(x, klass):
+            raise GenericMismatch(name, type(x).__name__)
+
+        items = x.items()
+
+        if sample_size is not None:
+            items = itertools.islice(items, sample_size)
+
+        for k, v in items:
+            try:
+                key(k)
+            except GenericMismatch as e:
+                e.location = "<key {k}>".format(k=bounded_repr(k)) + e.location
+                raise
+
+            try:
+                value(v)
+            except GenericMismatch as e:
+                e.location = "[{k}]".format(k=bounded_repr(k)) + e.location
+                raise
+
+    return _named(check_mapping, name)
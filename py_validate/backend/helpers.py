@@ -2,6 +2,22 @@
 Helper classes and objects that facilitate functionality in other modules.
 """
 
+import reprlib
+
+# The maximum length of a string (or bytes) value rendered in messages.
+MAX_VALUE_LENGTH = 80
+
+# Renders values in messages, truncating long ones (and large containers)
+# without rendering, or even iterating over, all of their contents.
+_value_repr = reprlib.Repr()
+_value_repr.maxlevel = 3
+_value_repr.maxstring = _value_repr.maxother = MAX_VALUE_LENGTH
+_value_repr.maxlong = MAX_VALUE_LENGTH // 2
+
+for _attr in ("maxtuple", "maxlist", "maxarray", "maxdict",
+              "maxset", "maxfrozenset", "maxdeque"):
+    setattr(_value_repr, _attr, 6)
+
 
 class DocSubstitution(object):
     """
@@ -144,3 +160,92 @@ class FrozenDict(dict):
 
         for k, v in keyword_mappings.items():
             self.__setitem__(k, v)
+
+
+def rename_function(f, name):
+    """
+    Rename a function, including the name recorded on its code object.
+
+    Profilers such as cProfile report the name of the code object being
+    executed, so compiled checkers are renamed in place to descriptive names
+    (e.g. "shortcut[len<=64]") to make time spent in them attributable.
+
+    This is an internal function, so we will not be verifying parameters
+    in any way in this function. We trust the developer will only pass in
+    functions created by this library (i.e. closures that we own).
+
+    Parameters
+    ----------
+    f : function
+        The function to rename.
+    name : str
+        The new name of the function.
+
+    Returns
+    -------
+    renamed_f : function
+        The same function `f` with the new name.
+    """
+
+    f.__name__ = f.__qualname__ = name
+    code = f.__code__
+
+    if hasattr(code, "co_qualname"):
+        f.__code__ = code.replace(co_name=name, co_qualname=name)
+    else:
+        f.__code__ = code.replace(co_name=name)
+
+    return f
+
+
+def bounded_repr(val):
+    """
+    Get a `repr` of a value that is truncated if it is long.
+
+    Only as much of the value as is displayed is rendered (e.g. the first
+    few elements of a large list), so that rendering a huge value remains
+    cheap.
+
+    Parameters
+    ----------
+    val : object
+        The value to render.
+
+    Returns
+    -------
+    rendered : str
+        The truncated `repr` of the value.
+    """
+
+    if isinstance(val, (bytes, bytearray)) and len(val) > MAX_VALUE_LENGTH:
+        return repr(val[:MAX_VALUE_LENGTH])[:MAX_VALUE_LENGTH] + "..."
+
+    return _value_repr.repr(val)
+
+
+def short_repr(val):
+    """
+    Render a value for an error message, truncating it if it is long.
+
+    Strings are rendered as themselves (i.e. as when formatted with `str`),
+    and other values with `bounded_repr`.
+
+    Parameters
+    ----------
+    val : object
+        The value to render.
+
+    Returns
+    -------
+    rendered : str
+        The rendered value.
+    """
+
+    if isinstance(val, str):
+        if len(val) <= MAX_VALUE_LENGTH:
+            return val
+
+        half = MAX_VALUE_LENGTH // 2
+        return val[:half] + "..." + val[-half:]
+
+    return bounded_repr(val)
@@ -0,0 +1,213 @@
+"""
+Flyweight interning of the validator maps and tuples of validated functions.
+
+The same validators (e.g. `int`, "integer", or "~even") are repeated across
+thousands of decorators. Rather than every ValidatedFunction holding its own
+copies, identical maps and tuples of validators are interned, so that every
+function with the same spec shares one immutable object.
+
+Only containers of static validators (None, shortcut strings, classes defined
+at module level, `typing` constructs of those, and array specs) are interned,
+as those live as long as the modules that declare them anyway. Containers
+holding other callables (e.g. lambdas) or classes (e.g. classes defined in a
+function, or created dynamically) are left alone, so that interning never
+keeps them alive.
+"""
+
+from .arrays import ArraySpec
+from .generics import is_generic
+from .helpers import FrozenDict
+
+import functools
+import sys
+import typing
+
+# Interned objects, keyed by their contents (see `_key`).
+_maps = {}
+_tuples = {}
+
+# The ids of all interned objects. Interned objects are never released,
+# so their ids cannot be reused by other objects.
+_interned_ids = set()
+
+
+def _is_static_class(klass):
+    """
+    Check whether a class is found by its qualified name in its module, and
+    so lives as long as the module does.
+    """
+
+    obj = sys.modules.get(getattr(klass, "__module__", None))
+
+    for part in getattr(klass, "__qualname__", "<locals>").split("."):
+        obj = getattr(obj, part, None)
+
+    return obj is klass
+
+
+def _is_static_generic(args):
+    """
+    Check whether the arguments of a `typing` construct (or of its nested
+    constructs) only refer to static classes.
+    """
+
+    for arg in args:
+        if isinstance(arg, (list, tuple)):  # e.g. Callable[[int], str]
+            if not _is_static_generic(arg):
+                return False
+        elif isinstance(arg, type) and typing.get_origin(arg) is None:
+            if not _is_static_class(arg):
+                return False
+        elif not _is_static_generic(typing.get_args(arg)):
+            return False
+
+    return True
+
+
+def _key(validator):
+    """
+    Get the key of a validator for interning, or None if it is not static.
+
+    The type of the validator is part of the key, so that validators that
+    only compare equal (e.g. 1 and True) are never conflated. Generics also
+    include their representation, as e.g. `Union[int, str]` compares equal
+    to `Union[str, int]`, which reports mismatches differently.
+    """
+
+    if validator is None or isinstance(validator, (str, ArraySpec)):
+        return type(validator), validator
+
+    if isinstance(validator, type) and typing.get_origin(validator) is None:
+        if not _is_static_class(validator):
+            return None
+
+        return type(validator), validator
+
+    if is_generic(validator):
+        try:
+            hash(validator)
+        except TypeError:
+            return None
+
+        if not _is_static_generic(typing.get_args(validator)):
+            return None
+
+        return type(validator), repr(validator), validator
+
+    return None
+
+
+def _intern(table, key, obj):
+    """
+    Get the interned object of a key, interning the given object if none.
+    """
+
+    interned = table.setdefault(key, obj)
+
+    if interned is obj:
+        _interned_ids.add(id(obj))
+
+    return interned
+
+
+def intern_map(validators):
+    """
+    Intern a map of argument names to validators.
+
+    Parameters
+    ----------
+    validators : FrozenDict
+        The map of argument names to validators. It must no longer be
+        modified once interned.
+
+    Returns
+    -------
+    interned : FrozenDict
+        An equal map that is shared by all identical maps, or the map
+        itself if any of its validators is not static.
+    """
+
+    key = []
+
+    for name, validator in validators.items():
+        validator_key = _key(validator)
+
+        if validator_key is None:
+            return validators
+
+        key.append((name, validator_key))
+
+    return _intern(_maps, tuple(key), validators)
+
+
+def intern_tuple(items):
+    """
+    Intern a tuple of validators or names.
+
+    Parameters
+    ----------
+    items : iterable
+        The validators or names.
+
+    Returns
+    -------
+    interned : tuple
+        An equal tuple that is shared by all identical tuples, or a new
+        tuple if any of the items is not static.
+    """
+
+    items = tuple(items)
+    key = []
+
+    for item in items:
+        item_key = _key(item)
+
+        if item_key is None:
+            return items
+
+        key.append(item_key)
+
+    return _intern(_tuples, tuple(key), items)
+
+
+@functools.lru_cache(maxsize=None)
+def output_names(count):
+    """
+    Get the names of the outputs of a function, e.g. "Output 0".
+
+    Parameters
+    ----------
+    count : int
+        The number of outputs.
+
+    Returns
+    -------
+    names : tuple
+        The names, shared by all functions with as many outputs.
+    """
+
+    return intern_tuple("Output {i}".format(i=index)
+                        for index in range(count))
+
+
+def is_interned(obj):
+    """
+    Check whether an object is interned, i.e. shared between functions.
+
+    Parameters
+    ----------
+    obj : object
+        The object to check.
+
+    Returns
+    -------
+    interned : bool
+        Whether the object is interned.
+    """
+
+    return id(obj) in _interned_ids
+
+
+# The validators of functions that have yet to get any.
+empty_map = intern_map(FrozenDict())
+empty_tuple = intern_tuple(())
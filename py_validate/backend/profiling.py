@@ -0,0 +1,247 @@
+"""
+Profiling of the time spent in the validators of each validated function.
+"""
+
+import bisect
+import itertools
+import threading
+import time
+
+# Upper bounds (in seconds) of the histogram buckets. Timings above the
+# last bound are counted in an additional overflow bucket.
+DEFAULT_BUCKETS = (1e-6, 1e-5, 1e-4, 1e-3, 1e-2, 1e-1, 1.0)
+
+
+class ValidatorProfiler(object):
+    """
+    Profiler that records per-validator timings into fixed-bucket histograms.
+
+    Only one in every `sample_every` calls of each validated function is
+    timed, which keeps the overhead of profiling low on hot functions.
+
+    Each validated function is profiled under its own name (see
+    `unique_name`), so that e.g. closures made by the same factory get
+    separate call counts and histograms.
+    """
+
+    def __init__(self, callback=None, sample_every=1, buckets=DEFAULT_BUCKETS):
+        """
+        Initialize a ValidatorProfiler instance.
+
+        Parameters
+        ----------
+        callback : callable, default None
+            A function that is also called with the function name, argument
+            name (e.g. "a" or "Output 0"), and elapsed time in seconds for
+            every timed validator.
+        sample_every : int > 0, default 1
+            Time one in every `sample_every` calls to each validated
+            function.
+        buckets : tuple, default DEFAULT_BUCKETS
+            The increasing upper bounds (in seconds) of the histogram buckets.
+
+        Raises
+        ------
+        ValueError : `sample_every` was not a positive integer.
+        """
+
+        if not isinstance(sample_every, int) or sample_every < 1:
+            raise ValueError("sample_every must be a positive integer")
+
+        self.callback = callback
+        self.sample_every = sample_every
+        self.buckets = tuple(buckets)
+
+        # Maps function names to counters of their calls, so that functions
+        # sharing this profiler are sampled independently of each other.
+        self._calls = {}
+        self._histograms = {}
+
+        # Maps qualified names to how many functions were profiled under
+        # that name (see `unique_name`).
+        self._names = {}
+        self._lock = threading.Lock()
+
+    def unique_name(self, func_name):
+        """
+        Get the name under which to profile a validated function, numbered
+        if another function was already profiled under the same qualified
+        name (e.g. "module.make.<locals>.f#2").
+
+        Each function should only get its name once, and keep it.
+
+        Parameters
+        ----------
+        func_name : str
+            The qualified name of the validated function.
+
+        Returns
+        -------
+        name : str
+            The name of the function in timings and dumps.
+        """
+
+        with self._lock:
+            count = self._names.get(func_name, 0) + 1
+            self._names[func_name] = count
+
+        if count == 1:
+            return func_name
+
+        return "{name}#{count}".format(name=func_name, count=count)
+
+    def sample(self, func_name=None):
+        """
+        Check whether the current call to a validated function should be timed.
+
+        Parameters
+        ----------
+        func_name : str, default None
+            The name of the validated function (see `unique_name`).
+
+        Returns
+        -------
+        should_time : bool
+            Whether to time the validators of the current call.
+        """
+
+        counter = self._calls.get(func_name)
+
+        if counter is None:
+            with self._lock:
+                counter = self._calls.setdefault(func_name,
+                                                 itertools.count(1))
+
+        # Advancing a counter is atomic, so concurrent calls are all counted.
+        return next(counter) % self.sample_every == 0
+
+    def record(self, func_name, var_name, elapsed):
+        """
+        Record the time spent in the validator of an argument or output.
+
+        Parameters
+        ----------
+        func_name : str
+            The name of the validated function (see `unique_name`).
+        var_name : str
+            The name of the argument (or output) that was validated.
+        elapsed : float
+            The time spent in the validator, in seconds.
+        """
+
+        index = bisect.bisect_left(self.buckets, elapsed)
+        key = (func_name, var_name)
+
+        with self._lock:
+            histogram = self._histograms.get(key)
+
+            if histogram is None:
+                histogram = self._histograms[key] = {
+                    "count": 0, "total": 0.0,
+                    "buckets": [0] * (len(self.buckets) + 1)}
+
+            histogram["count"] += 1
+            histogram["total"] += elapsed
+            histogram["buckets"][index] += 1
+
+        if self.callback is not None:
+            self.callback(func_name, var_name, elapsed)
+
+    def dump(self):
+        """
+        Dump the recorded histograms.
+
+        Returns
+        -------
+        histograms : dict
+            A JSON-serializable dictionary mapping function names to
+            dictionaries that map argument names to their histogram: the
+            number of timings ("count"), their sum in seconds ("total"), and
+            the count in each bucket ("buckets"), whose upper bounds are
+            listed under "bounds" (the last bucket has no upper bound).
+        """
+
+        result = {}
+
+        with self._lock:
+            for (func_name, var_name), histogram in self._histograms.items():
+                histogram = dict(histogram, buckets=list(histogram["buckets"]),
+                                 bounds=list(self.buckets))
+                result.setdefault(func_name, {})[var_name] = histogram
+
+        return result
+
+    def reset(self):
+        """
+        Clear all recorded histograms and call counts. Functions keep
+        their names.
+        """
+
+        with self._lock:
+            self._histograms.clear()
+            self._calls.clear()
+
+
+def as_profiler(profiler):
+    """
+    Convert a profiler argument into a ValidatorProfiler.
+
+    Parameters
+    ----------
+    profiler : ValidatorProfiler, callable, or None
+        The profiler to use. A callable is wrapped into a ValidatorProfiler
+        that times every call and passes each timing to the callable.
+
+    Returns
+    -------
+    validator_profiler : ValidatorProfiler or None
+        The profiler to use, or None to disable profiling.
+
+    Raises
+    ------
+    TypeError : the profiler was neither a ValidatorProfiler nor a callable.
+    """
+
+    if profiler is None or isinstance(profiler, ValidatorProfiler):
+        return profiler
+
+    if callable(profiler):
+        return ValidatorProfiler(callback=profiler)
+
+    raise TypeError("Profiler must either be a ValidatorProfiler, "
+                    "callable, or None")
+
+
+def timed(check_value, profiler, func_name):
+    """
+    Wrap a value check such that its duration is recorded by a profiler.
+
+    Parameters
+    ----------
+    check_value : callable
+        The check taking the argument name, value, and validator.
+    profiler : ValidatorProfiler
+        The profiler recording the timings.
+    func_name : str
+        The name of the validated function (see `unique_name`).
+
+    Returns
+    -------
+    timed_check_value : callable
+        The check, timed.
+    """
+
+    clock = time.perf_counter
+
+    def timed_check_value(arg, val, validator):
+        if validator is None:
+            return
+
+        start = clock()
+
+        try:
+            check_value(arg, val, validator)
+        finally:
+            profiler.record(func_name, arg, clock() - start)
+
+    return timed_check_value
@@ -0,0 +1,239 @@
+"""
+Process-wide registry of validated functions, for introspection.
+
+Every ValidatedFunction registers itself on creation. The registry only
+holds weak references, so it never keeps a function alive: functions that
+are garbage collected simply drop out of it.
+"""
+
+from .generics import is_generic
+from .helpers import short_repr
+from .interning import is_interned
+
+import sys
+import weakref
+
+# Weak references to every live ValidatedFunction.
+_registry = weakref.WeakSet()
+
+# Output plans of ValidatedFunction, by method name.
+_output_plans = {
+    "_validate_whole_output": "whole",
+    "_validate_any_outputs": "any",
+    "_validate_fixed_outputs": "fixed",
+}
+
+
+def register(validated):
+    """
+    Add a ValidatedFunction to the registry.
+
+    Parameters
+    ----------
+    validated : ValidatedFunction
+        The validated function to add.
+    """
+
+    _registry.add(validated)
+
+
+def registered_functions():
+    """
+    Get all live validated functions.
+
+    Returns
+    -------
+    functions : list
+        The ValidatedFunction instances that are still alive.
+    """
+
+    return list(_registry)
+
+
+def describe_validator(validator):
+    """
+    Describe how a validator is resolved when checking a value.
+
+    Parameters
+    ----------
+    validator : object
+        The validator of an argument or output.
+
+    Returns
+    -------
+    description : dict or None
+        A JSON-serializable dictionary holding the kind of validator
+        ("shortcut", "type", "generic", or "callable") and its spec,
+        or None if the value is not validated.
+    """
+
+    if validator is None:
+        return None
+
+    if isinstance(validator, str):
+        kind, spec = "shortcut", validator
+    elif is_generic(validator):
+        kind, spec = "generic", repr(validator)
+    elif isinstance(validator, type):
+        kind = "type"
+        spec = "{module}.{name}".format(module=validator.__module__,
+                                        name=validator.__qualname__)
+    else:
+        kind = "callable"
+        spec = (getattr(validator, "__qualname__", None) or
+                short_repr(validator))
+
+    return {"kind": kind, "spec": spec}
+
+
+def approximate_memory(validated):
+    """
+    Approximate the memory held by a ValidatedFunction, in bytes.
+
+    This counts the wrapper itself and the containers that it owns (e.g. its
+    maps of validators and names), but not the validators themselves, nor
+    containers interned with other functions, nor the wrapped function.
+
+    Parameters
+    ----------
+    validated : ValidatedFunction
+        The validated function.
+
+    Returns
+    -------
+    size : int
+        The approximate number of bytes.
+    """
+
+    state = validated.__dict__
+    owned = [validated, state]
+
+    for name in ("_input_validators", "_input_names", "_output_validators",
+                 "_output_names", "_deferred_updates", "_check_value",
+                 "_outermost"):
+        if name in state:
+            owned.append(state[name])
+
+    seen = set()
+    size = 0
+
+    for obj in owned:
+        if not is_interned(obj) and id(obj) not in seen:
+            seen.add(id(obj))
+            size += sys.getsizeof(obj)
+
+    return size
+
+
+def describe_function(validated, profiles=None):
+    """
+    Describe a ValidatedFunction: its validation plan, call statistics,
+    and approximate memory.
+
+    Parameters
+    ----------
+    validated : ValidatedFunction
+        The validated function.
+    profiles : dict, default None
+        Maps the ids of profilers to their dumps, to avoid dumping
+        the same profiler for every function.
+
+    Returns
+    -------
+    description : dict
+        A JSON-serializable description (see `dump_registry`).
+    """
+
+    state = validated.__dict__
+    output_plan = validated._output_plan
+
+    description = {
+        "name": validated._name(),
+        "async": validated._is_async,
+        "inputs": {name: describe_validator(validator) for name, validator
+                   in validated._input_validators.items()},
+        "output_len": validated._exp_output_len,
+        "outputs": [describe_validator(validator)
+                    for validator in validated._output_validators],
+        "output_plan": (None if output_plan is None else
+                        _output_plans.get(output_plan.__name__,
+                                          output_plan.__name__)),
+        "pending_updates": len(validated._deferred_updates),
+        "options": {
+            "profiler": validated._profiler is not None,
+            "reporter": validated._reporter is not None,
+            "time_budget": validated._budget is not None,
+            "identity_cache": validated._identity_cache is not None,
+            "outermost_only": "_outermost" in state,
+        },
+        "calls": _call_statistics(validated, profiles),
+        "memory": approximate_memory(validated),
+    }
+
+    return description
+
+
+def _call_statistics(validated, profiles):
+    """
+    Get the call statistics of a ValidatedFunction from its profiler,
+    or None if it is not profiled.
+    """
+
+    profiler = validated._profiler
+
+    if profiler is None:
+        return None
+
+    if profiles is None:
+        profiles = {}
+
+    profile = profiles.get(id(profiler))
+
+    if profile is None:
+        profile = profiles[id(profiler)] = profiler.dump()
+
+    name = validated._profile_name(profiler, register=False)
+    histograms = profile.get(name, {}) if name is not None else {}
+    timed_calls = max((histogram["count"] for histogram
+                       in histograms.values()), default=0)
+    total = sum(histogram["total"] for histogram in histograms.values())
+    sample_every = profiler.sample_every
+
+    return {
+        "timed_calls": timed_calls,
+        "timed_seconds": total,
+        "estimated_calls": timed_calls * sample_every,
+        "estimated_seconds": total * sample_every,
+        "seconds_per_call": total / timed_calls if timed_calls else None,
+    }
+
+
+def dump_registry():
+    """
+    Dump a description of every live validated function.
+
+    Returns
+    -------
+    descriptions : list
+        A JSON-serializable list of dictionaries, one per function, sorted
+        by the estimated time spent validating it (most expensive first,
+        then unprofiled functions by name). Each holds the function's
+        qualified "name", whether it is "async", how each of its "inputs"
+        and "outputs" is validated (see `describe_validator`), its expected
+        "output_len" and "output_plan", the number of "pending_updates"
+        (e.g. unresolved annotations), the validation "options" set, its
+        "calls" statistics (from its profiler, or None if it has none),
+        and its approximate "memory" in bytes.
+    """
+
+    profiles = {}
+    descriptions = [describe_function(validated, profiles)
+                    for validated in registered_functions()]
+
+    def cost(description):
+        calls = description["calls"]
+        seconds = 0.0 if calls is None else calls["estimated_seconds"]
+
+        return -seconds, description["name"]
+
+    return sorted(descriptions, key=cost)
@@ -0,0 +1,199 @@
+"""
+Rate-limited reporting of validation failures for warn-only validation.
+"""
+
+import threading
+import time
+
+
+def get_logger():
+    """
+    Get the "py_validate" logger.
+
+    `logging` is slow to import, so it is only imported once something is
+    logged.
+
+    Returns
+    -------
+    logger : logging.Logger
+        The logger.
+    """
+
+    import logging
+
+    return logging.getLogger("py_validate")
+
+
+def log_failure(func_name, var_name, error, suppressed):
+    """
+    Default failure handler, which logs a warning to the "py_validate" logger.
+
+    Parameters
+    ----------
+    func_name : str
+        The qualified name of the validated function.
+    var_name : str
+        The name of the argument (or output) that failed validation.
+    error : Exception
+        The validation error.
+    suppressed : int
+        The number of failures for this argument that were not reported
+        since the last report due to rate limiting.
+    """
+
+    # Arguments are formatted lazily by logging, and only if emitted.
+    get_logger().warning("Validation failed in %s: %s (%d similar "
+                         "failures suppressed)", func_name, error, suppressed)
+
+
+class FailureReporter(object):
+    """
+    Reporter that hands validation failures to a handler instead of raising.
+
+    Reports are rate-limited with a token bucket per function and argument,
+    so that a flood of invalid inputs cannot turn into a flood of reports.
+    """
+
+    def __init__(self, handler=None, rate=1.0, burst=10):
+        """
+        Initialize a FailureReporter instance.
+
+        Parameters
+        ----------
+        handler : callable, default None
+            The function called with the function name, argument name, the
+            validation error, and the number of failures suppressed since
+            the last report. Defaults to logging a warning.
+        rate : float > 0, default 1.0
+            The number of reports per second (for each function and
+            argument) that are sustained over time.
+        burst : int > 0, default 10
+            The number of reports (for each function and argument) that
+            can be made at once before rate limiting kicks in.
+
+        Raises
+        ------
+        ValueError : `rate` or `burst` was not positive.
+        """
+
+        if not rate > 0:
+            raise ValueError("rate must be positive")
+
+        if not isinstance(burst, int) or burst < 1:
+            raise ValueError("burst must be a positive integer")
+
+        self.handler = log_failure if handler is None else handler
+        self.rate = float(rate)
+        self.burst = burst
+
+        # Maps (function, argument) to [tokens, last refill, suppressed].
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def report(self, func_name, var_name, error):
+        """
+        Report a validation failure, subject to rate limiting.
+
+        Parameters
+        ----------
+        func_name : str
+            The qualified name of the validated function.
+        var_name : str
+            The name of the argument (or output) that failed validation.
+        error : Exception
+            The validation error.
+
+        Returns
+        -------
+        reported : bool
+            Whether the failure was handed to the handler.
+        """
+
+        now = time.monotonic()
+        key = (func_name, var_name)
+
+        with self._lock:
+            bucket = self._buckets.get(key)
+
+            if bucket is None:
+                bucket = self._buckets[key] = [float(self.burst), now, 0]
+
+            tokens = min(self.burst,
+                         bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+
+            if tokens < 1:
+                bucket[0] = tokens
+                bucket[2] += 1
+
+                return False
+
+            bucket[0] = tokens - 1
+            suppressed, bucket[2] = bucket[2], 0
+
+        self.handler(func_name, var_name, error, suppressed)
+        return True
+
+    def __reduce__(self):
+        """
+        Reduce this instance for pickling, e.g. along with a validated
+        function sent to a process pool. Only its parameters are pickled,
+        so rate limiting starts afresh.
+        """
+
+        return FailureReporter, (self.handler, self.rate, self.burst)
+
+    def wrap(self, check_value, func_name):
+        """
+        Wrap a value check such that its failures are reported, not raised.
+
+        Parameters
+        ----------
+        check_value : callable
+            The check taking the argument name, value, and validator.
+        func_name : str
+            The qualified name of the validated function.
+
+        Returns
+        -------
+        reporting_check_value : callable
+            The check, reporting failures instead of raising them.
+        """
+
+        def reporting_check_value(arg, val, validator):
+            try:
+                check_value(arg, val, validator)
+            except Exception as e:
+                self.report(func_name, arg, e)
+
+        return reporting_check_value
+
+
+def as_reporter(reporter):
+    """
+    Convert a reporter argument into a FailureReporter.
+
+    Parameters
+    ----------
+    reporter : FailureReporter, callable, or None
+        The reporter to use. A callable is wrapped into a FailureReporter
+        (with the default rate limits) that uses it as its handler.
+
+    Returns
+    -------
+    failure_reporter : FailureReporter or None
+        The reporter to use, or None to raise failures as usual.
+
+    Raises
+    ------
+    TypeError : the reporter was neither a FailureReporter nor a callable.
+    """
+
+    if reporter is None or isinstance(reporter, FailureReporter):
+        return reporter
+
+    if callable(reporter):
+        return FailureReporter(handler=reporter)
+
+    raise TypeError("Reporter must either be a FailureReporter, "
+                    "callable, or None")
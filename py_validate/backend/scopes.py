@@ -0,0 +1,36 @@
+"""
+Context-local scopes that change how validated functions behave when called.
+"""
+
+import contextlib
+import contextvars
+
+_trusted = contextvars.ContextVar("py_validate_trusted", default=False)
+
+# Bound once so that checking the scope on every
+# call costs a single context variable read.
+is_trusted = _trusted.get
+
+
+@contextlib.contextmanager
+def trusted():
+    """
+    Context manager inside which validated functions skip validation.
+
+    This is useful when a validated function calls other validated functions
+    (e.g. in a tight loop) with data that it has already checked. The scope
+    is local to the current thread or asyncio task, and it can be nested.
+
+    Examples
+    --------
+    >>> with trusted():
+    ...     for row in rows:
+    ...         validated_helper(row)  # no validation
+    """
+
+    token = _trusted.set(True)
+
+    try:
+        yield
+    finally:
+        _trusted.reset(token)
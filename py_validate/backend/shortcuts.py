@@ -1,6 +1,9 @@
-from .helpers import FrozenDict
+from .helpers import FrozenDict, rename_function
 
+import functools
 import numbers
+import operator
+import re
 
 
 def check_number(x):
@@ -17,11 +20,15 @@ def check_number(x):
     TypeError : the variable was not a number.
     """
 
-    act_type = type(x).__name__
-    msg = "Expected a number but got: '{act_type}'".format(act_type=act_type)
+    # Fast path for the most common types, which avoids
+    # the (comparatively expensive) ABC instance check.
+    if type(x) is int or type(x) is float:
+        return
 
     if not (isinstance(x, numbers.Number) and not isinstance(x, bool)):
-        raise TypeError(msg)
+        act_type = type(x).__name__
+        msg = "Expected a number but got: '{act_type}'"
+        raise TypeError(msg.format(act_type=act_type))
 
 
 def check_integer(x):
@@ -38,11 +45,15 @@ def check_integer(x):
     TypeError : the variable was not an integer.
     """
 
-    act_type = type(x).__name__
-    msg = "Expected an integer but got: '{act_type}'".format(act_type=act_type)
+    # Fast path for the most common type, which avoids
+    # the (comparatively expensive) ABC instance check.
+    if type(x) is int:
+        return
 
     if not (isinstance(x, numbers.Integral) and not isinstance(x, bool)):
-        raise TypeError(msg)
+        act_type = type(x).__name__
+        msg = "Expected an integer but got: '{act_type}'"
+        raise TypeError(msg.format(act_type=act_type))
 
 
 def check_even(x):
@@ -90,6 +101,10 @@ def check_odd(x):
 mappings = FrozenDict(odd=check_odd, even=check_even,
                       number=check_number, integer=check_integer)
 
+# The maximum number of compiled shortcut expressions that we keep around.
+# Identical expressions used across decorators share one compiled checker.
+EXPRESSION_CACHE_SIZE = 1024
+
 
 def get_shortcut(shortcut):
     """
@@ -98,7 +113,23 @@ def get_shortcut(shortcut):
     Parameters
     ----------
     shortcut : str
-        The shortcut name associated with a function.
+        The shortcut name associated with a function, or a shortcut
+        expression combining shortcuts and parametric checks:
+
+        1) range(lo, hi) - The input must be a number such
+                           that lo <= input < hi.
+        2) len<=N - The length of the input must satisfy the comparison.
+                    Any of <, <=, >, >=, ==, and != can be used.
+        3) re:pattern - The input must be a string that matches the regular
+                        expression. The pattern extends to the end of the
+                        expression unless it is quoted (e.g. re:"^[a-z]+$").
+        4) in:{a,b,c} - The input must be one of the listed literals. Integer
+                        and float literals are converted, and everything else
+                        is treated as a (optionally quoted) string.
+
+        Checks can be combined with "&" (and), "|" (or), and "~" (not), in
+        decreasing order of precedence "~", "&", and "|", and grouped with
+        parentheses, e.g. "integer & range(0, 100)" or "~even | number".
 
     Returns
     -------
@@ -107,18 +138,455 @@ def get_shortcut(shortcut):
 
     Raises
     ------
-    ValueError : an invalid shortcut name was provided.
+    ValueError : an invalid shortcut name or expression was provided.
     """
 
     shortcut_func = mappings.get(shortcut)
 
     if shortcut_func is None:
-        msg = "Unknown shortcut: '{shortcut}'"
-        raise ValueError(msg.format(shortcut=shortcut))
+        shortcut_func = _compile_expression(shortcut)
 
     return shortcut_func
 
 
+@functools.lru_cache(maxsize=EXPRESSION_CACHE_SIZE)
+def _compile_expression(expression):
+    """
+    Parse a shortcut expression into a single checker.
+
+    The result is cached so that any given expression is only parsed once.
+
+    Parameters
+    ----------
+    expression : str
+        The shortcut expression to compile.
+
+    Returns
+    -------
+    shortcut_func : callable
+        A function that raises if the validation check fails.
+
+    Raises
+    ------
+    ValueError : the shortcut expression was invalid.
+    """
+
+    return _ExpressionParser(expression).parse()
+
+
+def _named(checker, expression):
+    """
+    Give a compiled checker a descriptive name for profilers.
+    """
+
+    return rename_function(checker, "shortcut[{expression}]".format(
+        expression=expression))
+
+
+def _all_of(checkers, expression):
+    """
+    Combine checkers such that all of them must pass.
+    """
+
+    def check_all(x):
+        for checker in checkers:
+            checker(x)
+
+    return _named(check_all, expression)
+
+
+def _any_of(checkers, expression):
+    """
+    Combine checkers such that at least one of them must pass.
+    """
+
+    def check_any(x):
+        errors = []
+
+        for checker in checkers:
+            try:
+                checker(x)
+                return
+            except (TypeError, ValueError, NegateFailure) as e:
+                errors.append(str(e))
+
+        msg = "Expected '{expression}' to pass but got: {errors}"
+        raise ValueError(msg.format(expression=expression,
+                                    errors="; ".join(errors)))
+
+    return _named(check_any, expression)
+
+
+def _in_range(lo, hi):
+    """
+    Build a checker that the input is a number such that lo <= input < hi.
+    """
+
+    msg = "Expected a number in range({lo}, {hi})".format(lo=lo, hi=hi)
+
+    def check_range(x):
+        check_number(x)
+
+        if not lo <= x < hi:
+            raise ValueError(msg)
+
+    return _named(check_range, "range({lo}, {hi})".format(lo=lo, hi=hi))
+
+
+_comparisons = {
+    "<": operator.lt, "<=": operator.le,
+    ">": operator.gt, ">=": operator.ge,
+    "==": operator.eq, "!=": operator.ne,
+}
+
+
+def _length_compare(symbol, bound):
+    """
+    Build a checker that the input length compares to a bound.
+    """
+
+    compare = _comparisons[symbol]
+
+    def check_length(x):
+        try:
+            length = len(x)
+        except TypeError:
+            act_type = type(x).__name__
+            raise TypeError("Expected an object with a length "
+                            "but got: '{act_type}'".format(act_type=act_type))
+
+        if not compare(length, bound):
+            msg = "Expected length {symbol} {bound} but got {length}"
+            raise ValueError(msg.format(symbol=symbol, bound=bound,
+                                        length=length))
+
+    name = "len{symbol}{bound}".format(symbol=symbol, bound=bound)
+    return _named(check_length, name)
+
+
+def _matches(pattern):
+    """
+    Build a checker that the input is a string matching a regex pattern.
+    """
+
+    search = re.compile(pattern).search
+    msg = "Expected a string matching '{pattern}'".format(pattern=pattern)
+
+    def check_match(x):
+        if not isinstance(x, str):
+            act_type = type(x).__name__
+            raise TypeError("Expected a string but "
+                            "got: '{act_type}'".format(act_type=act_type))
+
+        if search(x) is None:
+            raise ValueError(msg)
+
+    return _named(check_match, "re:{pattern}".format(pattern=pattern))
+
+
+def _one_of(members):
+    """
+    Build a checker that the input is one of a set of members.
+    """
+
+    members = frozenset(members)
+    listing = "{" + ", ".join(sorted(repr(m) for m in members)) + "}"
+    msg = "Expected one of {members}".format(members=listing)
+
+    def check_member(x):
+        try:
+            found = x in members
+        except TypeError:  # unhashable, so cannot be a member
+            found = False
+
+        if not found:
+            raise ValueError(msg)
+
+    return _named(check_member, "in:{members}".format(members=listing))
+
+
+def parse_literal(literal):
+    """
+    Parse a literal in a shortcut expression into an int, float, or str.
+
+    Parameters
+    ----------
+    literal : str
+        The literal, e.g. "1", "2.5", "'a'", or "a". Quoted literals are
+        always strings.
+
+    Returns
+    -------
+    value : int, float, or str
+        The parsed value.
+    """
+
+    literal = literal.strip()
+
+    if len(literal) >= 2 and literal[0] == literal[-1] and literal[0] in "'\"":
+        return literal[1:-1]
+
+    for converter in (int, float):
+        try:
+            return converter(literal)
+        except ValueError:
+            pass
+
+    return literal
+
+
+class _ExpressionParser(object):
+    """
+    Recursive-descent parser for shortcut expressions.
+
+    This is an internal class, so we will not be verifying parameters
+    in any way in this function. We trust the developer will not pass
+    in incorrect inputs to this class.
+    """
+
+    def __init__(self, expression):
+        """
+        Initialize an _ExpressionParser instance.
+
+        Parameters
+        ----------
+        expression : str
+            The shortcut expression to parse.
+        """
+
+        self.expression = expression
+        self.pos = 0
+
+    def parse(self):
+        """
+        Parse the entire expression into a single checker.
+        """
+
+        checker = self._parse_or()
+
+        if self._peek() is not None:
+            self._fail("unexpected '{char}'".format(char=self._peek()))
+
+        return checker
+
+    def _fail(self, reason):
+        """
+        Raise a ValueError describing why the expression is invalid.
+        """
+
+        msg = "Invalid shortcut expression '{expression}': {reason}"
+        raise ValueError(msg.format(expression=self.expression,
+                                    reason=reason))
+
+    def _peek(self):
+        """
+        Skip whitespace and return the next character (None at the end).
+        """
+
+        while (self.pos < len(self.expression) and
+               self.expression[self.pos].isspace()):
+            self.pos += 1
+
+        if self.pos < len(self.expression):
+            return self.expression[self.pos]
+
+        return None
+
+    def _expect(self, char):
+        """
+        Consume the next character, which must be `char`.
+        """
+
+        if self._peek() != char:
+            self._fail("expected '{char}'".format(char=char))
+
+        self.pos += 1
+
+    def _read_until(self, chars):
+        """
+        Consume and return characters until one in `chars` is reached.
+        """
+
+        start = self.pos
+
+        while (self.pos < len(self.expression) and
+               self.expression[self.pos] not in chars):
+            self.pos += 1
+
+        return self.expression[start:self.pos]
+
+    def _parse_or(self):
+        """
+        Parse alternatives separated by "|".
+        """
+
+        start = self.pos
+        checkers = [self._parse_and()]
+
+        while self._peek() == "|":
+            self.pos += 1
+            checkers.append(self._parse_and())
+
+        if len(checkers) == 1:
+            return checkers[0]
+
+        source = self.expression[start:self.pos].strip()
+        return _any_of(tuple(checkers), source)
+
+    def _parse_and(self):
+        """
+        Parse conjunctions separated by "&".
+        """
+
+        self._peek()
+        start = self.pos
+        checkers = [self._parse_not()]
+
+        while self._peek() == "&":
+            self.pos += 1
+            checkers.append(self._parse_not())
+
+        if len(checkers) == 1:
+            return checkers[0]
+
+        source = self.expression[start:self.pos].strip()
+        return _all_of(tuple(checkers), source)
+
+    def _parse_not(self):
+        """
+        Parse a (possibly negated or parenthesized) operand.
+        """
+
+        if self._peek() == "~":
+            self.pos += 1
+            self._peek()
+
+            start = self.pos
+            self._parse_not()
+
+            return negate_shortcut(self.expression[start:self.pos].strip())
+
+        if self._peek() == "(":
+            self.pos += 1
+            checker = self._parse_or()
+            self._expect(")")
+
+            return checker
+
+        return self._parse_atom()
+
+    def _parse_atom(self):
+        """
+        Parse a shortcut name or parametric check.
+        """
+
+        self._peek()
+        name = self._read_until(" \t()&|~<>=!:")
+
+        if not name:
+            self._fail("expected a shortcut at position "
+                       "{pos}".format(pos=self.pos))
+
+        if name == "range":
+            self._expect("(")
+            bounds = self._read_until(")").split(",")
+            self._expect(")")
+
+            if len(bounds) != 2:
+                self._fail("range() expects two bounds")
+
+            lo, hi = [parse_literal(bound) for bound in bounds]
+
+            if isinstance(lo, str) or isinstance(hi, str):
+                self._fail("range() bounds must be numbers")
+
+            return _in_range(lo, hi)
+
+        if name == "len":
+            self._peek()
+            start = self.pos
+
+            while (self.pos < len(self.expression) and
+                   self.expression[self.pos] in "<>=!"):
+                self.pos += 1
+
+            symbol = self.expression[start:self.pos]
+
+            if symbol not in _comparisons:
+                self._fail("invalid length comparison "
+                           "'{symbol}'".format(symbol=symbol))
+
+            self._peek()
+            bound = self._read_until(" )&|")
+
+            try:
+                bound = int(bound)
+            except ValueError:
+                self._fail("length bound must be an integer")
+
+            return _length_compare(symbol, bound)
+
+        if name == "re" and self._peek() == ":":
+            self.pos += 1
+            quote = self._peek()
+
+            if quote in ("'", '"'):
+                self.pos += 1
+                pattern = self._read_until(quote)
+                self._expect(quote)
+            else:
+                pattern = self.expression[self.pos:]
+                self.pos = len(self.expression)
+
+            try:
+                return _matches(pattern)
+            except re.error as e:
+                self._fail("invalid regex: {e}".format(e=e))
+
+        if name == "in" and self._peek() == ":":
+            self.pos += 1
+            self._expect("{")
+            members = self._read_until("}")
+            self._expect("}")
+
+            return _one_of(parse_literal(member) for member
+                           in members.split(",") if member.strip())
+
+        shortcut_func = mappings.get(name)
+
+        if shortcut_func is None:
+            msg = "Unknown shortcut: '{shortcut}'"
+            raise ValueError(msg.format(shortcut=name))
+
+        return shortcut_func
+
+
+@functools.lru_cache(maxsize=EXPRESSION_CACHE_SIZE)
+def negate_shortcut(shortcut):
+    """
+    Get the negation of a shortcut.
+
+    The result is cached so that e.g. "~even" in different expressions
+    shares one NegateShortcut.
+
+    Parameters
+    ----------
+    shortcut : str
+        The shortcut name or expression to negate.
+
+    Returns
+    -------
+    negate_check : NegateShortcut
+        The negated shortcut.
+
+    Raises
+    ------
+    ValueError : an invalid shortcut name or expression was provided.
+    """
+
+    return NegateShortcut(shortcut)
+
+
 class NegateFailure(Exception):
     """
     Exception class for when a validation function passes when it shouldn't.
@@ -163,8 +631,9 @@ class NegateShortcut(object):
 
         try:
             self.func(x)
-            raise NegateFailure(self.msg.format(shortcut=self.shortcut))
-        except NegateFailure:
-            raise
-        except (TypeError, ValueError):
-            pass
+        except (TypeError, ValueError, NegateFailure):
+            # A failure of an inner negation (e.g. in "~~even") is a failed
+            # check like any other.
+            return
+
+        raise NegateFailure(self.msg.format(shortcut=self.shortcut))
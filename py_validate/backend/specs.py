@@ -0,0 +1,470 @@
+"""
+Declarative validation specs for functions whose source we do not control.
+
+Specs map "module:qualname" targets (e.g. "pkg.mod:func" or
+"pkg.mod:Class.method") to their validators, and are loaded from a JSON or
+TOML file (or given as a dictionary). Loading a spec only groups its targets
+by module: each target is parsed and patched the first time its module is
+imported, via an import hook, so that a large spec costs next to nothing at
+startup and specs for modules that are never imported cost nothing at all.
+"""
+
+from .arrays import ARRAY_SPEC_PREFIX
+from .base import ValidatedFunction
+from .shortcuts import get_shortcut
+
+import json
+import os
+import sys
+import threading
+import warnings
+
+# The keys allowed in the spec of a target.
+_spec_keys = frozenset(("inputs", "outputs"))
+
+
+def import_toml():
+    """
+    Import a TOML parser, raising an informative error if none is available.
+
+    Returns
+    -------
+    toml : module
+        Either `tomllib` (Python 3.11+) or `tomli`.
+
+    Raises
+    ------
+    ImportError : no TOML parser is available.
+    """
+
+    try:
+        import tomllib as toml
+    except ImportError:
+        try:
+            import tomli as toml
+        except ImportError:
+            raise ImportError("tomli not found. Please install "
+                              "with `pip install tomli`")
+
+    return toml
+
+
+def read_specs(path):
+    """
+    Read validation specs from a JSON or TOML file.
+
+    Parameters
+    ----------
+    path : str or os.PathLike
+        The path to the file. Files ending in ".toml" are parsed as TOML,
+        and all others as JSON.
+
+    Returns
+    -------
+    specs : dict
+        The specs, mapping targets to their validators.
+    """
+
+    path = os.fspath(path)
+
+    if path.endswith(".toml"):
+        with open(path, "rb") as f:
+            return import_toml().load(f)
+
+    with open(path, "rb") as f:
+        return json.load(f)
+
+
+class SpecHook(object):
+    """
+    Import hook that patches the targets of validation specs once their
+    modules are imported.
+    """
+
+    def __init__(self, specs):
+        """
+        Initialize a SpecHook instance.
+
+        Parameters
+        ----------
+        specs : dict
+            Maps each target, as "module:qualname", to its spec. A spec is a
+            dictionary with optional "inputs" (mapping argument names to
+            validators) and "outputs" (the expected output length followed
+            by the output validators, as passed to `validate_outputs`)
+            entries. Validators are shortcut expressions (e.g. "integer" or
+            "~even"), array specs (e.g. "ndarray[float64, (n,)]"), or None.
+
+        Raises
+        ------
+        TypeError : the specs were not a dictionary.
+        ValueError : a target was not of the form "module:qualname".
+        """
+
+        if not isinstance(specs, dict):
+            raise TypeError("Validation specs must be a dictionary")
+
+        # Targets yet to be patched, by module name. Targets are only
+        # grouped here; each spec is parsed once its module is imported.
+        pending = {}
+
+        for target, spec in specs.items():
+            module, sep, qualname = target.partition(":")
+
+            if not (sep and module and qualname):
+                msg = "Invalid target '{target}': expected 'module:qualname'"
+                raise ValueError(msg.format(target=target))
+
+            pending.setdefault(module, {})[qualname] = spec
+
+        self._pending = pending
+        self._lock = threading.RLock()
+        self.patched = []
+        self.failed = {}
+
+    @property
+    def pending(self):
+        """
+        The targets that have yet to be patched, as "module:qualname".
+        """
+
+        with self._lock:
+            return sorted("{module}:{qualname}".format(module=module,
+                                                       qualname=qualname)
+                          for module, targets in self._pending.items()
+                          for qualname in targets)
+
+    def install(self):
+        """
+        Patch the targets in modules that are already imported, and install
+        the hook to patch the others once their modules are imported.
+
+        Raises
+        ------
+        ValueError : a target in an already imported module was not found or
+                     had an invalid spec. The other targets are still patched.
+        """
+
+        with self._lock:
+            errors = []
+
+            for module in list(self._pending):
+                if module in sys.modules:
+                    errors.extend(self.patch_module(sys.modules[module],
+                                                    warn=False))
+
+            if self._pending and self not in sys.meta_path:
+                sys.meta_path.insert(0, self)
+
+        if errors:
+            raise errors[0]
+
+    def uninstall(self):
+        """
+        Uninstall the hook. Targets that were patched stay patched.
+        """
+
+        with self._lock:
+            if self in sys.meta_path:
+                sys.meta_path.remove(self)
+
+    def find_spec(self, fullname, path, target=None):
+        """
+        Find the spec of a module with targets to patch, wrapping its loader
+        so that the targets are patched once the module is executed.
+
+        This is called for every import, so it only costs a dictionary lookup
+        for modules without targets.
+        """
+
+        if fullname not in self._pending:
+            return None
+
+        for finder in sys.meta_path:
+            find_spec = getattr(finder, "find_spec", None)
+
+            if finder is self or find_spec is None:
+                continue
+
+            module_spec = find_spec(fullname, path, target)
+
+            if module_spec is not None:
+                break
+        else:
+            return None
+
+        loader = module_spec.loader
+
+        if loader is not None and hasattr(loader, "exec_module"):
+            module_spec.loader = _PatchingLoader(loader, self)
+
+        return module_spec
+
+    def patch_module(self, module, warn=True):
+        """
+        Patch the pending targets of a module.
+
+        A target that cannot be patched does not stop the others from being
+        patched, nor the module from being imported: its error is recorded
+        in `failed` instead.
+
+        Parameters
+        ----------
+        module : module
+            The imported module.
+        warn : bool, default True
+            Whether to issue a warning for each target that failed.
+
+        Returns
+        -------
+        errors : list
+            The errors of the targets that failed, if any.
+        """
+
+        with self._lock:
+            targets = self._pending.pop(module.__name__, None)
+
+            if not self._pending:
+                self.uninstall()
+
+        errors = []
+
+        if not targets:
+            return errors
+
+        for qualname, spec in targets.items():
+            name = "{module}:{qualname}".format(module=module.__name__,
+                                                qualname=qualname)
+
+            try:
+                patch_target(module, qualname, spec, name)
+            except ValueError as e:
+                self.failed[name] = e
+                errors.append(e)
+
+                if warn:
+                    warnings.warn(str(e), RuntimeWarning, stacklevel=2)
+            else:
+                self.patched.append(name)
+
+        return errors
+
+
+class _PatchingLoader(object):
+    """
+    Loader that patches the targets of a module after executing it, and
+    otherwise defers to the module's own loader.
+    """
+
+    def __init__(self, loader, hook):
+        self._loader = loader
+        self._hook = hook
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+    def create_module(self, module_spec):
+        return self._loader.create_module(module_spec)
+
+    def exec_module(self, module):
+        # The module only sees its own loader.
+        module.__loader__ = module.__spec__.loader = self._loader
+
+        self._loader.exec_module(module)
+        self._hook.patch_module(module)
+
+
+def parse_spec(spec, name):
+    """
+    Parse the spec of a target into its validators.
+
+    Shortcut expressions are compiled here, once, and shared with every
+    other use of the same expression.
+
+    Parameters
+    ----------
+    spec : dict
+        The spec of the target (see `SpecHook`).
+    name : str
+        The target, as "module:qualname", for error messages.
+
+    Returns
+    -------
+    parsed : tuple
+        The input validators (a dictionary), the expected output length,
+        and the output validators (a tuple).
+
+    Raises
+    ------
+    ValueError : the spec was invalid.
+    """
+
+    msg = "Invalid validation spec for '{name}': {reason}"
+
+    if not isinstance(spec, dict):
+        raise ValueError(msg.format(name=name, reason="expected a "
+                                    "dictionary with 'inputs' and/or "
+                                    "'outputs'"))
+
+    unknown = set(spec) - _spec_keys
+
+    if unknown:
+        raise ValueError(msg.format(name=name, reason="unexpected key(s) "
+                                    "{keys}".format(keys=sorted(unknown))))
+
+    inputs = spec.get("inputs", {})
+    outputs = spec.get("outputs", [])
+
+    if not isinstance(inputs, dict):
+        raise ValueError(msg.format(name=name, reason="'inputs' must map "
+                                    "argument names to validators"))
+
+    if not isinstance(outputs, list):
+        raise ValueError(msg.format(name=name, reason="'outputs' must list "
+                                    "the output length and validators"))
+
+    exp_output_len = outputs[0] if outputs else None
+    output_validators = tuple(outputs[1:])
+
+    for validator in list(inputs.values()) + list(output_validators):
+        if validator is None:
+            continue
+
+        if not isinstance(validator, str):
+            raise ValueError(msg.format(name=name, reason="validators must "
+                                        "be strings, but got {validator!r}"
+                                        .format(validator=validator)))
+
+        if not validator.startswith(ARRAY_SPEC_PREFIX):
+            try:
+                get_shortcut(validator)
+            except ValueError as e:
+                raise ValueError(msg.format(name=name, reason=e))
+
+    return inputs, exp_output_len, output_validators
+
+
+def patch_target(module, qualname, spec, name=None):
+    """
+    Replace a function in a module with a validated version of it.
+
+    Parameters
+    ----------
+    module : module
+        The module containing the target.
+    qualname : str
+        The qualified name of the target in the module, e.g. "func" or
+        "Class.method". Static and class methods are patched within their
+        `staticmethod` or `classmethod` wrappers.
+    spec : dict
+        The spec of the target (see `SpecHook`).
+    name : str, default None
+        The target, as "module:qualname", for error messages.
+
+    Returns
+    -------
+    validated : ValidatedFunction
+        The validated target.
+
+    Raises
+    ------
+    ValueError : the target was not found, its spec was invalid, or it
+                 could not be replaced in its owner.
+    """
+
+    if name is None:
+        name = "{module}:{qualname}".format(module=module.__name__,
+                                            qualname=qualname)
+
+    input_validators, exp_output_len, output_validators = parse_spec(spec,
+                                                                     name)
+    *path, attr = qualname.split(".")
+    owner = module
+
+    try:
+        for part in path:
+            owner = getattr(owner, part)
+
+        # Look up the raw attribute, so that e.g. static methods are kept.
+        if isinstance(owner, type):
+            raw = next(klass.__dict__[attr] for klass in owner.__mro__
+                       if attr in klass.__dict__)
+        else:
+            raw = getattr(owner, attr)
+    except (AttributeError, StopIteration):
+        raise ValueError("Target not found: '{name}'".format(name=name))
+
+    wrapper = type(raw) if isinstance(raw, (staticmethod,
+                                            classmethod)) else None
+    f = raw.__func__ if wrapper is not None else raw
+
+    if not isinstance(f, ValidatedFunction):
+        try:
+            validated = ValidatedFunction(f)
+        except ValueError as e:
+            msg = "Invalid validation spec for '{name}': {reason}"
+            raise ValueError(msg.format(name=name, reason=e))
+    elif isinstance(owner, type) and attr not in owner.__dict__:
+        # Updating it would change the validators of the base class too.
+        raise ValueError("Target '{name}' is validated in a base class, so "
+                         "its spec must target that class".format(name=name))
+    else:
+        validated = f
+
+    try:
+        validated.update_input_validators(**input_validators)
+        validated.update_exp_output_len(exp_output_len)
+        validated.update_output_validators(*output_validators)
+    except (TypeError, ValueError) as e:
+        msg = "Invalid validation spec for '{name}': {reason}"
+        raise ValueError(msg.format(name=name, reason=e))
+
+    try:
+        setattr(owner, attr,
+                validated if wrapper is None else wrapper(validated))
+    except (AttributeError, TypeError) as e:
+        msg = "Cannot patch target '{name}': {reason}"
+        raise ValueError(msg.format(name=name, reason=e))
+
+    return validated
+
+
+def load_specs(specs):
+    """
+    Load validation specs, patching their targets now if their modules are
+    already imported, or else once they are imported.
+
+    Parameters
+    ----------
+    specs : str, os.PathLike, or dict
+        Either the path to a JSON or TOML file of specs (files ending in
+        ".toml" are parsed as TOML), or the specs themselves. Specs map
+        each target, as "module:qualname", to a dictionary with optional
+        "inputs" (mapping argument names to validators) and "outputs"
+        (the expected output length followed by the output validators)
+        entries, e.g. {"pkg.mod:func": {"inputs": {"a": "integer"},
+        "outputs": [1, "number"]}}. Validators are shortcut expressions,
+        array specs (e.g. "ndarray[float64, (n,)]"), or None.
+
+    Returns
+    -------
+    hook : SpecHook
+        The installed import hook. Its `pending` targets have yet to be
+        imported, its `patched` targets are validated, and its `failed`
+        targets map to the errors that kept them from being patched. It
+        uninstalls itself once all targets are imported.
+
+    Raises
+    ------
+    TypeError : the specs were neither a path nor a dictionary.
+    ValueError : a target was invalid, or an already imported target was
+                 not found or had an invalid spec.
+    """
+
+    if isinstance(specs, (str, os.PathLike)):
+        specs = read_specs(specs)
+
+    hook = SpecHook(specs)
+    hook.install()
+
+    return hook
@@ -4,7 +4,11 @@ Top-level directory for all of py_validate's tests.
 This is also the place where any test helpers can be stored.
 """
 
+from py_validate.api import validate_inputs, validate_outputs
+
 import pytest
+import threading
+import time
 
 
 def assert_raises(exc, msg, f, *args, **kwargs):
@@ -33,3 +37,62 @@ def assert_raises(exc, msg, f, *args, **kwargs):
 
     if msg is not None:
         exc_info.match(msg)
+
+
+class CountingCheck(object):
+    """
+    Validator that counts how often it is called.
+
+    Parameters
+    ----------
+    check: callable or None, default None
+        The check to delegate to. If None, every value passes.
+
+    delay: float, default 0
+        How long (in seconds) to sleep on each call.
+    """
+
+    def __init__(self, check=None, delay=0):
+        self.check = check
+        self.delay = delay
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, x):
+        with self.lock:
+            self.calls += 1
+
+        if self.delay:
+            time.sleep(self.delay)
+
+        return True if self.check is None else self.check(x)
+
+
+def make_wrapper(*outputs, **inputs):
+    """
+    Make a new validated function `wrapper(a, b=None)`.
+
+    Each call makes a distinct function with the same qualified name, as a
+    closure made by a factory would be.
+
+    Parameters
+    ----------
+    outputs: varargs
+        The arguments to `validate_outputs`, by default `(None, "odd")`.
+        The function returns `(a, b)` if two outputs are expected, and `a`
+        otherwise.
+
+    inputs: kwargs
+        The validators of `a` and `b`, by default `a=int, b="even"`.
+    """
+
+    outputs = outputs or (None, "odd")
+    inputs = inputs or dict(a=int, b="even")
+    pair = outputs[0] == 2
+
+    @validate_inputs(**inputs)
+    @validate_outputs(*outputs)
+    def wrapper(a, b=None):
+        return (a, b) if pair else a
+
+    return wrapper
@@ -0,0 +1,369 @@
+"""
+Unittests for the parallel validation of NumPy arrays.
+"""
+
+from py_validate.api import (ArraySpec, filter_valid, validate_inputs,
+                             validate_outputs, warn_only)
+from py_validate.backend.arrays import (InRange, ParallelArrayCheck,
+                                        all_even, free_shared_array,
+                                        parse_array_spec, shared_array)
+from py_validate.tests import CountingCheck, assert_raises
+
+import pickle
+import pytest
+
+np = pytest.importorskip("numpy")
+
+
+class TestParallelArrayCheck(object):
+
+    def test_invalid_check(self):
+        msg = "Unknown array check: 'prime'"
+        assert_raises(ValueError, msg, ParallelArrayCheck, "prime")
+
+        msg = "Array check must either be a name or callable"
+        assert_raises(TypeError, msg, ParallelArrayCheck, 1)
+
+    @pytest.mark.parametrize("invalid", [0, -1, 1.5])
+    def test_invalid_chunk_size(self, invalid):
+        msg = "chunk_size must be a positive integer"
+        assert_raises(ValueError, msg, ParallelArrayCheck,
+                      "even", chunk_size=invalid)
+
+    def test_not_array(self):
+        msg = "Expected a numpy array but got: 'list'"
+        assert_raises(TypeError, msg, ParallelArrayCheck("even"), [2, 4])
+
+    @pytest.mark.parametrize("chunk_size", [1, 7, 100, 1000])
+    def test_check_pass(self, chunk_size):
+        check = ParallelArrayCheck("even", chunk_size=chunk_size, workers=4)
+        assert check(np.arange(0, 200, 2))
+        assert check(np.arange(0, 200, 2).reshape(20, 5))
+        assert check(np.array(4))
+
+    @pytest.mark.parametrize("chunk_size", [1, 7, 100, 1000])
+    def test_check_fail(self, chunk_size):
+        arr = np.arange(0, 200, 2)
+        arr[57] = 1
+
+        msg = r"Array check 'even' failed for rows \[\d+:\d+\]"
+        check = ParallelArrayCheck("even", chunk_size=chunk_size, workers=4)
+        assert_raises(ValueError, msg, check, arr)
+
+    def test_failing_rows(self):
+        arr = np.zeros((100, 10), dtype=np.int64)
+        arr[57, 3] = 1
+
+        msg = r"failed for rows \[50:60\]"
+        check = ParallelArrayCheck(all_even, chunk_size=100, workers=2)
+        assert_raises(ValueError, msg, check, arr)
+
+    def test_in_range(self):
+        arr = np.linspace(0, 1, 1000, endpoint=False)
+
+        check = ParallelArrayCheck(InRange(0, 1), chunk_size=100)
+        assert check(arr)
+
+        msg = r"Array check 'range\(0, 0.5\)' failed"
+        check = ParallelArrayCheck(InRange(0, 0.5), chunk_size=100)
+        assert_raises(ValueError, msg, check, arr)
+
+    def test_finite(self):
+        arr = np.ones(1000)
+        check = ParallelArrayCheck("finite", chunk_size=64)
+        assert check(arr)
+
+        arr[-1] = np.nan
+        assert_raises(ValueError, "failed for rows", check, arr)
+
+    def test_views_not_copied(self):
+        arr = np.arange(0, 100, 2)
+        bases = []
+
+        def check(chunk):
+            bases.append(chunk.base is arr)
+            return all_even(chunk)
+
+        assert ParallelArrayCheck(check, chunk_size=10)(arr)
+        assert len(bases) == 5 and all(bases)
+
+    def test_stop_early(self):
+        arr = np.ones(1000, dtype=np.int64)
+        counting = CountingCheck(all_even, delay=0.001)
+
+        check = ParallelArrayCheck(counting, chunk_size=10, workers=1)
+        assert_raises(ValueError, r"failed for rows \[0:10\]", check, arr)
+
+        # Chunks that had yet to start were cancelled.
+        assert counting.calls < 100
+
+    def test_check_error(self):
+        def check(chunk):
+            raise RuntimeError("Bad chunk")
+
+        check = ParallelArrayCheck(check, chunk_size=10)
+        assert_raises(RuntimeError, "Bad chunk", check, np.zeros(100))
+
+    def test_validate_inputs(self):
+        @validate_inputs(a=ParallelArrayCheck("even", chunk_size=10))
+        def wrapper(a):
+            return a.sum()
+
+        assert wrapper(np.arange(0, 100, 2)) == 2450
+
+        msg = "Failed validation for input 'a'"
+        assert_raises(ValueError, msg, wrapper, np.arange(100))
+
+
+class TestSharedArrays(object):
+
+    def test_free_unknown(self):
+        msg = "Array was not created by shared_array"
+        assert_raises(ValueError, msg, free_shared_array, np.zeros(3))
+
+    def test_processes(self):
+        arr = shared_array((1000, 3), dtype=np.int64)
+
+        try:
+            arr[:] = 2
+            check = ParallelArrayCheck("even", chunk_size=300,
+                                       workers=2, processes=True)
+
+            assert check(arr)
+            assert check(arr[100:])  # views are found too
+
+            arr[500, 1] = 3
+            msg = r"failed for rows \[400:500\]"
+            assert_raises(ValueError, msg, check, arr[100:])
+        finally:
+            free_shared_array(arr)
+
+    def test_processes_fallback(self):
+        # Arrays not in shared memory are checked in threads.
+        check = ParallelArrayCheck(CountingCheck(all_even), chunk_size=10,
+                                   processes=True)
+        assert check(np.arange(0, 100, 2))
+        assert check.check.calls == 5
+
+
+class TestArraySpec(object):
+
+    @pytest.mark.parametrize("spec,expected", [
+        ("ndarray[float64, (n, 3), C]", "ndarray[float64, (n, 3), C]"),
+        ("ndarray[*]", "ndarray[*]"),
+        ("ndarray[integer, (n,), W]", "ndarray[integer, (n,), W]"),
+        ("ndarray[float, (..., *, 2), F, R]",
+         "ndarray[float64, (..., *, 2), F, R]"),
+        ("ndarray[int32, ()]", "ndarray[int32, ()]"),
+    ])
+    def test_parse(self, spec, expected):
+        assert repr(parse_array_spec(spec)) == expected
+
+    @pytest.mark.parametrize("spec,reason", [
+        ("ndarray[float64", "expected 'ndarray\\[dtype, "),
+        ("ndarray[float65]", "Invalid dtype for array spec: float65"),
+        ("ndarray[float64, (n, 3), X]", "unexpected 'X'"),
+        ("ndarray[float64, (n, 3), (n,)]", "multiple shapes"),
+        ("ndarray[float64, C, F]", "conflicting flag 'F'"),
+        ("ndarray[float64, (n, -1)]", "Invalid dimension in array spec"),
+        ("ndarray[float64, (..., ...)]",
+         "Array spec can contain at most one '...'"),
+    ])
+    def test_parse_invalid(self, spec, reason):
+        msg = "Invalid array spec '.*': " + reason
+        assert_raises(ValueError, msg, parse_array_spec, spec)
+
+    def test_invalid_order(self):
+        msg = "order must be 'C', 'F', or None"
+        assert_raises(ValueError, msg, ArraySpec, order="K")
+
+    def test_not_array(self):
+        msg = "Expected a numpy array but got: 'list'"
+        assert_raises(TypeError, msg, ArraySpec(), [1, 2])
+
+    def test_dtype(self):
+        spec = ArraySpec(dtype="float64")
+        assert spec(np.zeros(3))
+
+        msg = "Expected an array of dtype float64 but got int64"
+        assert_raises(TypeError, msg, spec, np.zeros(3, dtype=np.int64))
+
+    def test_abstract_dtype(self):
+        spec = ArraySpec(dtype=np.floating)
+
+        assert spec(np.zeros(3, dtype=np.float32))
+        assert spec(np.zeros(3, dtype=np.float64))
+
+        msg = "Expected an array of dtype floating but got int64"
+        assert_raises(TypeError, msg, spec, np.zeros(3, dtype=np.int64))
+
+    def test_shape(self):
+        spec = ArraySpec(shape=(None, 3))
+
+        assert spec(np.zeros((5, 3)))
+        assert spec(np.zeros((0, 3)))
+
+        msg = "Expected an array of shape \\(\\*, 3\\) but got \\(3,\\)"
+        assert_raises(ValueError, msg, spec, np.zeros(3))
+
+        msg = "Expected an array of shape \\(\\*, 3\\) but got \\(5, 2\\)"
+        assert_raises(ValueError, msg, spec, np.zeros((5, 2)))
+
+    def test_ellipsis(self):
+        spec = ArraySpec(shape=("...", 3))
+
+        assert spec(np.zeros(3))
+        assert spec(np.zeros((2, 4, 3)))
+
+        msg = "Expected an array of shape \\(\\.\\.\\., 3\\)"
+        assert_raises(ValueError, msg, spec, np.zeros(()))
+        assert_raises(ValueError, msg, spec, np.zeros((3, 2)))
+
+    def test_symbols(self):
+        spec = ArraySpec(shape=("n", "n"))
+
+        assert spec(np.zeros((3, 3)))
+        assert spec(np.zeros((4, 4)))
+
+        msg = "Expected an array of shape \\(n=3, n=3\\) but got \\(3, 4\\)"
+        assert_raises(ValueError, msg, spec, np.zeros((3, 4)))
+
+    def test_order(self):
+        arr = np.zeros((3, 4))
+
+        assert ArraySpec(order="C")(arr)
+        assert ArraySpec(order="F")(arr.T)
+
+        msg = "Expected a C-contiguous array"
+        assert_raises(ValueError, msg, ArraySpec(order="C"), arr.T)
+
+        msg = "Expected a F-contiguous array"
+        assert_raises(ValueError, msg, ArraySpec(order="F"), arr[:, :2])
+
+    def test_writeable(self):
+        arr = np.zeros(3)
+        view = arr.view()
+        view.flags.writeable = False
+
+        assert ArraySpec(writeable=True)(arr)
+        assert ArraySpec(writeable=False)(view)
+
+        msg = "Expected a writeable array"
+        assert_raises(ValueError, msg, ArraySpec(writeable=True), view)
+
+        msg = "Expected a read-only array"
+        assert_raises(ValueError, msg, ArraySpec(writeable=False), arr)
+
+    def test_data_untouched(self):
+        # A broadcast view has a shape of 10^12 elements but no data buffer
+        # of that size, so any check that touched the data would hang.
+        arr = np.broadcast_to(np.zeros(1), (10 ** 6, 10 ** 6))
+        assert ArraySpec("float64", ("n", "n"))(arr)
+
+    def test_pickle(self):
+        spec = parse_array_spec("ndarray[floating, (n, 3), C]")
+        assert repr(pickle.loads(pickle.dumps(spec))) == repr(spec)
+
+    def test_filter_valid(self):
+        @validate_inputs(x="ndarray[float64, (n, 3)]", y="ndarray[*, (n,)]")
+        def wrapper(x, y):
+            return x
+
+        items = [(np.zeros((2, 3)), np.zeros(2)),
+                 (np.zeros((2, 2)), np.zeros(2)),
+                 (np.zeros((4, 3)), np.zeros(2)),
+                 (np.zeros((4, 3)), np.zeros(4))]
+        valid = list(filter_valid(wrapper, items))
+
+        assert len(valid) == 2
+        assert valid[1][0].shape == (4, 3)
+
+
+class TestArraySpecValidation(object):
+
+    def test_invalid_at_decoration(self):
+        def wrapper(a):
+            return a
+
+        msg = "Invalid array spec 'ndarray\\[float64, \\(n, x y\\)\\]'"
+        assert_raises(ValueError, msg, validate_inputs(
+            a="ndarray[float64, (n, x y)]"), wrapper)
+
+        msg = "Invalid array spec 'ndarray\\[blob\\]'"
+        assert_raises(ValueError, msg, validate_outputs(
+            1, "ndarray[blob]"), wrapper)
+
+    def test_parsed_once(self):
+        @validate_inputs(a="ndarray[float64, (n, 3)]")
+        def wrapper(a):
+            return a
+
+        assert isinstance(wrapper._input_validators["a"], ArraySpec)
+
+        @validate_outputs(1, "ndarray[float64, (n, 3)]")
+        def other(a):
+            return a
+
+        # Identical specs share one ArraySpec.
+        assert other._output_validators[0] is wrapper._input_validators["a"]
+
+    def test_shared_symbols(self):
+        @validate_inputs(x="ndarray[float64, (n, 3), C]",
+                         y=ArraySpec(np.floating, ("n",)))
+        def wrapper(x, y):
+            return x.sum(axis=1) * y
+
+        assert wrapper._shared_symbols
+        assert wrapper(np.zeros((5, 3)), np.zeros(5)).shape == (5,)
+        assert wrapper(np.zeros((2, 3)), np.zeros(2)).shape == (2,)
+
+        msg = ("Failed validation for input 'y': Expected an "
+               "array of shape \\(n=5\\) but got \\(4,\\)")
+        assert_raises(ValueError, msg, wrapper, np.zeros((5, 3)),
+                      np.zeros(4))
+
+        # Symbols of different functions are not shared.
+        @validate_inputs(y="ndarray[float64, (n,)]")
+        def other(y):
+            return y
+
+        assert not other._shared_symbols
+        assert other(np.zeros(4)).shape == (4,)
+
+    def test_shared_symbols_kwargs(self):
+        @validate_inputs(x="ndarray[*, (n, m)]", y="ndarray[*, (m, k)]")
+        def wrapper(x, y):
+            return x @ y
+
+        assert wrapper(np.zeros((2, 3)), y=np.zeros((3, 4))).shape == (2, 4)
+
+        msg = "Expected an array of shape \\(m=3, k\\) but got \\(4, 4\\)"
+        assert_raises(ValueError, msg, wrapper, np.zeros((2, 3)),
+                      y=np.zeros((4, 4)))
+
+    def test_outputs(self):
+        @validate_inputs(x="ndarray[*, (n, 3)]")
+        @validate_outputs(-1, "ndarray[*, (n,)]")
+        def wrapper(x, drop=0):
+            return x.sum(axis=1)[drop:]
+
+        assert wrapper(np.zeros((5, 3))).shape == (5,)
+
+        msg = ("Failed validation for input 'Output 0': Expected "
+               "an array of shape \\(n=5\\) but got \\(4,\\)")
+        assert_raises(ValueError, msg, wrapper, np.zeros((5, 3)), 1)
+
+    def test_reporter(self):
+        reports = []
+
+        def handler(func_name, var_name, error, suppressed):
+            reports.append((var_name, str(error)))
+
+        @warn_only(handler)
+        @validate_inputs(x="ndarray[*, (n,)]", y="ndarray[*, (n,)]")
+        def wrapper(x, y):
+            return len(x)
+
+        assert wrapper(np.zeros(3), np.zeros(4)) == 3
+        assert reports == [("y", "Failed validation for input 'y': Expected "
+                                 "an array of shape (n=3) but got (4,)")]
@@ -6,7 +6,11 @@ the namespace members with imports from top and lower-level modules.
 from py_validate.backend import ValidatedFunction
 from py_validate.tests import assert_raises
 
+import os
+import py_validate
 import pytest
+import subprocess
+import sys
 
 
 class TestNamespace(object):
@@ -34,17 +38,41 @@ class TestNamespace(object):
 
     def test_pv_namespace(self):
         import py_validate as pv
-        expected = {"api", "backend", "test", "validate_inputs",
-                    "tests", "validate_outputs"}
+        expected = {"ArraySpec", "AsyncValidator", "BufferSpec", "ColumnSpec",
+                    "DataFrameSchema", "FailureReporter", "FileSpec",
+                    "IdentityCache", "InheritContracts", "ParallelArrayCheck",
+                    "TimeBudget", "ValidatorProfiler", "api", "backend",
+                    "cache_identity", "dump_registry", "filter_valid",
+                    "free_shared_array", "load_specs", "outermost_only",
+                    "registered_functions", "set_generic_limits",
+                    "set_profiler", "set_reporter", "shared_array", "test",
+                    "tests", "time_budget", "trusted", "validate_annotations",
+                    "validate_class", "validate_inputs", "validate_module",
+                    "validate_outputs", "warn_only"}
         self._check_namespace(pv, expected)
 
     def test_pv_backend_namespace(self):
         import py_validate.backend as backend
-        expected = {"NegateShortcut", "ValidatedFunction", "base",
-                    "get_shortcut", "helpers", "shortcuts"}
+        expected = {"NegateShortcut", "ValidatedFunction", "annotations",
+                    "arrays", "asyncs", "base", "budgets", "buffers", "bulk",
+                    "caching", "contracts", "files", "frames", "generics",
+                    "get_shortcut", "helpers", "interning", "profiling",
+                    "registry", "reporting", "scopes", "shortcuts", "specs"}
 
         self._check_namespace(backend, expected)
 
+    def test_lazy_imports(self):
+        # Modules that are slow to import are only imported when used.
+        code = ("import py_validate, sys; print(sorted(set(sys.argv[1:]) "
+                "& set(sys.modules)))")
+        lazy = ["asyncio", "concurrent.futures", "logging",
+                "multiprocessing.shared_memory"]
+
+        root = os.path.dirname(os.path.dirname(py_validate.__file__))
+        output = subprocess.check_output([sys.executable, "-c", code] + lazy,
+                                         cwd=root)
+        assert output.decode().strip() == "[]"
+
 
 class TestValidatedFunction(object):
 
@@ -74,6 +102,25 @@ class TestValidatedFunction(object):
         msg = "Invalid function parameter provided"
         assert_raises(ValueError, msg, ValidatedFunction, klass())
 
+    def test_method(self):
+        class Shape(object):
+
+            def __init__(self, sides):
+                self.sides = sides
+
+            @ValidatedFunction
+            def scale(self, factor):
+                return self.sides * factor
+
+        validated = Shape.__dict__["scale"]
+        validated.update_input_validators(factor=int)
+
+        assert Shape.scale is validated
+        assert Shape(3).scale(2) == 6
+
+        msg = "Incorrect type for variable 'factor'"
+        assert_raises(TypeError, msg, Shape(3).scale, 2.0)
+
     def test_input_duplicate_variable(self):
         validator = ValidatedFunction(lambda x: x + 1)
         validator.update_input_validators(x=int)
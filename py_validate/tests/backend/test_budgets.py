@@ -0,0 +1,280 @@
+"""
+Unittests for time budgets of validators.
+"""
+
+from py_validate.api import TimeBudget, time_budget, validate_inputs
+from py_validate.backend.budgets import (UNCHECKED, BudgetExceeded,
+                                         BudgetedValidator, as_budget)
+from py_validate.tests import assert_raises
+
+import json
+import logging
+import pytest
+import threading
+
+
+@pytest.fixture
+def release():
+    # Set to let validators blocked on it return.
+    event = threading.Event()
+    yield event
+    event.set()
+
+
+def slow_check(release):
+    def check(x):
+        release.wait(5)
+        return True
+
+    return check
+
+
+class TestTimeBudget(object):
+
+    @pytest.mark.parametrize("kwargs,msg", [
+        (dict(seconds=0), "seconds must be positive"),
+        (dict(seconds=1, policy="ignore"),
+         "policy must be one of pass, fail, warn"),
+        (dict(seconds=1, max_overruns=0),
+         "max_overruns must be a positive integer or None"),
+        (dict(seconds=1, reset_after=-1),
+         "reset_after must be positive or None"),
+        (dict(seconds=1, workers=0), "workers must be a positive integer"),
+        (dict(seconds=1, max_in_flight=0),
+         "max_in_flight must be a positive integer or None"),
+    ])
+    def test_invalid(self, kwargs, msg):
+        assert_raises(ValueError, msg, TimeBudget, **kwargs)
+
+    def test_as_budget(self):
+        budget = TimeBudget(1)
+
+        assert as_budget(None) is None
+        assert as_budget(budget) is budget
+        assert as_budget(0.5).seconds == 0.5
+
+        msg = "Budget must either be a TimeBudget, number, or None"
+        assert_raises(TypeError, msg, as_budget, "1")
+        assert_raises(TypeError, msg, as_budget, True)
+
+    def test_within_budget(self):
+        budget = TimeBudget(1)
+
+        assert budget.run("check", lambda x: x + 1, 1) == 2
+        assert_raises(ZeroDivisionError, None, budget.run,
+                      "check", lambda x: 1 / x, 0)
+
+        metrics = budget.dump()
+        json.dumps(metrics)
+
+        assert metrics == {"check": {"calls": 2, "overruns": 0,
+                                     "skipped": 0, "disabled": False}}
+
+    def test_policy_fail(self, release):
+        budget = TimeBudget(0.01)
+
+        msg = "Validator exceeded its time budget of 0.01 seconds"
+        assert_raises(TimeoutError, msg, budget.run,
+                      "check", slow_check(release), 1)
+
+    def test_policy_pass(self, release):
+        budget = TimeBudget(0.01, policy="pass")
+        assert budget.run("check", slow_check(release), 1) is UNCHECKED
+
+    def test_policy_warn(self, release, caplog):
+        budget = TimeBudget(0.01, policy="warn")
+
+        with caplog.at_level(logging.WARNING, logger="py_validate"):
+            assert budget.run("check", slow_check(release), 1) is UNCHECKED
+
+        msg = "Validator check exceeded its time budget of 0.01 seconds"
+        assert msg in caplog.text
+
+    def test_circuit_breaker(self, release, caplog):
+        events = []
+
+        budget = TimeBudget(0.01, policy="pass", max_overruns=2,
+                            callback=lambda *args: events.append(args))
+        check = slow_check(release)
+
+        with caplog.at_level(logging.WARNING, logger="py_validate"):
+            budget.run("check", check, 1)
+            budget.run("check", check, 1)
+
+        assert events == [("check", "overrun"), ("check", "overrun"),
+                          ("check", "disabled")]
+        assert "Disabled validator check after 2" in caplog.text
+
+        # Disabled checks are skipped, even if they would fail.
+        assert budget.run("check", lambda x: False, 1) is UNCHECKED
+        assert budget.dump()["check"] == {"calls": 3, "overruns": 2,
+                                          "skipped": 1, "disabled": True}
+
+        budget.reset()
+        assert budget.run("check", lambda x: False, 1) is False
+
+    def test_consecutive_overruns(self, release):
+        budget = TimeBudget(0.01, policy="pass", max_overruns=2)
+        check = slow_check(release)
+
+        budget.run("check", check, 1)
+        budget.run("check", lambda x: True, 1)
+        budget.run("check", check, 1)
+
+        assert not budget.dump()["check"]["disabled"]
+
+    def test_reset_after(self, release, monkeypatch):
+        now = [0.0]
+        monkeypatch.setattr("py_validate.backend.budgets.time.monotonic",
+                            lambda: now[0])
+
+        budget = TimeBudget(0.01, policy="pass", max_overruns=2,
+                            reset_after=10, max_in_flight=4)
+        check = slow_check(release)
+
+        budget.run("check", check, 1)
+        budget.run("check", check, 1)
+
+        now[0] = 5.0
+        assert budget.run("check", lambda x: False, 1) is UNCHECKED
+
+        # Tried again, and disabled again after a single overrun.
+        now[0] = 15.0
+        budget.run("check", check, 1)
+        assert budget.dump()["check"]["disabled"]
+
+        # Tried again, and enabled again if it finishes in time.
+        now[0] = 30.0
+        assert budget.run("check", lambda x: False, 1) is False
+        assert not budget.dump()["check"]["disabled"]
+
+    def test_max_in_flight(self, release):
+        budget = TimeBudget(0.01, policy="pass", max_overruns=None,
+                            max_in_flight=2)
+        check = slow_check(release)
+
+        assert budget.run("check", check, 1) is UNCHECKED
+        assert budget.run("check", check, 1) is UNCHECKED
+
+        # Further runs do not start, and so are not overruns.
+        assert budget.run("check", check, 1) is UNCHECKED
+        assert budget.dump()["check"] == {"calls": 3, "overruns": 2,
+                                          "skipped": 1, "disabled": False}
+
+        release.set()
+        budget._get_executor().submit(lambda: None).result()
+        assert budget.run("check", lambda x: False, 1) is False
+
+        budget = TimeBudget(0.01, max_in_flight=1)
+        budget.run("check", lambda x: True, 1)
+
+        msg = "Validator could not start within its time budget"
+        budget._states["check"][5] = 1
+        assert_raises(BudgetExceeded, msg, budget.run, "check", check, 1)
+
+    def test_busy_workers(self, release):
+        budget = TimeBudget(0.05, policy="pass", max_overruns=1, workers=1)
+
+        assert budget.run("slow", slow_check(release), 1) is UNCHECKED
+
+        # The only worker is busy, so the healthy check cannot start; this
+        # is not held against it.
+        assert budget.run("fast", lambda x: False, 1) is UNCHECKED
+        assert budget.dump()["fast"] == {"calls": 1, "overruns": 0,
+                                         "skipped": 1, "disabled": False}
+
+        release.set()
+        assert budget.run("fast", lambda x: False, 1) is False
+
+    def test_runaway_validator(self, release):
+        # A runaway validator does not get the others disabled.
+        budget = TimeBudget(0.05, policy="pass")
+        check = slow_check(release)
+
+        for _ in range(10):
+            budget.run("slow", check, 1)
+            assert budget.run("fast", lambda x: False, 1) is False
+
+        # It only ties up two of the four workers.
+        metrics = budget.dump()
+        assert metrics["fast"]["overruns"] == 0
+        assert metrics["slow"]["overruns"] == 2
+        assert metrics["slow"]["skipped"] == 8
+
+
+class TestBudgetedValidator(object):
+
+    def test_invalid(self):
+        msg = "Budgeted validator must either be a shortcut or callable"
+        assert_raises(TypeError, msg, BudgetedValidator, TimeBudget(1), 1)
+
+    def test_limit(self, release):
+        budget = TimeBudget(0.01)
+
+        @validate_inputs(a=budget.limit("re:a+b"),
+                         b=budget.limit(slow_check(release)))
+        def wrapper(a, b=None):
+            return a
+
+        assert wrapper("aab") == "aab"
+
+        msg = "Failed validation for input 'a'"
+        assert_raises(ValueError, msg, wrapper, "ba")
+
+        msg = ("Failed validation for input 'b': Validator "
+               "exceeded its time budget of 0.01 seconds")
+        assert_raises(TimeoutError, msg, wrapper, "aab", 1)
+
+    def test_names(self, release):
+        budget = TimeBudget(0.01, policy="pass", max_overruns=1)
+
+        slow = budget.limit(lambda x: slow_check(release)(x))
+        fast = budget.limit(lambda x: False)
+        named = budget.limit(lambda x: True, name="check")
+
+        assert (slow.name, fast.name, named.name) == ("<lambda>",
+                                                      "<lambda>#2", "check")
+
+        # Each has its own circuit breaker.
+        assert slow(1) is UNCHECKED
+        assert budget.dump()["<lambda>"]["disabled"]
+        assert fast(1) is False
+
+
+class TestFunctionBudget(object):
+
+    def test_time_budget(self, release):
+        budget = TimeBudget(0.01)
+
+        @time_budget(budget)
+        @validate_inputs(a=int, b="even", c=slow_check(release))
+        def wrapper(a, b, c=None):
+            return a + b
+
+        assert wrapper(1, 2) == 3
+
+        msg = "Incorrect type for variable 'a'"
+        assert_raises(TypeError, msg, wrapper, 1.5, 2)
+
+        msg = "Failed validation for input 'b'"
+        assert_raises(ValueError, msg, wrapper, 1, 3)
+
+        msg = ("Failed validation for input 'c': Validator "
+               "exceeded its time budget of 0.01 seconds")
+        assert_raises(BudgetExceeded, msg, wrapper, 1, 2, 3)
+
+        # Types are checked directly.
+        names = set(budget.dump())
+        assert names == {wrapper._name() + ":b", wrapper._name() + ":c"}
+
+    def test_remove_budget(self, release):
+        @time_budget(0.01)
+        @validate_inputs(a=slow_check(release))
+        def wrapper(a):
+            return a
+
+        assert_raises(TimeoutError, None, wrapper, 1)
+
+        wrapper.set_time_budget(None)
+        release.set()
+        assert wrapper(1) == 1
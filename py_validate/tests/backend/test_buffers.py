@@ -0,0 +1,204 @@
+"""
+Unittests for the zero-copy validation of buffer-protocol objects.
+"""
+
+from py_validate.api import BufferSpec, validate_inputs
+from py_validate.tests import assert_raises
+
+import array
+import mmap
+import pytest
+import tracemalloc
+
+
+class ChunkRecorder(object):
+
+    def __init__(self, valid=True):
+        self.valid = valid
+        self.chunks = []
+
+    def __call__(self, chunk):
+        assert isinstance(chunk, memoryview)
+        self.chunks.append(chunk.nbytes)
+
+        return self.valid
+
+
+@pytest.fixture
+def mapped(tmp_path):
+    path = tmp_path / "data.bin"
+    path.write_bytes(b"abcd" * 1000 + b"\xff")
+
+    with open(str(path), "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    yield mapped
+    mapped.close()
+
+
+class TestBufferSpec(object):
+
+    def test_invalid_scan(self):
+        msg = "Unknown buffer scan: 'utf32'"
+        assert_raises(ValueError, msg, BufferSpec, scans="utf32")
+
+        msg = "Buffer scan must either be a name or callable"
+        assert_raises(TypeError, msg, BufferSpec, scans=[1])
+
+    @pytest.mark.parametrize("name", ["itemsize", "alignment", "chunk_size"])
+    def test_invalid_int(self, name):
+        msg = "{name} must be a positive integer".format(name=name)
+        assert_raises(ValueError, msg, BufferSpec, **{name: 0})
+
+    def test_not_buffer(self):
+        msg = "Expected a bytes-like object but got: 'list'"
+        assert_raises(TypeError, msg, BufferSpec(), [1, 2])
+
+        msg = "Expected a bytes-like object but got: 'str'"
+        assert_raises(TypeError, msg, BufferSpec(), "abc")
+
+    @pytest.mark.parametrize("obj", [
+        b"abc", bytearray(b"abc"), memoryview(b"abc"),
+        array.array("B", [1, 2, 3]),
+    ])
+    def test_byte_buffers(self, obj):
+        assert BufferSpec(format="B", itemsize=1, min_len=3, max_len=3)(obj)
+
+    def test_format(self):
+        spec = BufferSpec(format="d")
+        assert spec(array.array("d", [1.0]))
+
+        msg = "Expected a buffer of format 'd' but got 'i'"
+        assert_raises(TypeError, msg, spec, array.array("i", [1]))
+
+    def test_itemsize(self):
+        spec = BufferSpec(itemsize=8)
+        assert spec(array.array("q", [1]))
+
+        msg = "Expected a buffer of itemsize 8 but got 1"
+        assert_raises(TypeError, msg, spec, b"abc")
+
+    def test_length(self):
+        spec = BufferSpec(min_len=2, max_len=3)
+
+        assert spec(array.array("d", [1.0, 2.0, 3.0]))
+
+        msg = "Expected a buffer of at least 2 items but got 1"
+        assert_raises(ValueError, msg, spec, array.array("d", [1.0]))
+
+        msg = "Expected a buffer of at most 3 items but got 4"
+        assert_raises(ValueError, msg, spec, b"abcd")
+
+    def test_readonly(self):
+        assert BufferSpec(readonly=True)(b"abc")
+        assert BufferSpec(readonly=False)(bytearray(b"abc"))
+
+        msg = "Expected a read-only buffer"
+        assert_raises(ValueError, msg, BufferSpec(readonly=True),
+                      bytearray(b"abc"))
+
+        msg = "Expected a writeable buffer"
+        assert_raises(ValueError, msg, BufferSpec(readonly=False), b"abc")
+
+    def test_alignment(self):
+        pytest.importorskip("numpy")
+
+        spec = BufferSpec(alignment=4)
+        buf = array.array("i", range(10))
+
+        assert spec(buf)
+
+        msg = "Expected a buffer aligned to 4 bytes"
+        assert_raises(ValueError, msg, spec, memoryview(buf).cast("B")[1:])
+
+    def test_view_released(self):
+        buf = bytearray(b"abc")
+        BufferSpec(scans="ascii")(buf)
+
+        # A bytearray cannot be resized while a view of it exists.
+        buf.extend(b"def")
+
+    @pytest.mark.parametrize("name,data,offset", [
+        ("ascii", b"abc\xc3\xb6", 3),
+        ("printable", b"ab\x07c", 2),
+        ("nonzero", b"ab\x00", 2),
+    ])
+    def test_named_scans(self, name, data, offset):
+        spec = BufferSpec(scans=name, chunk_size=2)
+        assert spec(b"abcd\n")
+
+        msg = "Buffer scan '{name}' failed at byte {offset}".format(
+            name=name, offset=offset)
+        assert_raises(ValueError, msg, spec, data)
+
+    @pytest.mark.parametrize("name", ["ascii", "printable", "nonzero"])
+    def test_named_scans_zero_copy(self, name):
+        spec = BufferSpec(scans=name, chunk_size=1 << 20)
+        data = b"abcd" * (1 << 20)
+        spec(data)
+
+        tracemalloc.start()
+
+        try:
+            assert spec(data)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        # Chunks are scanned in place, not copied.
+        assert peak < 1 << 16
+
+    def test_callable_scan(self):
+        recorder = ChunkRecorder()
+        spec = BufferSpec(scans=recorder, chunk_size=4)
+
+        assert spec(b"abcdefghij")
+        assert recorder.chunks == [4, 4, 2]
+
+    def test_callable_scan_fail(self):
+        recorder = ChunkRecorder(valid=False)
+        spec = BufferSpec(scans=recorder, chunk_size=4)
+
+        msg = "Buffer scan '.*ChunkRecorder.*' failed for bytes \\[0:4\\]"
+        assert_raises(ValueError, msg, spec, b"abcdefghij")
+
+        # Scanning stops at the first invalid chunk.
+        assert recorder.chunks == [4]
+
+    def test_scan_items(self):
+        # Buffers of other formats are scanned as their bytes.
+        spec = BufferSpec(scans="nonzero")
+
+        assert spec(array.array("i", [-1, -1]))
+
+        msg = "Buffer scan 'nonzero' failed at byte 4"
+        assert_raises(ValueError, msg, spec, array.array("i", [-1, 0]))
+
+    def test_scan_not_contiguous(self):
+        msg = "Expected a contiguous buffer to scan"
+        assert_raises(ValueError, msg, BufferSpec(scans="ascii"),
+                      memoryview(b"abcd")[::2])
+
+    def test_mmap(self, mapped):
+        recorder = ChunkRecorder()
+        spec = BufferSpec(scans=[recorder, "ascii"], chunk_size=1024)
+
+        msg = "Buffer scan 'ascii' failed at byte 4000"
+        assert_raises(ValueError, msg, spec, mapped)
+
+        assert recorder.chunks == [1024, 1024, 1024, 929]
+
+        # The view is released, so the map can be closed.
+        mapped.close()
+
+    def test_validate_inputs(self):
+        @validate_inputs(payload=BufferSpec(format="B", max_len=8,
+                                            scans="ascii"))
+        def wrapper(payload):
+            return len(payload)
+
+        assert wrapper(b"abc") == 3
+
+        msg = ("Failed validation for input 'payload': Expected "
+               "a buffer of at most 8 items but got 9")
+        assert_raises(ValueError, msg, wrapper, b"abcdefghi")
@@ -0,0 +1,255 @@
+"""
+Unittests for the identity cache of objects that passed validation.
+"""
+
+from py_validate.api import (IdentityCache, TimeBudget, cache_identity,
+                             validate_inputs)
+from py_validate.backend.caching import as_identity_cache
+from py_validate.tests import CountingCheck, assert_raises
+
+from typing import FrozenSet, Tuple
+
+import gc
+import pytest
+import threading
+
+
+class Frozen(object):
+    # Supports weak references, unlike tuples.
+    __slots__ = ("value", "__weakref__")
+
+    def __init__(self, value):
+        self.value = value
+
+
+class TestIdentityCache(object):
+
+    @pytest.mark.parametrize("invalid", [0, -1, 1.5])
+    def test_invalid_maxsize(self, invalid):
+        msg = "maxsize must be a positive integer"
+        assert_raises(ValueError, msg, IdentityCache, maxsize=invalid)
+
+    def test_as_identity_cache(self):
+        cache = IdentityCache()
+
+        assert as_identity_cache(None) is None
+        assert as_identity_cache(False) is None
+        assert as_identity_cache(cache) is cache
+        assert isinstance(as_identity_cache(True), IdentityCache)
+
+        msg = "Cache must either be an IdentityCache, bool, or None"
+        assert_raises(TypeError, msg, as_identity_cache, 1)
+
+    def test_passed_add(self):
+        cache = IdentityCache()
+        val = tuple(range(10))
+
+        assert not cache.passed(val, "even")
+        cache.add(val, "even")
+
+        assert cache.passed(val, "even")
+        assert not cache.passed(val, "odd")
+
+        # Identity, not equality.
+        assert not cache.passed(tuple(range(10)), "even")
+
+        assert cache.hits == 1
+        assert cache.misses == 3
+
+    def test_unhashable_validator(self):
+        cache = IdentityCache()
+        val = (1, 2)
+
+        cache.add(val, [int])
+        assert not cache.passed(val, [int])
+        assert len(cache) == 0
+
+    def test_bounded(self):
+        cache = IdentityCache(maxsize=2)
+        values = [(i, i) for i in range(3)]
+
+        for val in values:
+            cache.add(val, "check")
+
+        assert len(cache) == 2
+        assert not cache.passed(values[0], "check")
+        assert cache.passed(values[2], "check")
+
+    def test_lru(self):
+        cache = IdentityCache(maxsize=2)
+        values = [(i, i) for i in range(3)]
+
+        cache.add(values[0], "check")
+        cache.add(values[1], "check")
+        cache.passed(values[0], "check")
+        cache.add(values[2], "check")
+
+        assert cache.passed(values[0], "check")
+        assert not cache.passed(values[1], "check")
+
+    def test_weak_references(self):
+        cache = IdentityCache(types=(Frozen,))
+        val = Frozen(1)
+
+        cache.add(val, "check")
+        assert len(cache) == 1
+
+        # The cache does not keep the object alive, and evicts its entry.
+        del val
+        gc.collect()
+
+        assert len(cache) == 0
+
+    def test_pinned(self):
+        cache = IdentityCache()
+        cache.add(tuple(range(10)), "check")
+
+        # Objects without weak references are kept alive while
+        # cached, so that their id cannot be reused.
+        gc.collect()
+
+        assert len(cache) == 1
+
+    def test_id_reuse(self):
+        cache = IdentityCache(types=(Frozen,))
+
+        for i in range(100):
+            # Objects created in turn are likely to reuse the same id.
+            val = Frozen(i)
+
+            assert not cache.passed(val, "check")
+            cache.add(val, "check")
+
+            del val
+
+        assert cache.hits == 0
+
+    def test_clear(self):
+        cache = IdentityCache()
+        val = (1, 2)
+
+        cache.add(val, "check")
+        cache.clear()
+
+        assert len(cache) == 0
+        assert not cache.passed(val, "check")
+
+
+class TestCacheIdentity(object):
+
+    def test_skips_checks(self):
+        check = CountingCheck()
+
+        @cache_identity()
+        @validate_inputs(a=check)
+        def wrapper(a):
+            return a
+
+        val = tuple(range(10))
+
+        for _ in range(3):
+            assert wrapper(val) is val
+
+        assert check.calls == 1
+
+        # Equal, but not the same object.
+        wrapper(tuple(range(10)))
+        assert check.calls == 2
+
+    def test_failures_not_cached(self):
+        @cache_identity()
+        @validate_inputs(a=Tuple[int, ...])
+        def wrapper(a):
+            return a
+
+        val = (1, 2, "3")
+
+        msg = "Incorrect type for variable 'a\\[2\\]'"
+        assert_raises(TypeError, msg, wrapper, val)
+        assert_raises(TypeError, msg, wrapper, val)
+
+    def test_uncached_types(self):
+        check = CountingCheck()
+
+        @cache_identity()
+        @validate_inputs(a=check)
+        def wrapper(a):
+            return a
+
+        val = [1, 2, 3]  # mutable, so always checked
+
+        wrapper(val)
+        wrapper(val)
+
+        assert check.calls == 2
+
+    def test_shared_cache(self):
+        cache = IdentityCache()
+
+        @cache_identity(cache)
+        @validate_inputs(a=FrozenSet[int])
+        def first(a):
+            return a
+
+        @cache_identity(cache)
+        @validate_inputs(b=FrozenSet[int])
+        def second(b):
+            return b
+
+        val = frozenset(range(100))
+
+        first(val)
+        second(val)
+
+        assert cache.hits == 1
+
+    def test_with_budget(self):
+        check = CountingCheck()
+
+        @cache_identity()
+        @validate_inputs(a=check)
+        def wrapper(a):
+            return a
+
+        wrapper.set_time_budget(TimeBudget(1))
+
+        val = (1, 2)
+        wrapper(val)
+        wrapper(val)
+
+        assert check.calls == 1
+
+        wrapper.set_identity_cache(None)
+        wrapper(val)
+
+        assert check.calls == 2
+
+    @pytest.mark.parametrize("limited", [False, True])
+    def test_with_budget_unchecked(self, limited):
+        release = threading.Event()
+        budget = TimeBudget(0.01, policy="pass", max_overruns=1)
+
+        def check(x):
+            release.wait(5)
+            return False
+
+        @cache_identity()
+        @validate_inputs(a=budget.limit(check) if limited else check)
+        def wrapper(a):
+            return a
+
+        if not limited:
+            wrapper.set_time_budget(budget)
+
+        val = (1, 2)
+
+        try:
+            # Overruns, and is then skipped by the circuit breaker.
+            assert wrapper(val) == val
+            assert wrapper(val) == val
+        finally:
+            release.set()
+
+        # Values let through unchecked are not cached as valid.
+        budget.reset()
+        assert_raises(ValueError, None, wrapper, val)
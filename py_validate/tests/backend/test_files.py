@@ -0,0 +1,225 @@
+"""
+Unittests for the validation of file paths and file objects.
+"""
+
+from py_validate.api import FileSpec, validate_inputs
+from py_validate.backend import files
+from py_validate.tests import assert_raises
+
+import gzip
+import io
+import os
+import pathlib
+import pytest
+
+
+@pytest.fixture
+def gz_path(tmp_path):
+    path = tmp_path / "data.gz"
+    path.write_bytes(gzip.compress(b"abc" * 100))
+
+    return path
+
+
+@pytest.fixture
+def opened(monkeypatch):
+    # Records the paths opened by the validators.
+    paths = []
+
+    def recording_open(path, *args, **kwargs):
+        paths.append(path)
+        return open(path, *args, **kwargs)
+
+    monkeypatch.setattr(files, "open", recording_open, raising=False)
+    return paths
+
+
+class TestFileSpec(object):
+
+    def test_unknown_format(self):
+        msg = "Unknown file format: 'xlsx'"
+        assert_raises(ValueError, msg, FileSpec, magic="xlsx")
+
+    @pytest.mark.parametrize("invalid", [1, (b"a",), (b"a", "b")])
+    def test_invalid_magic(self, invalid):
+        msg = "Magic must either be a format name, bytes"
+        assert_raises(TypeError, msg, FileSpec, magic=invalid)
+
+    def test_invalid_cache_size(self):
+        msg = "cache_size must be a non-negative integer"
+        assert_raises(ValueError, msg, FileSpec, cache_size=-1)
+
+    def test_not_file(self):
+        msg = "Expected a path or file object but got: 'int'"
+        assert_raises(TypeError, msg, FileSpec(), 1)
+
+    def test_paths(self, gz_path):
+        spec = FileSpec(magic="gzip")
+
+        assert spec(gz_path)
+        assert spec(str(gz_path))
+        assert spec(os.fsencode(str(gz_path)))
+
+    def test_not_found(self, tmp_path):
+        path = str(tmp_path / "missing.gz")
+
+        msg = "File not found: '.*missing.gz'"
+        assert_raises(ValueError, msg, FileSpec(), path)
+
+    def test_directory(self, tmp_path):
+        msg = "Expected a regular file"
+        assert_raises(ValueError, msg, FileSpec(), tmp_path)
+
+    def test_size(self, tmp_path):
+        path = tmp_path / "data.bin"
+        path.write_bytes(b"abcd")
+
+        assert FileSpec(min_size=4, max_size=4)(path)
+
+        msg = "Expected a file of at least 5 bytes but got 4"
+        assert_raises(ValueError, msg, FileSpec(min_size=5), path)
+
+        msg = "Expected a file of at most 3 bytes but got 4"
+        assert_raises(ValueError, msg, FileSpec(max_size=3), path)
+
+    def test_format(self, tmp_path):
+        path = tmp_path / "data.npy"
+        path.write_bytes(b"PK\x03\x04")
+
+        msg = ("Expected a npy file but got header "
+               "b'PK\\\\x03\\\\x04'")
+        assert_raises(ValueError, msg, FileSpec(magic="npy"), path)
+
+    def test_trailer(self, tmp_path):
+        path = tmp_path / "data.parquet"
+        path.write_bytes(b"PAR1" + b"\x00" * 100 + b"PAR1")
+
+        assert FileSpec(magic="parquet")(path)
+
+        # e.g. a file whose write was cut short.
+        path.write_bytes(b"PAR1" + b"\x00" * 100)
+
+        msg = "Expected a parquet file but got trailer"
+        assert_raises(ValueError, msg, FileSpec(magic="parquet"), path)
+
+    def test_custom_magic(self, tmp_path):
+        path = tmp_path / "data.bin"
+        path.write_bytes(b"HEAD" + b"\x00" * 10 + b"TAIL")
+
+        assert FileSpec(magic=b"HEAD")(path)
+        assert FileSpec(magic=(None, b"TAIL"))(path)
+
+        msg = "Expected a file with trailer b'END' but got trailer b'AIL'"
+        assert_raises(ValueError, msg, FileSpec(magic=(b"HEAD", b"END")),
+                      path)
+
+    def test_short_file(self, tmp_path):
+        path = tmp_path / "data.bin"
+        path.write_bytes(b"P")
+
+        msg = "Expected a parquet file but got header b'P'"
+        assert_raises(ValueError, msg, FileSpec(magic="parquet"), path)
+
+    def test_reads_prefix_only(self, gz_path, monkeypatch):
+        reads = []
+
+        class RecordingFile(io.FileIO):
+
+            def read(self, size=-1):
+                reads.append(size)
+                return super(RecordingFile, self).read(size)
+
+        def recording_open(path, mode="r"):
+            assert mode == "rb"
+            return RecordingFile(path, "r")
+
+        monkeypatch.setattr(files, "open", recording_open, raising=False)
+
+        assert FileSpec(magic="gzip")(gz_path)
+        assert reads == [2]
+
+    def test_cache(self, gz_path, opened):
+        spec = FileSpec(magic="gzip")
+
+        for _ in range(3):
+            assert spec(gz_path)
+
+        assert len(opened) == 1
+
+        # Modified files are checked again.
+        gz_path.write_bytes(b"not gzip")
+
+        msg = "Expected a gzip file but got header b'no'"
+        assert_raises(ValueError, msg, spec, gz_path)
+
+    def test_cache_failures_not_cached(self, tmp_path, opened):
+        path = tmp_path / "data.gz"
+        path.write_bytes(b"xx")
+
+        spec = FileSpec(magic="gzip")
+
+        assert_raises(ValueError, None, spec, path)
+        assert_raises(ValueError, None, spec, path)
+
+        assert len(opened) == 2
+
+    def test_cache_bounded(self, tmp_path, opened):
+        spec = FileSpec(magic="gzip", cache_size=1)
+        paths = []
+
+        for name in ("a.gz", "b.gz"):
+            path = tmp_path / name
+            path.write_bytes(gzip.compress(b""))
+            paths.append(path)
+
+        spec(paths[0])
+        spec(paths[1])
+        spec(paths[0])
+
+        assert len(opened) == 3
+
+        spec.clear_cache()
+        spec(paths[0])
+
+        assert len(opened) == 4
+
+    def test_cache_disabled(self, gz_path, opened):
+        spec = FileSpec(magic="gzip", cache_size=0)
+
+        spec(gz_path)
+        spec(gz_path)
+
+        assert len(opened) == 2
+
+    def test_file_object(self, gz_path):
+        spec = FileSpec(magic="gzip", min_size=10)
+
+        with open(str(gz_path), "rb") as f:
+            f.read(5)
+
+            assert spec(f)
+            assert f.tell() == 5
+
+    def test_in_memory_file(self):
+        spec = FileSpec(magic=b"PK", max_size=4)
+
+        assert spec(io.BytesIO(b"PK\x03\x04"))
+
+        msg = "Expected a file of at most 4 bytes but got 5"
+        assert_raises(ValueError, msg, spec, io.BytesIO(b"PK\x03\x04\x05"))
+
+    def test_text_file_object(self):
+        msg = "Expected a binary file object"
+        assert_raises(TypeError, msg, FileSpec(magic=b"PK"),
+                      io.StringIO("PK"))
+
+    def test_validate_inputs(self, gz_path):
+        @validate_inputs(path=FileSpec(magic="gzip"))
+        def load(path):
+            with gzip.open(str(path)) as f:
+                return f.read()
+
+        assert load(pathlib.Path(gz_path)) == b"abc" * 100
+
+        msg = "Failed validation for input 'path': File not found"
+        assert_raises(ValueError, msg, load, "missing.gz")
@@ -0,0 +1,214 @@
+"""
+Unittests for the schema validation of pandas DataFrames.
+"""
+
+from py_validate.api import (ColumnSpec, DataFrameSchema, validate_inputs,
+                             validate_outputs)
+from py_validate.tests import assert_raises
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+np = pytest.importorskip("numpy")
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame({"id": [2, 4, 6, 8],
+                         "score": [0.5, 0.25, 0.0, 0.75],
+                         "name": ["ab", "ac", None, "ad"],
+                         "group": [1, 2, 1, 1]})
+
+
+class TestColumnSpec(object):
+
+    def test_invalid_shortcut(self):
+        msg = "Unknown shortcut: 'prime'"
+        assert_raises(ValueError, msg, ColumnSpec, checks="prime")
+
+    def test_invalid_dtype(self):
+        assert_raises(TypeError, None, ColumnSpec, dtype="float65")
+
+    def test_checks(self):
+        assert ColumnSpec().checks == ()
+        assert ColumnSpec(checks="even").checks == ("even",)
+        assert ColumnSpec(checks=["even", "odd"]).checks == ("even", "odd")
+
+
+class TestDataFrameSchema(object):
+
+    @pytest.mark.parametrize("invalid", [0, -1, 1.5])
+    def test_invalid_sample(self, invalid):
+        msg = "sample must be a positive integer or None"
+        assert_raises(ValueError, msg, DataFrameSchema, {}, sample=invalid)
+
+    def test_not_frame(self):
+        msg = "Expected a pandas DataFrame but got: 'dict'"
+        assert_raises(TypeError, msg, DataFrameSchema({}), {"id": [1]})
+
+    def test_pass(self, df):
+        schema = DataFrameSchema({
+            "id": ColumnSpec("int64", ["even", "range(0, 10)"]),
+            "score": ColumnSpec("float64", "number"),
+            "name": ColumnSpec(checks="re:^a", nullable=True),
+            "group": "in:{1, 2}",
+        })
+
+        assert schema(df)
+
+    def test_missing(self, df):
+        schema = DataFrameSchema({"id": None, "size": None, "weight": None})
+
+        msg = "Missing columns: 'size', 'weight'"
+        assert_raises(ValueError, msg, schema, df)
+
+    def test_strict(self, df):
+        schema = DataFrameSchema({"id": None, "score": None}, strict=True)
+
+        msg = "Unexpected columns: 'name', 'group'"
+        assert_raises(ValueError, msg, schema, df)
+
+    def test_presence_only(self, df):
+        assert DataFrameSchema({"name": None})(df)
+
+    def test_dtype(self, df):
+        schema = DataFrameSchema({"id": ColumnSpec(dtype="float64")})
+
+        msg = "Expected column 'id' of dtype float64 but got int64"
+        assert_raises(TypeError, msg, schema, df)
+
+    def test_duplicate_columns(self, df):
+        df = pd.concat([df, df[["id"]]], axis=1)
+
+        msg = "Expected a single column 'id' but got 2"
+        assert_raises(ValueError, msg, DataFrameSchema({"id": None}), df)
+
+    def test_not_null(self, df):
+        schema = DataFrameSchema({"name": ColumnSpec()})
+
+        msg = "Column 'name' failed check 'not null' for 1 row\\(s\\): \\[2\\]"
+        assert_raises(ValueError, msg, schema, df)
+
+    def test_nulls_not_checked(self, df):
+        schema = DataFrameSchema({"score": ColumnSpec(checks="range(0, 1)",
+                                                      nullable=True)})
+        df.loc[1, "score"] = np.nan
+
+        assert schema(df)
+
+    @pytest.mark.parametrize("check,values,rows", [
+        ("even", [2, 3, 4, 5], "2 row\\(s\\): \\[1, 3\\]"),
+        ("odd", [1, -3, 4, 5], "1 row\\(s\\): \\[2\\]"),
+        ("range(0, 5)", [0, 5, 4, -1], "2 row\\(s\\): \\[1, 3\\]"),
+        ("in:{1, 2}", [1, 2, 3, 1], "1 row\\(s\\): \\[2\\]"),
+    ])
+    def test_vectorized_checks(self, check, values, rows):
+        schema = DataFrameSchema({"x": check})
+        df = pd.DataFrame({"x": values})
+
+        msg = "Column 'x' failed check '{check}' for {rows}".format(
+            check=check.replace("(", "\\(").replace(")", "\\)"), rows=rows)
+        assert_raises(ValueError, msg, schema, df)
+
+    def test_regex(self, df):
+        schema = DataFrameSchema({"name": ColumnSpec(checks="re:c$",
+                                                     nullable=True)})
+
+        msg = "Column 'name' failed check 're:c\\$' for 2 row\\(s\\)"
+        assert_raises(ValueError, msg, schema, df)
+
+    def test_failing_rows_truncated(self):
+        schema = DataFrameSchema({"x": "even"})
+        df = pd.DataFrame({"x": range(1, 100, 2)})
+
+        msg = ("Column 'x' failed check 'even' for 50 "
+               "row\\(s\\): \\[0, 1, 2, 3, 4, \\.\\.\\.\\]")
+        assert_raises(ValueError, msg, schema, df)
+
+    @pytest.mark.parametrize("check,expected", [
+        ("even", "integers"), ("integer", "integers"),
+    ])
+    def test_wrong_dtype_for_check(self, df, check, expected):
+        schema = DataFrameSchema({"score": check})
+
+        msg = ("Column 'score' failed check '{check}': expected "
+               "{expected} but got dtype float64")
+        msg = msg.format(check=check, expected=expected)
+        assert_raises(TypeError, msg, schema, df)
+
+    def test_booleans_not_numbers(self):
+        schema = DataFrameSchema({"flag": "number"})
+        df = pd.DataFrame({"flag": [True, False]})
+
+        msg = "expected numbers but got dtype bool"
+        assert_raises(TypeError, msg, schema, df)
+
+    def test_object_columns(self):
+        # Mixed Python values are checked element by element,
+        # with the same semantics as the scalar shortcuts.
+        schema = DataFrameSchema({"x": "integer"})
+        df = pd.DataFrame({"x": [1, 2, "3", 4.0]}, dtype=object)
+
+        msg = "Column 'x' failed check 'integer' for 2 row\\(s\\): \\[2, 3\\]"
+        assert_raises(ValueError, msg, schema, df)
+
+    def test_elementwise_expression(self, df):
+        schema = DataFrameSchema({"name": ColumnSpec(checks="len<=1 | re:d",
+                                                     nullable=True)})
+
+        msg = "Column 'name' failed check 'len<=1 \\| re:d' for 2 row\\(s\\)"
+        assert_raises(ValueError, msg, schema, df)
+
+    def test_negated_check(self):
+        schema = DataFrameSchema({"a": "~even"})
+        df = pd.DataFrame({"a": [1, 2, 3, 4]})
+
+        msg = "Column 'a' failed check '~even' for 2 row\\(s\\): \\[1, 3\\]"
+        assert_raises(ValueError, msg, schema, df)
+
+    def test_sample(self):
+        values = np.zeros(100000, dtype=np.int64)
+        values[::1000] = 1  # 100 odd values
+
+        df = pd.DataFrame({"x": values})
+
+        with_sample = DataFrameSchema({"x": "even"}, sample=10, seed=0)
+        assert with_sample(df)
+
+        full = DataFrameSchema({"x": "even"})
+        assert_raises(ValueError, "for 100 row", full, df)
+
+        # Failures found in a sample are reported by their row labels.
+        all_odd = pd.DataFrame({"x": np.ones(1000, dtype=np.int64)})
+        schema = DataFrameSchema({"x": "even"}, sample=10, seed=0)
+
+        assert_raises(ValueError, "for 10 row", schema, all_odd)
+
+    def test_sample_dtype_checked(self):
+        # Dtypes are checked in full, whatever the sample size.
+        schema = DataFrameSchema({"x": ColumnSpec("int64")}, sample=1)
+        df = pd.DataFrame({"x": [1.0, 2.0]})
+
+        assert_raises(TypeError, "of dtype int64", schema, df)
+
+
+class TestFrameValidation(object):
+
+    def test_inputs_outputs(self, df):
+        schema = DataFrameSchema({"id": ColumnSpec("int64", "even"),
+                                  "score": "range(0, 1)"})
+
+        @validate_inputs(frame=schema)
+        @validate_outputs(-1, DataFrameSchema({"total": "number"}))
+        def summarize(frame, column="score"):
+            return frame.groupby("group")[[column]].sum().rename(
+                columns={"score": "total"})
+
+        assert list(summarize(df).index) == [1, 2]
+
+        msg = "Failed validation for input 'frame': Column 'id' failed check"
+        assert_raises(ValueError, msg, summarize, df.assign(id=[1, 2, 3, 4]))
+
+        msg = ("Failed validation for input 'Output 0': "
+               "Missing columns: 'total'")
+        assert_raises(ValueError, msg, summarize, df, "id")
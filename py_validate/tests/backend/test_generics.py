@@ -0,0 +1,148 @@
+"""
+Unittests for the compiled `typing` generic checkers.
+"""
+
+from py_validate.backend.generics import (GenericMismatch, compile_generic,
+                                          is_generic, set_generic_limits)
+from py_validate.tests import assert_raises
+
+import collections
+import pytest
+import typing
+
+
+@pytest.fixture
+def limits():
+    yield set_generic_limits
+    set_generic_limits(max_depth=None, sample_size=100)
+
+
+class TestIsGeneric(object):
+
+    @pytest.mark.parametrize("valid", [
+        typing.List[int], typing.Optional[str], typing.Any, list[int],
+        typing.Literal["a"], typing.Tuple[int, ...], int | None,
+        typing.TypeVar("T"), typing.NewType("UserId", int)
+    ])
+    def test_generic(self, valid):
+        assert is_generic(valid)
+
+    @pytest.mark.parametrize("invalid", [
+        int, "integer", lambda x: True, None, 2
+    ])
+    def test_not_generic(self, invalid):
+        assert not is_generic(invalid)
+
+
+class TestCompileGeneric(object):
+
+    @pytest.mark.parametrize("tp,value", [
+        (typing.List[int], [1, 2, 3]),
+        (typing.List[typing.Dict[str, int]], [{"a": 1}, {}]),
+        (typing.Optional[str], None),
+        (typing.Optional[str], "foo"),
+        (typing.Union[int, str], "foo"),
+        (int | str, 1),
+        (typing.Literal["a", "b"], "b"),
+        (typing.Tuple[int, str], (1, "a")),
+        (typing.Tuple[int, ...], (1, 2, 3)),
+        (typing.Tuple[()], ()),
+        (typing.Mapping[str, typing.List[int]],
+         collections.OrderedDict(a=[1])),
+        (typing.Set[int], {1, 2}),
+        (typing.Sequence[float], (1.5, 2.5)),
+        (typing.Type[Exception], ValueError),
+        (typing.Iterator[int], iter(["a"])),
+        (typing.Any, object()),
+        (typing.NewType("UserId", int), 5),
+        (typing.Counter[str], collections.Counter("abc")),
+        (typing.List["Undefined"], [object()]),  # noqa: F821
+    ])
+    def test_valid(self, tp, value):
+
+        # No Exception should be raised.
+        compile_generic(tp)(value)
+
+    @pytest.mark.parametrize("tp,value,msg", [
+        (typing.List[int], (1,), "expected List\\[int\\] but got tuple"),
+        (typing.List[int], [1, "a"], "expected int but got str at \\[1\\]"),
+        (typing.List[typing.Dict[str, int]], [{"a": "b"}],
+         "expected int but got str at \\[0\\]\\['a'\\]"),
+        (typing.Dict[str, int], {1: 1}, "at <key 1>"),
+        (typing.Optional[str], 1, "expected Optional\\[str\\] but got int"),
+        (typing.Literal["a", "b"], "c", "but got 'c'"),
+        (typing.Literal[1], True, "but got True"),
+        (typing.Tuple[int, str], (1, 2), "expected str but got int at"),
+        (typing.Tuple[int, str], (1,), "got tuple of length 1"),
+        (typing.Set[int], {"a"}, "at <element 'a'>"),
+        (typing.Type[Exception], int, "but got int"),
+        (typing.Counter[str], collections.Counter({1: 1}), "at <key 1>"),
+        (typing.Counter[str], collections.Counter(a=1.5),
+         "expected int but got float at \\['a'\\]"),
+        (typing.List["int"], [1, "a"], "expected int but got str at \\[1\\]"),
+        (list["int"], [1, "a"], "expected int but got str at \\[1\\]"),
+        (typing.List["None"], [1], "expected None but got int at \\[0\\]"),
+        (typing.List["Undefined"], (1,),  # noqa: F821
+         "expected List\\[ForwardRef\\('Undefined'\\)\\] but got tuple"),
+    ])
+    def test_invalid(self, tp, value, msg):
+        assert_raises(GenericMismatch, msg, compile_generic(tp), value)
+
+    def test_unsupported(self):
+        msg = "Unsupported typing construct"
+        assert_raises(TypeError, msg, compile_generic, typing.TypeGuard[int])
+
+    def test_cached(self):
+        tp = typing.List[typing.Dict[str, int]]
+        assert compile_generic(tp) is compile_generic(tp)
+
+
+class TestLimits(object):
+
+    def test_sample_size(self, limits):
+        values = list(range(1000))
+        values[1] = "foo"
+
+        limits(sample_size=None)
+        checker = compile_generic(typing.List[int])
+        assert_raises(GenericMismatch, "at \\[1\\]", checker, values)
+
+        limits(sample_size=10)
+        compile_generic(typing.List[int])(values)
+
+        # Sampled positions are evenly spaced across the container.
+        values[500] = "foo"
+        assert_raises(GenericMismatch, "at \\[500\\]",
+                      compile_generic(typing.List[int]), values)
+
+    @pytest.mark.parametrize("tp,value", [
+        (typing.List[int], ["foo"]),
+        (typing.Iterable[int], {"foo"}),
+        (typing.Dict[str, int], {1: "foo"}),
+    ])
+    def test_sample_size_zero(self, limits, tp, value):
+        limits(sample_size=0)
+
+        # Only the type of the container is checked.
+        compile_generic(tp)(value)
+        assert_raises(GenericMismatch, None, compile_generic(tp), 1)
+
+    def test_max_depth(self, limits):
+        tp = typing.List[typing.List[int]]
+        value = [["foo"]]
+
+        assert_raises(GenericMismatch, None, compile_generic(tp), value)
+
+        limits(max_depth=1)
+        compile_generic(tp)(value)
+
+        limits(max_depth=0)
+        compile_generic(tp)([1])
+        assert_raises(GenericMismatch, None, compile_generic(tp), (1,))
+
+    @pytest.mark.parametrize("invalid", [-1, 1.5, "foo"])
+    def test_invalid_limits(self, invalid):
+        msg = "must be a non-negative integer or None"
+        assert_raises(ValueError, msg, set_generic_limits, max_depth=invalid)
+        assert_raises(ValueError, msg, set_generic_limits,
+                      sample_size=invalid)
@@ -3,6 +3,7 @@ Unittests for the helper functions and classes.
 """
 
 from py_validate.backend.base import DocSubstitution, FrozenDict
+from py_validate.backend.helpers import bounded_repr, short_repr
 from py_validate.tests import assert_raises
 
 import pytest
@@ -187,3 +188,25 @@ class TestDocSubstitution(object):
                              "            We do this because\n" +
                              "    " * override_tab_count + "it is necessary.\n"
                                                            "            ")
+
+
+class TestValueRendering(object):
+
+    @pytest.mark.parametrize("val,expected", [
+        (1, "1"), ("abc", "abc"), ([1, "a"], "[1, 'a']"),
+        ({"a": 1}, "{'a': 1}"), (None, "None")])
+    def test_short_repr(self, val, expected):
+        assert short_repr(val) == expected
+
+    @pytest.mark.parametrize("val", [
+        "a" * 10 ** 6, b"a" * 10 ** 6, bytearray(10 ** 6),
+        list(range(10 ** 6)), tuple(range(10 ** 6)), set(range(10 ** 6)),
+        {i: i for i in range(10 ** 6)}, [[[[list(range(10 ** 6))]]]],
+        10 ** 1000])
+    def test_truncated(self, val):
+        assert len(short_repr(val)) < 200
+        assert len(bounded_repr(val)) < 200
+
+    def test_bounded_repr(self):
+        assert bounded_repr("abc") == "'abc'"
+        assert bounded_repr(list(range(10))) == "[0, 1, 2, 3, 4, 5, ...]"
@@ -0,0 +1,127 @@
+"""
+Unittests for interning the validators of validated functions.
+"""
+
+from py_validate.api import validate_annotations, validate_inputs
+from py_validate.backend.interning import (intern_map, intern_tuple,
+                                           is_interned)
+from py_validate.backend.helpers import FrozenDict
+from py_validate.backend.registry import approximate_memory
+from py_validate.tests import assert_raises, make_wrapper
+
+from typing import Callable, List, Union
+
+import gc
+import weakref
+
+
+class TestInterning(object):
+
+    def test_shared(self):
+        first = make_wrapper(a=int, b=List[int])
+        second = make_wrapper(a=int, b=List[int])
+
+        for name in ("_input_validators", "_input_names",
+                     "_output_validators", "_output_names"):
+            assert getattr(first, name) is getattr(second, name)
+            assert is_interned(getattr(first, name))
+
+        assert first(1, [2]) == 1
+
+    def test_distinct(self):
+        first = make_wrapper(a=int)
+
+        assert make_wrapper(a=str)._input_validators is not \
+            first._input_validators
+        assert make_wrapper(b=int)._input_validators is not \
+            first._input_validators
+
+    def test_order(self):
+        # These compare equal, but report mismatches differently.
+        first = intern_map(FrozenDict(a=Union[int, str]))
+        second = intern_map(FrozenDict(a=Union[str, int]))
+
+        assert first is not second
+        assert repr(second["a"]) == "typing.Union[str, int]"
+
+    def test_callables_not_interned(self):
+        validators = FrozenDict(a=lambda x: True)
+
+        assert intern_map(validators) is validators
+        assert not is_interned(intern_tuple([callable]))
+
+        # The tuples of names are still shared.
+        first = make_wrapper(a=lambda x: True)
+        second = make_wrapper(a=lambda x: True)
+
+        assert first._input_names is second._input_names
+
+    def test_local_classes_not_interned(self):
+        class Local(object):
+            pass
+
+        dynamic = type("Dynamic", (object,), {})
+
+        for validator in (Local, dynamic, List[Local],
+                          Callable[[int], Union[str, Local]]):
+            assert not is_interned(intern_tuple([int, validator]))
+
+        # Classes defined at module level, and constructs of them, are.
+        assert is_interned(intern_tuple([int, FrozenDict, List[FrozenDict]]))
+
+    def test_local_classes_collected(self):
+        def make_class():
+            class Local(object):
+                pass
+
+            return Local
+
+        local = make_class()
+        wrapper = make_wrapper(b=local)
+        assert wrapper(1, local()) == 1
+
+        ref = weakref.ref(local)
+        del local, wrapper
+        gc.collect()
+
+        assert ref() is None
+
+    def test_update_shared(self):
+        first = make_wrapper(a=int)
+        second = make_wrapper(a=int)
+
+        first.update_input_validators(b=str)
+
+        assert dict(first._input_validators) == {"a": int, "b": str}
+        assert dict(second._input_validators) == {"a": int}
+        assert second(1, 3) == 1
+
+    def test_update_failure(self):
+        wrapper = make_wrapper(a=int)
+
+        msg = "Validator\\(s\\) for input"
+        assert_raises(ValueError, msg, wrapper.update_input_validators,
+                      b=str, a=float)
+
+        # Failed updates leave the validators unchanged.
+        assert dict(wrapper._input_validators) == {"a": int}
+        assert wrapper._input_names == ("a",)
+
+    def test_deferred_updates(self):
+        @validate_annotations(lazy=True)
+        def first(a: int, b: str):
+            return a
+
+        @validate_inputs(a=int, b=str)
+        def second(a, b):
+            return a
+
+        first(1, "b")
+        assert first._input_validators is second._input_validators
+
+    def test_memory(self):
+        first = make_wrapper(a=int)
+        unique = make_wrapper(a=lambda x: True)
+
+        # Interned containers are not owned by the function.
+        assert approximate_memory(first) < approximate_memory(unique)
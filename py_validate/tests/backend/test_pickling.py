@@ -0,0 +1,126 @@
+"""
+Unittests for pickling validated functions, e.g. for use with process pools.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from py_validate.api import (FailureReporter, IdentityCache, TimeBudget,
+                             validate_annotations, validate_inputs,
+                             validate_outputs)
+from py_validate.backend import ValidatedFunction
+from py_validate.tests import assert_raises
+
+import pickle
+import pytest
+import typing
+
+
+@validate_inputs(a=int, b="integer & range(0, 10)")
+@validate_outputs(None, "even")
+def module_level(a, b=0):
+    return a + b
+
+
+def raw(a, b=0):
+    return a + b
+
+
+reports = []
+
+
+def record(*report):
+    reports.append(report)
+
+
+class Container(object):
+
+    @staticmethod
+    @validate_inputs(a=int)
+    def method(a):
+        return a
+
+
+def test_by_reference():
+    data = pickle.dumps(module_level)
+
+    # Only the module and name are pickled, not the validators.
+    assert b"range" not in data
+    assert pickle.loads(data) is module_level
+
+
+def test_nested_by_reference():
+    assert pickle.loads(pickle.dumps(Container.method)) is Container.method
+
+
+def test_by_spec():
+    validated = ValidatedFunction(raw)
+    validated.update_input_validators(a=int, b=typing.Optional[int])
+    validated.update_exp_output_len(1)
+    validated.update_output_validators("~odd | number")
+
+    restored = pickle.loads(pickle.dumps(validated))
+
+    assert restored is not validated
+    assert restored.f is raw
+    assert restored(1, b=3) == 4
+
+    msg = "Incorrect type for variable 'a'"
+    assert_raises(TypeError, msg, restored, 1.5)
+
+    msg = "Incorrect type for variable 'b'"
+    assert_raises(TypeError, msg, restored, 1, "foo")
+
+
+def test_by_spec_lazy():
+    validated = validate_annotations(lazy=True)(raw)
+    validated.update_input_validators(a=int)
+
+    restored = pickle.loads(pickle.dumps(validated))
+    assert len(restored._deferred_updates) == 1
+
+    assert restored(1) == 1
+    assert len(restored._deferred_updates) == 0
+
+
+def test_by_spec_outermost_only():
+    validated = validate_inputs(a=int)(raw)
+    validated.set_outermost_only(True)
+
+    restored = pickle.loads(pickle.dumps(validated))
+    assert restored._outermost is not None
+
+
+def test_by_spec_config():
+    validated = validate_inputs(a="even")(raw)
+    validated.set_reporter(FailureReporter(record, rate=2.0))
+    validated.set_time_budget(TimeBudget(1, policy="warn"))
+    validated.set_identity_cache(IdentityCache(maxsize=8))
+
+    restored = pickle.loads(pickle.dumps(validated))
+
+    assert restored._reporter.rate == 2.0
+    assert restored._budget.policy == "warn"
+    assert restored._identity_cache.maxsize == 8
+
+    # Still warn-only once unpickled.
+    del reports[:]
+    assert restored(1) == 1
+    assert [report[1] for report in reports] == ["a"]
+
+
+def test_unpicklable():
+    def local(a):
+        return a
+
+    validated = validate_inputs(a=lambda x: x > 0)(local)
+
+    with pytest.raises((pickle.PicklingError, AttributeError)):
+        pickle.dumps(validated)
+
+
+def test_process_pool():
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        assert list(executor.map(module_level, [1, 3], [1, 1])) == [2, 4]
+
+        future = executor.submit(module_level, 1, 2)
+        msg = "Failed validation for input 'Output 0'"
+        assert_raises(ValueError, msg, future.result)
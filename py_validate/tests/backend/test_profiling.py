@@ -0,0 +1,186 @@
+"""
+Unittests for profiling the validators of validated functions.
+"""
+
+from py_validate.api import set_profiler, validate_inputs
+from py_validate.backend.profiling import ValidatorProfiler, as_profiler
+from py_validate.backend.shortcuts import get_shortcut
+from py_validate.tests import assert_raises, make_wrapper
+
+import cProfile
+import json
+import pstats
+import pytest
+
+
+class TestValidatorProfiler(object):
+
+    @pytest.mark.parametrize("invalid", [0, -1, 1.5])
+    def test_invalid_sample_every(self, invalid):
+        msg = "sample_every must be a positive integer"
+        assert_raises(ValueError, msg, ValidatorProfiler, sample_every=invalid)
+
+    def test_record_dump(self):
+        profiler = ValidatorProfiler(buckets=(1e-3, 1.0))
+        profiler.record("f", "a", 1e-4)
+        profiler.record("f", "a", 0.5)
+        profiler.record("f", "b", 5.0)
+
+        dump = profiler.dump()
+        json.dumps(dump)
+
+        assert dump["f"]["a"]["count"] == 2
+        assert dump["f"]["a"]["total"] == pytest.approx(0.5001)
+        assert dump["f"]["a"]["buckets"] == [1, 1, 0]
+        assert dump["f"]["a"]["bounds"] == [1e-3, 1.0]
+        assert dump["f"]["b"]["buckets"] == [0, 0, 1]
+
+        profiler.reset()
+        assert profiler.dump() == {}
+
+    def test_sample(self):
+        profiler = ValidatorProfiler(sample_every=3)
+        assert [profiler.sample() for _ in range(6)] == [False, False, True,
+                                                         False, False, True]
+
+    def test_sample_per_function(self):
+        profiler = ValidatorProfiler(sample_every=2)
+        samples = [profiler.sample(name) for _ in range(2)
+                   for name in ("f", "g")]
+
+        assert samples == [False, False, True, True]
+
+        profiler.reset()
+        assert profiler.sample("f") is False
+
+    def test_as_profiler(self):
+        profiler = ValidatorProfiler()
+
+        assert as_profiler(None) is None
+        assert as_profiler(profiler) is profiler
+        assert as_profiler(len).callback is len
+
+        msg = "Profiler must either be a ValidatorProfiler, callable, or None"
+        assert_raises(TypeError, msg, as_profiler, 1)
+
+
+class TestFunctionProfiling(object):
+
+    def test_set_profiler(self):
+        wrapper = make_wrapper(2, None, "even")
+        timings = []
+        wrapper.set_profiler(lambda *timing: timings.append(timing))
+
+        assert wrapper(1, 2) == (1, 2)
+        names = [(func_name.split(".")[-1], var_name)
+                 for func_name, var_name, _ in timings]
+
+        # Arguments without validators are not timed.
+        assert names == [("wrapper", "a"), ("wrapper", "b"),
+                         ("wrapper", "Output 1")]
+        assert all(elapsed >= 0 for _, _, elapsed in timings)
+
+        # Failing validators are also timed.
+        del timings[:]
+        assert_raises(TypeError, None, wrapper, 1.5)
+        assert [timing[1] for timing in timings] == ["a"]
+
+        wrapper.set_profiler(None)
+        del timings[:]
+
+        wrapper(1, 2)
+        assert timings == []
+
+    def test_sampled(self):
+        wrapper = make_wrapper(2, None, "even")
+        profiler = ValidatorProfiler(sample_every=2)
+        wrapper.set_profiler(profiler)
+
+        for _ in range(10):
+            wrapper(1, b=2)
+
+        histograms = list(profiler.dump().values())[0]
+        assert histograms["a"]["count"] == 5
+        assert histograms["b"]["count"] == 5
+        assert histograms["Output 1"]["count"] == 5
+
+    def test_sampled_alternating(self):
+        @validate_inputs(a=int)
+        def first(a):
+            return a
+
+        @validate_inputs(a=int)
+        def second(a):
+            return a
+
+        profiler = ValidatorProfiler(sample_every=2)
+        first.set_profiler(profiler)
+        second.set_profiler(profiler)
+
+        # Each function is sampled on its own, however calls interleave.
+        for _ in range(10):
+            first(1)
+            second(1)
+
+        counts = [histograms["a"]["count"] for histograms
+                  in profiler.dump().values()]
+        assert counts == [5, 5]
+
+    def test_same_name(self):
+        first = make_wrapper(2, None, "even")
+        second = make_wrapper(2, None, "even")
+
+        profiler = ValidatorProfiler(sample_every=2)
+        first.set_profiler(profiler)
+        second.set_profiler(profiler)
+
+        # Closures made by the same factory are profiled separately.
+        for _ in range(2):
+            first(1, 2)
+            second(1, 2)
+
+        second(1, 2)
+        second(1, 2)
+
+        name = first._name()
+        dump = profiler.dump()
+
+        assert sorted(dump) == [name, name + "#2"]
+        assert dump[name]["a"]["count"] == 1
+        assert dump[name + "#2"]["a"]["count"] == 2
+
+    def test_default_profiler(self):
+        wrapper = make_wrapper(2, None, "even")
+        other = make_wrapper(2, None, "even")
+
+        profiler = ValidatorProfiler()
+        own_profiler = ValidatorProfiler()
+
+        other.set_profiler(own_profiler)
+        set_profiler(profiler)
+
+        try:
+            wrapper(1, 2)
+            other(1, 2)
+        finally:
+            set_profiler(None)
+
+        wrapper(1, 2)
+
+        assert len(profiler.dump()) == 1
+        assert len(own_profiler.dump()) == 1
+
+        histograms = list(profiler.dump().values())[0]
+        assert histograms["a"]["count"] == 1
+
+
+def test_checker_names():
+    checker = get_shortcut("integer & range(0, 10)")
+    assert checker.__qualname__ == "shortcut[integer & range(0, 10)]"
+
+    profile = cProfile.Profile()
+    profile.runcall(checker, 5)
+
+    names = [name for _, _, name in pstats.Stats(profile).stats]
+    assert "shortcut[integer & range(0, 10)]" in names
+    assert "shortcut[range(0, 10)]" in names
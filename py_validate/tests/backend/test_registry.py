@@ -0,0 +1,126 @@
+"""
+Unittests for the registry of validated functions.
+"""
+
+from py_validate.api import (ValidatorProfiler, dump_registry,
+                             registered_functions, validate_annotations,
+                             validate_inputs)
+from py_validate.backend.registry import (describe_function,
+                                          describe_validator)
+from py_validate.tests import make_wrapper
+
+from typing import List
+
+import gc
+import json
+import pytest
+import weakref
+
+
+class TestRegistry(object):
+
+    def test_registered(self):
+        wrapper = make_wrapper(1, "number")
+        assert wrapper in registered_functions()
+
+    def test_weak(self):
+        wrapper = make_wrapper(1, "number")
+        ref, f = weakref.ref(wrapper), wrapper.f
+
+        assert any(registered.f is f for registered in registered_functions())
+
+        del wrapper
+        gc.collect()
+
+        # The registry neither keeps the function alive nor lists it once
+        # it is collected. Functions of other tests may be collected here
+        # too, so the number of registered functions is not compared.
+        assert ref() is None
+        assert not any(registered.f is f
+                       for registered in registered_functions())
+
+    @pytest.mark.parametrize("validator,kind,spec", [
+        (None, None, None),
+        ("even | odd", "shortcut", "even | odd"),
+        (int, "type", "builtins.int"),
+        (List[int], "generic", "typing.List[int]"),
+        (callable, "callable", "callable"),
+    ])
+    def test_describe_validator(self, validator, kind, spec):
+        description = describe_validator(validator)
+
+        if kind is None:
+            assert description is None
+        else:
+            assert description == {"kind": kind, "spec": spec}
+
+    def test_dump(self):
+        wrapper = make_wrapper(1, "number")
+        description = describe_function(wrapper)
+
+        assert description in dump_registry()
+        json.dumps(description)
+
+        assert not description["async"]
+        assert description["inputs"] == {
+            "a": {"kind": "type", "spec": "builtins.int"},
+            "b": {"kind": "shortcut", "spec": "even"},
+        }
+        assert description["output_len"] == 1
+        assert description["outputs"] == [
+            {"kind": "shortcut", "spec": "number"}]
+        assert description["output_plan"] == "fixed"
+        assert description["pending_updates"] == 0
+        assert not any(description["options"].values())
+        assert description["calls"] is None
+        assert description["memory"] > 0
+
+    def test_options(self):
+        wrapper = make_wrapper(1, "number")
+        wrapper.set_time_budget(1.0)
+        wrapper.set_outermost_only(True)
+
+        options = describe_function(wrapper)["options"]
+
+        assert options["time_budget"]
+        assert options["outermost_only"]
+        assert not options["reporter"]
+
+    def test_pending_updates(self):
+        @validate_annotations(lazy=True)
+        def lazy_wrapper(a: int):
+            return a
+
+        assert describe_function(lazy_wrapper)["pending_updates"] == 1
+
+        lazy_wrapper(1)
+        assert describe_function(lazy_wrapper)["pending_updates"] == 0
+
+    def test_call_statistics(self):
+        profiler = ValidatorProfiler(sample_every=2)
+
+        cold = make_wrapper(1, "number")
+        hot = make_wrapper(1, "number")
+
+        @validate_inputs(a="number")
+        def unprofiled(a):
+            return a
+
+        for wrapper, calls in ((cold, 2), (hot, 20)):
+            wrapper.set_profiler(profiler)
+
+            for _ in range(calls):
+                wrapper(1, 2)
+
+        # Both wrappers share a name, but not their histograms.
+        calls = describe_function(hot)["calls"]
+
+        assert describe_function(cold)["calls"]["timed_calls"] == 1
+        assert calls["timed_calls"] == 10
+        assert calls["estimated_calls"] == 20
+        assert calls["estimated_seconds"] == 2 * calls["timed_seconds"] > 0
+        assert calls["seconds_per_call"] > 0
+
+        names = [description["name"] for description in dump_registry()]
+        assert (names.index(hot._name()) <
+                names.index(unprofiled._name()))
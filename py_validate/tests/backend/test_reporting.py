@@ -0,0 +1,152 @@
+"""
+Unittests for rate-limited reporting of validation failures.
+"""
+
+from py_validate.api import (FailureReporter, set_reporter, validate_outputs,
+                             warn_only)
+from py_validate.backend.reporting import as_reporter
+from py_validate.tests import assert_raises, make_wrapper
+
+import logging
+import pytest
+
+
+class Clock(object):
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr("py_validate.backend.reporting.time.monotonic", clock)
+    return clock
+
+
+class TestFailureReporter(object):
+
+    @pytest.mark.parametrize("kwargs,msg", [
+        (dict(rate=0), "rate must be positive"),
+        (dict(burst=0), "burst must be a positive integer"),
+        (dict(burst=1.5), "burst must be a positive integer"),
+    ])
+    def test_invalid(self, kwargs, msg):
+        assert_raises(ValueError, msg, FailureReporter, **kwargs)
+
+    def test_rate_limit(self, clock):
+        reports = []
+        reporter = FailureReporter(lambda *report: reports.append(report),
+                                   rate=2.0, burst=3)
+        error = ValueError("foo")
+
+        results = [reporter.report("f", "a", error) for _ in range(5)]
+        assert results == [True, True, True, False, False]
+        assert [report[3] for report in reports] == [0, 0, 0]
+
+        # Buckets are kept per function and argument.
+        assert reporter.report("f", "b", error)
+        assert reporter.report("g", "a", error)
+
+        clock.now += 0.5
+        assert reporter.report("f", "a", error)
+        assert not reporter.report("f", "a", error)
+
+        # Suppressed failures are counted in the next report.
+        assert reports[-1] == ("f", "a", error, 2)
+
+        clock.now += 100
+        assert [reporter.report("f", "a", error)
+                for _ in range(4)] == [True, True, True, False]
+
+    def test_default_handler(self, caplog):
+        reporter = FailureReporter()
+
+        with caplog.at_level(logging.WARNING, logger="py_validate"):
+            reporter.report("f", "a", ValueError("foo"))
+
+        assert "Validation failed in f: foo" in caplog.text
+
+    def test_as_reporter(self):
+        reporter = FailureReporter()
+
+        assert as_reporter(None) is None
+        assert as_reporter(reporter) is reporter
+        assert as_reporter(len).handler is len
+
+        msg = "Reporter must either be a FailureReporter, callable, or None"
+        assert_raises(TypeError, msg, as_reporter, 1)
+
+
+class TestWarnOnly(object):
+
+    def test_warn_only(self):
+        reports = []
+
+        wrapper = warn_only(lambda *report: reports.append(report))(
+            make_wrapper())
+
+        assert wrapper(1) == 1
+        assert reports == []
+
+        # Every failing input and output is reported.
+        assert wrapper(2.5, b=3) == 2.5
+        assert [report[1] for report in reports] == ["a", "b", "Output 0"]
+        assert isinstance(reports[0][2], TypeError)
+
+    def test_output_length(self):
+        reports = []
+
+        @warn_only(lambda *report: reports.append(report))
+        @validate_outputs(2, int, int)
+        def wrapper(a):
+            return a
+
+        assert wrapper(1) == 1
+        assert [report[1] for report in reports] == ["Outputs"]
+
+        assert isinstance(reports[0][2], ValueError)
+        assert str(reports[0][2]) == "Expected 2 items returned but got 1"
+
+    def test_warn_only_log(self, caplog):
+        wrapper = warn_only()(make_wrapper())
+
+        with caplog.at_level(logging.WARNING, logger="py_validate"):
+            assert wrapper(2) == 2
+
+        assert "Expected an odd integer" in caplog.text
+
+    def test_call_errors_raised(self):
+        wrapper = warn_only(lambda *report: None)(make_wrapper())
+
+        msg = "got multiple values for argument"
+        assert_raises(TypeError, msg, wrapper, 1, a=1)
+
+    def test_default_reporter(self):
+        reports = []
+
+        wrapper = make_wrapper()
+        other = warn_only(lambda *report: None)(make_wrapper())
+
+        set_reporter(lambda *report: reports.append(report))
+
+        try:
+            assert wrapper(1, 3) == 1
+            assert other(1, 3) == 1
+        finally:
+            set_reporter(None)
+
+        assert len(reports) == 1
+
+        msg = "Expected an even integer"
+        assert_raises(ValueError, msg, wrapper, 1, 3)
+
+    def test_set_reporter_none(self):
+        wrapper = warn_only(lambda *report: None)(make_wrapper())
+        wrapper.set_reporter(None)
+
+        msg = "Expected an even integer"
+        assert_raises(ValueError, msg, wrapper, 1, 3)
@@ -148,3 +148,85 @@ class TestCheckNegateShortcut(object):
         negate_check = NegateShortcut(valid)
 
         assert_raises(shortcuts.NegateFailure, msg, negate_check, value)
+
+
+class TestShortcutExpressions(object):
+
+    @pytest.mark.parametrize("expression,value", [
+        ("integer & range(0, 100)", 0),
+        ("integer & range(0, 100)", 99),
+        ("range(-1.5, 1.5)", 1.0),
+        ("len<=3", "abc"),
+        ("len == 2", [1, 2]),
+        ("re:^[a-z]+$", "abc"),
+        ("re:'^a|b$' & len<2", "b"),
+        ("in:{a, b, 1}", "a"),
+        ("in:{a, b, 1}", 1),
+        ("in:{'x y', 2.5}", "x y"),
+        ("~even | number", 2.5),
+        ("~even | number", "foo"),
+        ("~(even | odd)", "foo"),
+        ("~~even", 2),
+        ("~(~even)", 2),
+        ("~(~even & integer)", 2),
+        ("(odd | even) & range(0, 3)", 2),
+    ])
+    def test_valid_expression(self, expression, value):
+
+        # No Exception should be raised.
+        shortcuts.get_shortcut(expression)(value)
+
+    @pytest.mark.parametrize("expression,value,exc,msg", [
+        ("integer & range(0, 100)", 100, ValueError, "in range"),
+        ("integer & range(0, 100)", 1.5, TypeError, "Expected an integer"),
+        ("len<=3", "abcd", ValueError, "Expected length <= 3 but got 4"),
+        ("len<=3", 1, TypeError, "Expected an object with a length"),
+        ("re:^[a-z]+$", "ab1", ValueError, "Expected a string matching"),
+        ("re:^[a-z]+$", 1, TypeError, "Expected a string"),
+        ("in:{a, b, 1}", "c", ValueError, "Expected one of"),
+        ("in:{a, b, 1}", [1], ValueError, "Expected one of"),
+        ("~even | odd", 2, ValueError, "Expected '~even | odd' to pass"),
+        ("~(even | odd)", 2, shortcuts.NegateFailure,
+         "passed when it shouldn't have"),
+        ("~~even", 3, shortcuts.NegateFailure,
+         "passed when it shouldn't have"),
+        ("~(~even)", 3, shortcuts.NegateFailure,
+         "passed when it shouldn't have"),
+    ])
+    def test_invalid_value(self, expression, value, exc, msg):
+        checker = shortcuts.get_shortcut(expression)
+        assert_raises(exc, msg, checker, value)
+
+    @pytest.mark.parametrize("expression,msg", [
+        ("foo", "Unknown shortcut: 'foo'"),
+        ("integer & foo", "Unknown shortcut: 'foo'"),
+        ("integer &", "Invalid shortcut expression"),
+        ("(even", "Invalid shortcut expression"),
+        ("even odd", "Invalid shortcut expression"),
+        ("range(0)", "range\\(\\) expects two bounds"),
+        ("range(a, b)", "range\\(\\) bounds must be numbers"),
+        ("len<>3", "invalid length comparison"),
+        ("len<=x", "length bound must be an integer"),
+        ("re:(", "invalid regex"),
+    ])
+    def test_invalid_expression(self, expression, msg):
+        assert_raises(ValueError, msg, shortcuts.get_shortcut, expression)
+
+    def test_cached(self):
+        expression = "integer & range(0, 10)"
+        checker = shortcuts.get_shortcut(expression)
+
+        assert shortcuts.get_shortcut(expression) is checker
+        assert shortcuts.get_shortcut("integer") is shortcuts.check_integer
+
+    def test_negations_shared(self):
+        negate_even = shortcuts.get_shortcut("~even")
+
+        assert isinstance(negate_even, NegateShortcut)
+        assert shortcuts.negate_shortcut("even") is negate_even
+
+        # Negations in other expressions are shared as well.
+        hits = shortcuts.negate_shortcut.cache_info().hits
+        shortcuts.get_shortcut("number & ~even")(3)
+
+        assert shortcuts.negate_shortcut.cache_info().hits == hits + 1
@@ -0,0 +1,252 @@
+"""
+Unittests for declarative validation specs loaded from files.
+"""
+
+from py_validate.api import load_specs
+from py_validate.backend import ValidatedFunction
+from py_validate.backend.shortcuts import NegateFailure
+from py_validate.backend.specs import SpecHook
+from py_validate.tests import assert_raises
+
+import importlib
+import json
+import pickle
+import pytest
+import sys
+import textwrap
+
+source = textwrap.dedent("""
+    def scale(a, factor=2):
+        return a * factor
+
+    def pair(a):
+        return a, -a
+
+    class Shape(object):
+
+        def area(self, width, height):
+            return width * height
+
+        @staticmethod
+        def sides(n):
+            return n
+
+        @classmethod
+        def build(cls, n):
+            return cls()
+""")
+
+
+@pytest.fixture
+def package(tmp_path, monkeypatch):
+    """
+    An importable package "thirdparty" with a module "mod", which is
+    removed from `sys.modules` (along with any installed hooks) afterwards.
+    """
+
+    root = tmp_path / "thirdparty"
+    root.mkdir()
+    (root / "__init__.py").write_text("")
+    (root / "mod.py").write_text(source)
+
+    monkeypatch.syspath_prepend(str(tmp_path))
+    meta_path = list(sys.meta_path)
+
+    yield root
+
+    sys.meta_path[:] = meta_path
+
+    for name in ("thirdparty", "thirdparty.mod"):
+        sys.modules.pop(name, None)
+
+
+def import_mod():
+    return importlib.import_module("thirdparty.mod")
+
+
+class TestSpecHook(object):
+
+    def test_not_dict(self):
+        msg = "Validation specs must be a dictionary"
+        assert_raises(TypeError, msg, SpecHook, [])
+
+    @pytest.mark.parametrize("target", ["mod", "mod:", ":func"])
+    def test_invalid_target(self, target):
+        msg = "Invalid target '{target}'".format(target=target)
+        assert_raises(ValueError, msg, SpecHook, {target: {}})
+
+    def test_lazy(self, package):
+        hook = load_specs({"thirdparty.mod:scale": {"inputs": {"a": "blob"}},
+                           "thirdparty.other:func": {}})
+
+        # Specs are only parsed once their modules are imported.
+        assert hook.pending == ["thirdparty.mod:scale",
+                                "thirdparty.other:func"]
+        assert hook in sys.meta_path
+
+        msg = "Invalid validation spec for 'thirdparty.mod:scale'"
+
+        with pytest.warns(RuntimeWarning, match=msg):
+            mod = import_mod()
+
+        # The invalid spec does not fail the import.
+        assert not isinstance(mod.scale, ValidatedFunction)
+        assert list(hook.failed) == ["thirdparty.mod:scale"]
+        assert hook.pending == ["thirdparty.other:func"]
+
+    def test_failed_targets(self, package):
+        (package / "mod.py").write_text(source + "from math import sqrt\n")
+        hook = load_specs({"thirdparty.mod:sqrt": {"inputs": {"x": "number"}},
+                           "thirdparty.mod:scale": {"inputs": {"a": "number"}},
+                           "thirdparty.mod:volume": {}})
+
+        with pytest.warns(RuntimeWarning) as record:
+            mod = import_mod()
+
+        assert len(record) == 2
+
+        # The other targets of the module are still patched.
+        assert isinstance(mod.scale, ValidatedFunction)
+        assert hook.patched == ["thirdparty.mod:scale"]
+        assert hook.pending == []
+
+        msg = ("Invalid validation spec for 'thirdparty.mod:sqrt': Invalid "
+               "function parameter provided")
+        assert str(hook.failed["thirdparty.mod:sqrt"]) == msg
+
+        msg = "Target not found: 'thirdparty.mod:volume'"
+        assert str(hook.failed["thirdparty.mod:volume"]) == msg
+
+    def test_failed_already_imported(self, package):
+        mod = import_mod()
+
+        msg = "Target not found: 'thirdparty.mod:volume'"
+        assert_raises(ValueError, msg, load_specs,
+                      {"thirdparty.mod:volume": {},
+                       "thirdparty.mod:scale": {"inputs": {"a": "number"}}})
+
+        assert isinstance(mod.scale, ValidatedFunction)
+
+    def test_patch_on_import(self, package):
+        hook = load_specs({"thirdparty.mod:scale": {
+            "inputs": {"a": "number", "factor": "integer"},
+            "outputs": [1, "number"],
+        }})
+
+        mod = import_mod()
+
+        assert isinstance(mod.scale, ValidatedFunction)
+        assert mod.scale(1.5) == 3.0
+
+        msg = "Failed validation for input 'factor'"
+        assert_raises(TypeError, msg, mod.scale, 1, factor=1.5)
+
+        # The module keeps its own loader, and the hook removes itself.
+        assert type(mod.__loader__).__name__ == "SourceFileLoader"
+        assert hook.patched == ["thirdparty.mod:scale"]
+        assert hook.pending == []
+        assert hook not in sys.meta_path
+
+    def test_already_imported(self, package):
+        mod = import_mod()
+        hook = load_specs({"thirdparty.mod:pair": {"outputs": [2, None,
+                                                               "~odd"]}})
+
+        assert hook not in sys.meta_path
+        assert mod.pair(2) == (2, -2)
+
+        msg = "Failed validation for input 'Output 1'"
+        assert_raises(NegateFailure, msg, mod.pair, 3)
+
+    def test_methods(self, package):
+        load_specs({
+            "thirdparty.mod:Shape.area": {"inputs": {"width": "number"}},
+            "thirdparty.mod:Shape.sides": {"inputs": {"n": "integer"}},
+            "thirdparty.mod:Shape.build": {"inputs": {"n": "even"}},
+        })
+
+        shape = import_mod().Shape
+
+        assert shape().area(2, 3) == 6
+        assert shape.sides(4) == 4
+        assert isinstance(shape.build(2), shape)
+
+        msg = "Failed validation for input 'width'"
+        assert_raises(TypeError, msg, shape().area, "2", 3)
+
+        msg = "Failed validation for input 'n'"
+        assert_raises(TypeError, msg, shape.sides, 4.0)
+        assert_raises(ValueError, msg, shape.build, 3)
+
+    def test_stacked(self, package):
+        load_specs({"thirdparty.mod:scale": {"inputs": {"a": "number"}}})
+        mod = import_mod()
+
+        validated = mod.scale
+        load_specs({"thirdparty.mod:scale": {"outputs": [1, "integer"]}})
+
+        assert mod.scale is validated
+        assert mod.scale(1) == 2
+
+        msg = "Failed validation for input 'Output 0'"
+        assert_raises(TypeError, msg, mod.scale, 1.5)
+
+    def test_not_found(self, package):
+        import_mod()
+
+        msg = "Target not found: 'thirdparty.mod:Shape.volume'"
+        assert_raises(ValueError, msg, load_specs,
+                      {"thirdparty.mod:Shape.volume": {}})
+
+    @pytest.mark.parametrize("spec,reason", [
+        ([], "expected a dictionary"),
+        ({"input": {}}, "unexpected key\\(s\\) \\['input'\\]"),
+        ({"inputs": ["a"]}, "'inputs' must map argument names"),
+        ({"outputs": 1}, "'outputs' must list"),
+        ({"inputs": {"a": int}}, "validators must be strings"),
+        ({"outputs": [1.5]}, "Expected an integer for expected output"),
+        ({"inputs": {"a": "ndarray[blob]"}}, "Invalid array spec"),
+    ])
+    def test_invalid_spec(self, package, spec, reason):
+        import_mod()
+
+        msg = "Invalid validation spec for 'thirdparty.mod:scale': " + reason
+        assert_raises(ValueError, msg, load_specs,
+                      {"thirdparty.mod:scale": spec})
+
+    def test_json(self, package, tmp_path):
+        path = tmp_path / "specs.json"
+        path.write_text(json.dumps({
+            "thirdparty.mod:scale": {"inputs": {"a": "integer"},
+                                     "outputs": [1, "even"]},
+        }))
+
+        load_specs(path)
+        mod = import_mod()
+
+        assert mod.scale(3) == 6
+        assert_raises(TypeError, None, mod.scale, 1.5)
+
+    def test_toml(self, package, tmp_path):
+        pytest.importorskip("tomllib" if sys.version_info >= (3, 11)
+                            else "tomli")
+
+        path = tmp_path / "specs.toml"
+        path.write_text(textwrap.dedent("""
+            ["thirdparty.mod:scale"]
+            inputs = {a = "integer"}
+            outputs = [1, "even"]
+        """))
+
+        load_specs(str(path))
+        mod = import_mod()
+
+        assert mod.scale(3) == 6
+        assert_raises(TypeError, None, mod.scale, 1.5)
+
+    def test_pickle(self, package):
+        load_specs({"thirdparty.mod:scale": {"inputs": {"a": "integer"}}})
+        mod = import_mod()
+
+        # Patched functions are found by reference in their modules.
+        assert pickle.loads(pickle.dumps(mod.scale)) is mod.scale
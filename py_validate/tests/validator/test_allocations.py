@@ -0,0 +1,100 @@
+"""
+Tests that the passing path of a validated call does not allocate memory
+beyond what calling the wrapped function through a plain wrapper does.
+"""
+
+from py_validate.api import validate_inputs, validate_outputs
+
+import pytest
+import tracemalloc
+
+
+def measure(call, count):
+    """
+    Measure the memory allocated by calling a function repeatedly.
+
+    Parameters
+    ----------
+    call : callable
+        The function to call, without arguments.
+    count : int
+        The number of times to call the function.
+
+    Returns
+    -------
+    allocations : tuple
+        A tuple of the net and peak number of bytes allocated (relative to
+        before the calls), as traced by `tracemalloc`.
+    """
+
+    # Warm up caches, free lists, and the specializing interpreter.
+    for _ in range(1000):
+        call()
+
+    tracemalloc.start()
+
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+
+        for _ in range(count):
+            call()
+
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return current - before, peak - before
+
+
+def identity(a, b=2):
+    return a
+
+
+def pair(a, b=2):
+    return a, b
+
+
+class Passthrough(object):
+    """
+    Callable object that forwards calls to a function without validation.
+
+    Calling an object rather than a function re-packs keyword arguments,
+    so this is the baseline against which ValidatedFunction is compared.
+    """
+
+    def __init__(self, f):
+        self.f = f
+
+    def __call__(self, *args, **kwargs):
+        return self.f(*args, **kwargs)
+
+
+@pytest.mark.parametrize("f,decorators,args,kwargs", [
+    (identity, [validate_inputs(a=int)], (1,), {}),
+    (identity, [validate_inputs(a=int, b="even")], (1, 2), {}),
+    (identity, [validate_inputs(a="number", b="odd")], (1.5,), dict(b=3)),
+    (identity, [validate_inputs(a=lambda x: x > 0)], (1,), {}),
+    (identity, [validate_outputs(None, int)], (1,), {}),
+    (identity, [validate_outputs(-1, "integer & range(0, 10)")], (1,), {}),
+    (pair, [validate_inputs(a=int), validate_outputs(2, int, "even")],
+     (1,), {}),
+    (pair, [validate_outputs(-1, tuple)], (1,), {}),
+])
+def test_no_allocations(f, decorators, args, kwargs):
+    validated = f
+
+    for decorator in decorators:
+        validated = decorator(validated)
+
+    plain = Passthrough(f)
+    count = 10000
+
+    net, peak = measure(lambda: validated(*args, **kwargs), count)
+    plain_net, plain_peak = measure(lambda: plain(*args, **kwargs), count)
+
+    # Nothing is retained per call (which would add up to at least
+    # `count` bytes), and the passing path allocates nothing transient
+    # beyond what forwarding the arguments to the function already does.
+    assert net < count
+    assert peak <= plain_peak
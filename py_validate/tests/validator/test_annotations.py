@@ -0,0 +1,225 @@
+"""
+Unittests for the annotation-driven validator decorator.
+"""
+
+from py_validate.api import (filter_valid, validate_annotations,
+                             validate_inputs, validate_outputs)
+from py_validate.tests import assert_raises
+
+import typing
+
+
+def test_basic():
+    @validate_annotations()
+    def wrapper(a: int, b: typing.Optional[str] = None) -> int:
+        return a
+
+    assert wrapper(1) == 1
+    assert wrapper(1, "foo") == 1
+
+    msg = "Incorrect type for variable 'a'"
+    assert_raises(TypeError, msg, wrapper, 1.5)
+
+    msg = "Incorrect type for variable 'b'"
+    assert_raises(TypeError, msg, wrapper, 1, b=2)
+
+
+def test_output():
+    @validate_annotations()
+    def wrapper(a) -> typing.Tuple[int, str]:
+        return a
+
+    assert wrapper((1, "a")) == (1, "a")
+
+    msg = "Incorrect type for variable 'Output 0\\[1\\]'"
+    assert_raises(TypeError, msg, wrapper, (1, 2))
+
+    msg = "Incorrect type for variable 'Output 0'"
+    assert_raises(TypeError, msg, wrapper, 1)
+
+
+def test_none_output():
+    @validate_annotations()
+    def wrapper(a) -> None:
+        return a
+
+    assert wrapper(None) is None
+
+    msg = "expected NoneType but got int"
+    assert_raises(TypeError, msg, wrapper, 1)
+
+
+def test_string_annotations():
+    @validate_annotations()
+    def wrapper(a: "typing.List[int]") -> "int":
+        return len(a)
+
+    assert wrapper([1, 2]) == 2
+
+    msg = "Incorrect type for variable 'a\\[0\\]'"
+    assert_raises(TypeError, msg, wrapper, ["foo"])
+
+
+def test_varargs_ignored():
+    @validate_annotations()
+    def wrapper(a: int, *args: str, **kwargs: str):
+        return a
+
+    assert wrapper(1, b=2) == 1
+
+
+def test_lazy():
+    @validate_annotations(lazy=True)
+    def wrapper(a: "LaterDefined"):  # noqa: F821
+        return a
+
+    # The annotation has yet to be resolved.
+    assert wrapper._input_validators == {}
+
+    global LaterDefined
+    LaterDefined = int
+
+    try:
+        assert wrapper(1) == 1
+
+        msg = "expected int but got str"
+        assert_raises(TypeError, msg, wrapper, "foo")
+    finally:
+        del LaterDefined
+
+
+def test_lazy_unresolved():
+    @validate_annotations(lazy=True)
+    def wrapper(a: "Undefined"):  # noqa: F821
+        return a
+
+    # The failed update is kept, so no call goes through unvalidated.
+    for _ in range(2):
+        assert_raises(NameError, "Undefined", wrapper, 1)
+
+    assert len(wrapper._deferred_updates) == 1
+
+
+def test_lazy_filter_valid():
+    @validate_annotations(lazy=True)
+    def wrapper(a: int):
+        return a
+
+    assert list(filter_valid(wrapper, [(1,), ("foo",)])) == [(1,)]
+
+
+def test_unresolved():
+    def wrapper(a: "Undefined"):  # noqa: F821
+        return a
+
+    assert_raises(NameError, "Undefined",
+                  validate_annotations(), wrapper)
+
+
+def test_stacking():
+    @validate_inputs(b="even")
+    @validate_annotations()
+    def wrapper(a: int, b):
+        return a + b
+
+    assert wrapper(1, 2) == 3
+
+    msg = "Expected an even integer"
+    assert_raises(ValueError, msg, wrapper, 1, 3)
+
+    msg = "Incorrect type for variable 'a'"
+    assert_raises(TypeError, msg, wrapper, 1.5, 2)
+
+
+def test_stacking_outputs():
+    @validate_annotations()
+    @validate_outputs(2, int, str)
+    def wrapper(a: int) -> typing.Tuple[int, str]:
+        return a, str(a)
+
+    # The output validators take precedence over the return annotation.
+    assert wrapper(1) == (1, "1")
+    assert wrapper._output_validators == (int, str)
+
+    msg = "Incorrect type for variable 'a'"
+    assert_raises(TypeError, msg, wrapper, 1.5)
+
+
+def test_stacking_outputs_above():
+    @validate_outputs(2, int, str)
+    @validate_annotations()
+    def wrapper(a: int) -> typing.Tuple[int, str]:
+        return a, str(a) if a else a
+
+    # The output validators replace those from the return annotation.
+    assert wrapper(1) == (1, "1")
+    assert wrapper._output_validators == (int, str)
+
+    msg = "Incorrect type for variable 'Output 1'"
+    assert_raises(TypeError, msg, wrapper, 0)
+
+
+def test_numeric_tower():
+    @validate_annotations()
+    def wrapper(a: float, b: complex = 0j,
+                c: typing.List[float] = ()) -> float:
+        return a
+
+    assert wrapper(1) == 1
+    assert wrapper(1.5, 1, [1, 2.5]) == 1.5
+    assert wrapper(1.5, 1.5) == 1.5
+
+    msg = "Incorrect type for variable 'a'"
+    assert_raises(TypeError, msg, wrapper, "1")
+
+    msg = "Incorrect type for variable 'c\\[1\\]'"
+    assert_raises(TypeError, msg, wrapper, 1, 1, [1, "2"])
+
+
+class Point(typing.TypedDict):
+    x: int
+
+
+class Sized(typing.Protocol):
+
+    def size(self) -> int:
+        ...
+
+
+@typing.runtime_checkable
+class Named(typing.Protocol):
+
+    def name(self) -> str:
+        ...
+
+
+def test_unchecked_classes():
+    @validate_annotations()
+    def wrapper(point: Point, sized: Sized,
+                points: typing.List[Point] = ()) -> Sized:
+        return sized
+
+    # TypedDicts are checked as dicts, and static protocols not at all.
+    assert wrapper({"x": 1}, 1, [{"x": 2}]) == 1
+
+    msg = "Incorrect type for variable 'point'"
+    assert_raises(TypeError, msg, wrapper, [], 1)
+
+    msg = "Incorrect type for variable 'points\\[0\\]'"
+    assert_raises(TypeError, msg, wrapper, {}, 1, [1])
+
+
+def test_runtime_protocol():
+    class Person(object):
+
+        def name(self):
+            return "person"
+
+    @validate_annotations()
+    def wrapper(named: Named) -> str:
+        return named.name()
+
+    assert wrapper(Person()) == "person"
+
+    msg = "Incorrect type for variable 'named'"
+    assert_raises(TypeError, msg, wrapper, 1)
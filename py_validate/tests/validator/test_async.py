@@ -0,0 +1,195 @@
+"""
+Unittests for async validators on async validated functions.
+"""
+
+from py_validate.api import (AsyncValidator, ValidatorProfiler, trusted,
+                             validate_inputs, validate_outputs, warn_only)
+from py_validate.tests import assert_raises
+
+import asyncio
+import pytest
+import time
+
+# Local stand-in for a cache service holding known IDs.
+KNOWN_IDS = {1, 2, 3}
+
+
+async def known_id(x):
+    await asyncio.sleep(0.01)
+    return x in KNOWN_IDS
+
+
+async def slow_known_id(x):
+    await asyncio.sleep(0.2)
+    return x in KNOWN_IDS
+
+
+async def raising_check(x):
+    await asyncio.sleep(0)
+    raise ValueError("Lookup failed")
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+class TestAsyncValidator(object):
+
+    def test_not_async(self):
+        msg = "Expected an async function for the check"
+        assert_raises(TypeError, msg, AsyncValidator, lambda x: True)
+
+    @pytest.mark.parametrize("invalid", [0, -1.5])
+    def test_invalid_timeout(self, invalid):
+        msg = "timeout must be positive or None"
+        assert_raises(ValueError, msg, AsyncValidator,
+                      known_id, timeout=invalid)
+
+
+class TestAsyncValidation(object):
+
+    def test_sync_validators(self):
+        @validate_inputs(a=int)
+        @validate_outputs(-1, "even")
+        async def wrapper(a):
+            return a * 2
+
+        assert run(wrapper(2)) == 4
+
+        msg = "Incorrect type for variable 'a'"
+        assert_raises(TypeError, msg, run, wrapper(2.5))
+
+    def test_async_validators(self):
+        @validate_inputs(a=known_id, b=AsyncValidator(known_id, timeout=1),
+                         c=int)
+        async def wrapper(a, b, c=0):
+            return a + b + c
+
+        assert run(wrapper(1, 2)) == 3
+        assert run(wrapper(1, b=2, c=3)) == 6
+
+        msg = "Invalid value for variable 'b': 4"
+        assert_raises(ValueError, msg, run, wrapper(1, 4))
+
+        msg = "Incorrect type for variable 'c'"
+        assert_raises(TypeError, msg, run, wrapper(1, 2, c=1.5))
+
+    def test_first_failure_in_order(self):
+        @validate_inputs(a=known_id, b=slow_known_id)
+        async def wrapper(a, b):
+            return a + b
+
+        msg = "Invalid value for variable 'a': 5"
+        assert_raises(ValueError, msg, run, wrapper(5, 5))
+
+    def test_exception_failure(self):
+        @validate_inputs(a=raising_check)
+        async def wrapper(a):
+            return a
+
+        msg = "Failed validation for input 'a': Lookup failed"
+        assert_raises(ValueError, msg, run, wrapper(1))
+
+    def test_timeout(self):
+        @validate_inputs(a=AsyncValidator(slow_known_id, timeout=0.01))
+        async def wrapper(a):
+            return a
+
+        msg = ("Failed validation for input 'a': "
+               "Validator timed out after 0.01 seconds")
+        assert_raises(TimeoutError, msg, run, wrapper(1))
+
+    def test_concurrent(self):
+        @validate_inputs(a=slow_known_id, b=slow_known_id, c=slow_known_id)
+        async def wrapper(a, b, c):
+            return a + b + c
+
+        start = time.perf_counter()
+        assert run(wrapper(1, 2, 3)) == 6
+
+        # The checks take 0.2 seconds each, but run concurrently.
+        assert time.perf_counter() - start < 0.5
+
+    def test_outputs(self):
+        @validate_outputs(2, known_id, int)
+        async def wrapper(a):
+            return a, a
+
+        assert run(wrapper(1)) == (1, 1)
+
+        msg = "Invalid value for variable 'Output 0': 4"
+        assert_raises(ValueError, msg, run, wrapper(4))
+
+    def test_not_called_on_failure(self):
+        calls = []
+
+        @validate_inputs(a=known_id)
+        async def wrapper(a):
+            calls.append(a)
+
+        assert_raises(ValueError, "Invalid value", run, wrapper(4))
+        assert not calls
+
+    def test_sync_function(self):
+        @validate_inputs(a=known_id, b=AsyncValidator(known_id, timeout=1))
+        def wrapper(a, b=None):
+            return a
+
+        msg = ("Async validator for variable 'a' can "
+               "only be used with an async function")
+        assert_raises(TypeError, msg, wrapper, 1)
+
+        wrapper = validate_inputs(b=AsyncValidator(known_id))(
+            lambda a, b=None: a)
+
+        msg = ("Async validator for variable 'b' can "
+               "only be used with an async function")
+        assert_raises(TypeError, msg, wrapper, 1, 2)
+
+    def test_trusted(self):
+        @validate_inputs(a=known_id)
+        async def wrapper(a):
+            return a
+
+        with trusted():
+            assert run(wrapper(4)) == 4
+
+    def test_warn_only(self):
+        reports = []
+
+        def handler(func_name, var_name, error, suppressed):
+            reports.append((var_name, str(error)))
+
+        @warn_only(handler)
+        @validate_inputs(a=known_id, b=known_id, c=int)
+        async def wrapper(a, b, c):
+            return a + b + c
+
+        assert run(wrapper(4, 5, 1.5)) == 10.5
+        assert [var_name for var_name, _ in reports] == ["c", "a", "b"]
+
+    def test_warn_only_output_length(self):
+        reports = []
+
+        @warn_only(lambda *report: reports.append(report))
+        @validate_outputs(2, known_id, int)
+        async def wrapper(a):
+            return a
+
+        assert run(wrapper(4)) == 4
+        assert [report[1] for report in reports] == ["Outputs"]
+
+    def test_profiler(self):
+        profiler = ValidatorProfiler()
+
+        @validate_inputs(a=known_id, b=int)
+        async def wrapper(a, b):
+            return a + b
+
+        wrapper.set_profiler(profiler)
+        assert run(wrapper(1, 2)) == 3
+
+        histograms = list(profiler.dump().values())[0]
+        assert histograms["a"]["count"] == 1
+        assert histograms["b"]["count"] == 1
+        assert histograms["a"]["total"] >= 0.01
@@ -0,0 +1,207 @@
+"""
+Unittests for validating every method of a class or function of a module.
+"""
+
+from py_validate.api import (filter_valid, validate_class, validate_inputs,
+                             validate_module)
+from py_validate.backend import ValidatedFunction
+from py_validate.backend.bulk import ValidationStub
+from py_validate.tests import assert_raises
+
+import pickle
+import pytest
+import sys
+import textwrap
+import types
+
+source = textwrap.dedent("""
+    from os.path import join
+
+    def area(width: float, height: float) -> float:
+        return width * height
+
+    def count(n):
+        return n
+
+    def scale(n, factor):
+        return n * factor
+
+    def _private(n: int):
+        return n
+
+    untyped = 1
+""")
+
+
+@pytest.fixture
+def module():
+    """
+    A module "bulk_module" built from `source`, registered in `sys.modules`.
+    """
+
+    mod = types.ModuleType("bulk_module")
+    sys.modules[mod.__name__] = mod
+
+    exec(source, mod.__dict__)
+
+    yield mod
+
+    del sys.modules[mod.__name__]
+
+
+class TestValidateModule(object):
+
+    def test_annotations(self, module):
+        names = validate_module("bulk_module")
+
+        # Only public functions defined in the module with annotations.
+        assert names == ["area"]
+        assert isinstance(module.area, ValidationStub)
+
+        assert module.area(2.0, 3.0) == 6.0
+
+        # The stub replaced itself with the validated function.
+        assert isinstance(module.area, ValidatedFunction)
+
+        msg = "expected float \\| int but got str"
+        assert_raises(TypeError, msg, module.area, "2", 3.0)
+
+    def test_mapping(self, module):
+        names = validate_module(module, {"n": "integer", "factor": "even"})
+
+        assert names == ["count", "scale"]
+
+        assert module.count(1) == 1
+        assert module.scale(3, 2) == 6
+
+        msg = "Failed validation for input 'n'"
+        assert_raises(TypeError, msg, module.count, 1.5)
+
+        msg = "Failed validation for input 'factor'"
+        assert_raises(ValueError, msg, module.scale, 3, 3)
+
+    def test_include_exclude(self, module):
+        names = validate_module(module, {"n": "integer"},
+                                include=["count", "_private", "join"],
+                                exclude=["count"])
+
+        assert names == ["_private"]
+        assert_raises(TypeError, None, module._private, 1.5)
+
+    def test_lazy(self, module):
+        validate_module(module, {"n": "integer"})
+        stub = module.count
+
+        # Nothing is built until the first call.
+        assert stub._validated is None
+        assert stub(1) == 1
+
+        assert isinstance(stub._validated, ValidatedFunction)
+        assert stub.resolve() is module.count
+
+        # Calls through references to the stub still validate.
+        assert_raises(TypeError, None, stub, 1.5)
+
+    def test_precedence(self, module):
+        module.scale = validate_inputs(factor="odd")(module.scale)
+        validate_module(module, {"n": "integer", "factor": "even"})
+
+        assert module.scale(2, 3) == 6
+        assert_raises(TypeError, None, module.scale, 2.5, 3)
+
+    def test_invalid_policy(self, module):
+        msg = "Policy must either be a dictionary"
+        assert_raises(TypeError, msg, validate_module, module, "types")
+
+        msg = "Unknown shortcut: 'blob'"
+        assert_raises(ValueError, msg, validate_module, module, {"n": "blob"})
+
+    def test_stub_attributes(self, module):
+        validate_module(module, {"n": "integer"})
+
+        # The stub stands in for the ValidatedFunction.
+        assert module.count.unchecked(1.5) == 1.5
+        assert list(filter_valid(module.scale, [(1, 2), (1.5, 2)])) == [(1, 2)]
+
+    def test_pickle(self, module):
+        validate_module(module, {"n": "integer"})
+
+        stub = module.count
+        assert pickle.loads(pickle.dumps(stub)) is stub
+
+        stub(1)
+        assert pickle.loads(pickle.dumps(stub)) is module.count
+
+
+class TestValidateClass(object):
+
+    def test_methods(self):
+        @validate_class({"n": "integer"})
+        class Counter(object):
+
+            def __init__(self, n):
+                self.n = n
+
+            def add(self, n):
+                return self.n + n
+
+            @staticmethod
+            def double(n):
+                return 2 * n
+
+            @classmethod
+            def build(cls, n):
+                return cls(n)
+
+        # Private methods, including __init__, are skipped by default.
+        assert vars(Counter)["__init__"].__class__ is types.FunctionType
+        assert isinstance(vars(Counter)["add"], ValidationStub)
+
+        counter = Counter.build(1)
+
+        assert counter.add(2) == 3
+        assert Counter.double(2) == 4
+
+        assert isinstance(vars(Counter)["add"], ValidatedFunction)
+        assert isinstance(vars(Counter)["double"], staticmethod)
+
+        msg = "Failed validation for input 'n'"
+        assert_raises(TypeError, msg, counter.add, 1.5)
+        assert_raises(TypeError, msg, Counter.double, 1.5)
+        assert_raises(TypeError, msg, Counter.build, 1.5)
+
+    def test_annotations(self):
+        @validate_class()
+        class Shape(object):
+
+            def area(self, width: float, height: float) -> float:
+                return width * height
+
+            def name(self):
+                return "shape"
+
+        assert isinstance(vars(Shape)["name"], types.FunctionType)
+        assert Shape().area(2.0, 3.0) == 6.0
+
+        # Ints are accepted for floats, as with static type checkers.
+        assert Shape().area(2.0, 3) == 6.0
+
+        msg = "expected float \\| int but got str"
+        assert_raises(TypeError, msg, Shape().area, 2.0, "3")
+
+    def test_annotations_precedence(self):
+        @validate_class()
+        class Counter(object):
+
+            @validate_inputs(n="even")
+            def add(self, n: int, m: int):
+                return n + m
+
+        assert Counter().add(2, 1) == 3
+
+        assert_raises(ValueError, None, Counter().add, 1, 1)
+        assert_raises(TypeError, None, Counter().add, 2, 1.5)
+
+    def test_invalid_policy(self):
+        msg = "Unknown shortcut: 'blob'"
+        assert_raises(ValueError, msg, validate_class, {"n": "blob"})
@@ -0,0 +1,261 @@
+"""
+Unittests for inheriting the validators of methods in their overrides.
+"""
+
+from py_validate.api import (InheritContracts, validate_annotations,
+                             validate_inputs, validate_outputs)
+from py_validate.backend import ValidatedFunction
+from py_validate.backend.base import _plan_attributes
+from py_validate.backend.contracts import find_contract, inherit_contracts
+from py_validate.tests import assert_raises
+
+import abc
+import pytest
+
+
+class Shape(InheritContracts, abc.ABC):
+
+    @abc.abstractmethod
+    @validate_inputs(scale="number")
+    @validate_outputs(1, "number")
+    def area(self, scale):
+        pass
+
+    def name(self):
+        return "shape"
+
+
+class Square(Shape):
+
+    def __init__(self, side):
+        self.side = side
+
+    def area(self, scale):
+        return self.side ** 2 * scale
+
+    def name(self):
+        return "square"
+
+
+class ColoredSquare(Square):
+
+    def area(self, scale):
+        return "red"
+
+
+def assert_shared(validated, contract):
+    for name in _plan_attributes:
+        assert getattr(validated, name) is getattr(contract, name)
+
+
+class TestInheritContracts(object):
+
+    def test_abstract(self):
+        assert vars(Shape)["area"].__isabstractmethod__
+
+        msg = "abstract method"
+        assert_raises(TypeError, msg, Shape)
+
+        # The override is validated, but no longer abstract.
+        assert isinstance(vars(Square)["area"], ValidatedFunction)
+        assert not getattr(vars(Square)["area"], "__isabstractmethod__",
+                           False)
+
+    @pytest.mark.parametrize("order", ["inner", "outer"])
+    def test_decorator_order(self, order):
+        if order == "inner":
+            class Base(InheritContracts, abc.ABC):
+
+                @validate_inputs(n="integer")
+                @abc.abstractmethod
+                def f(self, n):
+                    pass
+        else:
+            class Base(InheritContracts, abc.ABC):
+
+                @abc.abstractmethod
+                @validate_inputs(n="integer")
+                def f(self, n):
+                    pass
+
+        class Child(Base):
+
+            def f(self, n):
+                return n
+
+        assert_raises(TypeError, "abstract method", Base)
+
+        assert Child().f(1) == 1
+        assert_raises(TypeError, None, Child().f, 1.5)
+
+    def test_override(self):
+        square = Square(2)
+        assert square.area(2) == 8
+
+        msg = "Failed validation for input 'scale'"
+        assert_raises(TypeError, msg, square.area, "2")
+
+        msg = "Failed validation for input 'Output 0'"
+        assert_raises(TypeError, msg, ColoredSquare(2).area, 2)
+
+    def test_shared_plan(self):
+        contract = vars(Shape)["area"]
+
+        # Overrides at every level share the plan built for the contract.
+        assert_shared(vars(Square)["area"], contract)
+        assert_shared(vars(ColoredSquare)["area"], contract)
+
+        assert find_contract(ColoredSquare, "area") is vars(Square)["area"]
+
+    def test_unvalidated(self):
+        # Overrides of methods without validators are left as they are.
+        assert not isinstance(vars(Square)["name"], ValidatedFunction)
+        assert find_contract(Square, "name") is None
+
+    def test_independent(self):
+        class Base(InheritContracts):
+
+            @validate_inputs(n="integer")
+            def f(self, n):
+                return n
+
+        class Child(Base):
+
+            def f(self, n):
+                return n
+
+        vars(Child)["f"].update_exp_output_len(1)
+        vars(Child)["f"].update_output_validators("even")
+
+        assert Base().f(1) == 1
+        assert_raises(ValueError, None, Child().f, 1)
+
+        assert vars(Base)["f"]._output_validators == ()
+
+    def test_static_and_class_methods(self):
+        class Base(InheritContracts):
+
+            @staticmethod
+            @validate_inputs(n="integer")
+            def double(n):
+                return 2 * n
+
+            @classmethod
+            @validate_inputs(n="integer")
+            def build(cls, n):
+                return n
+
+        class Child(Base):
+
+            @staticmethod
+            def double(n):
+                return 3 * n
+
+            @classmethod
+            def build(cls, n):
+                return cls
+
+        assert isinstance(vars(Child)["double"], staticmethod)
+        assert isinstance(vars(Child)["build"], classmethod)
+
+        assert Child.double(2) == 6
+        assert Child.build(2) is Child
+
+        msg = "Failed validation for input 'n'"
+        assert_raises(TypeError, msg, Child.double, 1.5)
+        assert_raises(TypeError, msg, Child.build, 1.5)
+
+    def test_mismatched_arguments(self):
+        msg = "does not accept validated argument\\(s\\) \\['scale'\\]"
+
+        def build():
+            class Circle(Shape):
+
+                def area(self, factor):
+                    return factor
+
+        assert_raises(ValueError, msg, build)
+
+    def test_variadic_override(self):
+        class Circle(Shape):
+
+            def area(self, *args, **kwargs):
+                return 3.0 * (args or tuple(kwargs.values()))[0]
+
+        assert Circle().area(2) == 6.0
+        assert Circle().area(scale=2) == 6.0
+
+        msg = "Failed validation for input 'scale'"
+        assert_raises(TypeError, msg, Circle().area, "2")
+        assert_raises(TypeError, msg, Circle().area, scale="2")
+
+        class Disc(Circle):
+
+            def area(self, *args, **kwargs):
+                return 3.0 * args[0]
+
+        assert Disc().area(2) == 6.0
+        assert_raises(TypeError, msg, Disc().area, "2")
+
+    def test_validated_override(self):
+        class Base(InheritContracts):
+
+            @validate_inputs(a="integer", b="integer")
+            @validate_outputs(1, "integer")
+            def f(self, a, b):
+                return a + b
+
+        class Child(Base):
+
+            @validate_inputs(a="even")
+            def f(self, a, b):
+                return a + b
+
+        child = Child()
+        assert child.f(2, 1) == 3
+
+        # The override keeps its own validators, and gains the others.
+        assert_raises(ValueError, None, child.f, 1, 1)
+        assert_raises(TypeError, None, child.f, 2, 1.5)
+        assert_raises(TypeError, None, child.f, 2.0, 1)
+
+        # The base class is unaffected.
+        assert Base().f(1, 1) == 2
+
+    def test_lazy_contract(self):
+        class Base(InheritContracts):
+
+            @validate_annotations(lazy=True)
+            def f(self, n: int) -> int:
+                return n
+
+        class Child(Base):
+
+            def f(self, n):
+                return n
+
+        assert Child().f(1) == 1
+        assert_raises(TypeError, None, Child().f, 1.5)
+
+        assert_shared(vars(Child)["f"], vars(Base)["f"])
+
+    def test_plain_class(self):
+        class Base(object):
+
+            @validate_inputs(n="integer")
+            def f(self, n):
+                return n
+
+        class Child(Base):
+
+            def f(self, n):
+                return n
+
+            def g(self):
+                pass
+
+        # Without the mixin, contracts are only inherited on request.
+        assert Child().f(1.5) == 1.5
+        assert inherit_contracts(Child) == ["f"]
+
+        assert_raises(TypeError, None, Child().f, 1.5)
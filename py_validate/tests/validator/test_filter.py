@@ -0,0 +1,52 @@
+"""
+Unittests for the streaming `filter_valid` helper.
+"""
+
+from py_validate.api import filter_valid, validate_inputs
+from py_validate.tests import assert_raises
+
+
+@validate_inputs(a=int, b="even")
+def wrapper(a, b=0):
+    raise AssertionError("The wrapped function should never be called")
+
+
+def test_positional():
+    items = [(1, 2), (1.5, 2), (3, 3), (4,)]
+    assert list(filter_valid(wrapper, items)) == [(1, 2), (4,)]
+
+
+def test_keyword():
+    items = [dict(a=1, b=2), dict(a="foo"), dict(b=4, a=-1)]
+    assert list(filter_valid(wrapper, items)) == [dict(a=1, b=2),
+                                                  dict(b=4, a=-1)]
+
+
+def test_errors():
+    items = [(1, 2), (1.5, 2), (3, 3)]
+    result = list(filter_valid(wrapper, items, errors=True))
+
+    assert result[0] == ((1, 2), None)
+
+    item, error = result[1]
+    assert item == (1.5, 2)
+    assert isinstance(error, TypeError)
+    assert "Incorrect type for variable 'a'" in str(error)
+
+    item, error = result[2]
+    assert item == (3, 3)
+    assert isinstance(error, ValueError)
+    assert "Failed validation for input 'b'" in str(error)
+
+
+def test_lazy():
+    def generate():
+        yield 1, 2
+        raise AssertionError("The iterable should be consumed lazily")
+
+    assert next(filter_valid(wrapper, generate())) == (1, 2)
+
+
+def test_not_validated():
+    msg = "Expected a function decorated"
+    assert_raises(TypeError, msg, filter_valid, lambda a: a, [(1,)])
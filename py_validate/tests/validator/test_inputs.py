@@ -6,7 +6,11 @@ from py_validate.backend.shortcuts import NegateFailure
 from py_validate.api import validate_inputs
 from py_validate.tests import assert_raises
 
+import gc
+import pytest
 import sys
+import time
+import typing
 
 
 def f(a):
@@ -215,3 +219,77 @@ class TestShortcuts(object):
 
         msg = "'number' passed when it shouldn't have"
         assert_raises(NegateFailure, msg, wrapper, 1)
+
+    def test_expression(self):
+        @validate_inputs(a="integer & range(0, 10)", b="~even | len<2")
+        def wrapper(a, b):
+            return a
+
+        assert wrapper(1, 3) == 1
+        assert wrapper(9, "a") == 9
+
+        msg = "Failed validation for input 'a': Expected a number in range"
+        assert_raises(ValueError, msg, wrapper, 10, 3)
+
+        msg = "Failed validation for input 'b'"
+        assert_raises(ValueError, msg, wrapper, 1, 2)
+
+
+def test_generic():
+    @validate_inputs(rows=typing.List[typing.Dict[str, int]],
+                     key=typing.Optional[str])
+    def wrapper(rows, key=None):
+        return len(rows)
+
+    assert wrapper([{"a": 1}], "a") == 1
+    assert wrapper([], key=None) == 0
+
+    msg = ("Incorrect type for variable 'rows\\[0\\]\\['a'\\]': "
+           "expected int but got str instead")
+    assert_raises(TypeError, msg, wrapper, [{"a": "b"}])
+
+    msg = "Incorrect type for variable 'key': expected Optional\\[str\\]"
+    assert_raises(TypeError, msg, wrapper, [], key=1)
+
+
+@pytest.mark.parametrize("validator", [
+    lambda x: False, "len<5", typing.List[str]])
+def test_large_value_failure(validator):
+    @validate_inputs(a=validator)
+    def wrapper(a):
+        return a
+
+    val = list(range(5 * 10 ** 6))
+
+    # Free the values of earlier cases (kept in reference cycles through
+    # their tracebacks) now, rather than in a collection while timing.
+    gc.collect()
+    start = time.perf_counter()
+
+    with pytest.raises((TypeError, ValueError)) as exc_info:
+        wrapper(val)
+
+    message = exc_info.value.args[0]
+    assert time.perf_counter() - start < 0.1
+
+    assert len(message) < 300
+    assert exc_info.value.value is val
+
+
+def test_failure_value():
+    @validate_inputs(a=lambda x: x > 0, b=int)
+    def wrapper(a, b=0):
+        return a
+
+    msg = "Invalid value for variable 'a': -1"
+    assert_raises(ValueError, msg, wrapper, -1)
+
+    for args in [(-1,), (1, 1.5)]:
+        with pytest.raises((TypeError, ValueError)) as exc_info:
+            wrapper(*args)
+
+        assert exc_info.value.value == args[-1]
+
+        # The message is a plain string, for callers that read it directly.
+        message = exc_info.value.args[0]
+        assert type(message) is str and message == str(exc_info.value)
@@ -68,6 +68,45 @@ class TestOutputCount(object):
         msg = "Incorrect type for variable"
         assert_raises(TypeError, msg, wrapper, 0)
 
+    def test_output_zero_count(self):
+        @validate_outputs(0)
+        def wrapper(a):
+            return a
+
+        assert wrapper(()) == ()
+
+        msg = "Expected 0 items returned but got 1"
+        assert_raises(ValueError, msg, wrapper, 1)
+
+        msg = "Expected 0 items returned but got 2"
+        assert_raises(ValueError, msg, wrapper, (1, 2))
+
+    def test_output_count_update(self):
+        @validate_outputs(None, int, None, "even")
+        def wrapper(a):
+            return a
+
+        # Element-wise validation, skipping outputs without validators.
+        assert wrapper((1, "foo", 2)) == (1, "foo", 2)
+        assert wrapper((1, "foo")) == (1, "foo")
+        assert wrapper(1) == 1
+
+        msg = "Failed validation for input 'Output 2'"
+        assert_raises(ValueError, msg, wrapper, (1, "foo", 3))
+
+        # Whole-tuple validation.
+        wrapper.update_exp_output_len(-1)
+
+        msg = "Incorrect type for variable 'Output 0'"
+        assert_raises(TypeError, msg, wrapper, (1, "foo", 2))
+
+        # Fixed-length validation.
+        wrapper.update_exp_output_len(3)
+        assert wrapper((1, "foo", 2)) == (1, "foo", 2)
+
+        msg = "Expected 3 items returned but got 2"
+        assert_raises(ValueError, msg, wrapper, (1, "foo"))
+
 
 def test_basic():
     @validate_outputs(None, int)
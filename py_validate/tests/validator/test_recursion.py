@@ -0,0 +1,188 @@
+"""
+Unittests for validating only the outermost call of recursive functions.
+"""
+
+from py_validate.api import (outermost_only, validate_inputs,
+                             validate_outputs)
+from py_validate.tests import CountingCheck, assert_raises
+
+import asyncio
+import sys
+import threading
+
+
+def make_tree(depth):
+    tree = {"value": 0, "children": []}
+    node = tree
+
+    for i in range(1, depth):
+        child = {"value": i, "children": []}
+        node["children"].append(child)
+        node = child
+
+    return tree
+
+
+def make_sum(outermost, check):
+    @validate_inputs(node=check)
+    @validate_outputs(-1, int)
+    def tree_sum(node):
+        return node["value"] + sum(tree_sum(child)
+                                   for child in node["children"])
+
+    if outermost:
+        tree_sum = outermost_only()(tree_sum)
+
+    return tree_sum
+
+
+def test_outermost_only():
+    check = CountingCheck()
+    tree_sum = make_sum(True, check)
+
+    assert tree_sum(make_tree(100)) == 4950
+    assert check.calls == 1
+
+    # Each top-level call is validated.
+    assert tree_sum(make_tree(10)) == 45
+    assert check.calls == 2
+
+
+def test_all_calls():
+    check = CountingCheck()
+    tree_sum = make_sum(False, check)
+
+    assert tree_sum(make_tree(100)) == 4950
+    assert check.calls == 100
+
+
+def test_outermost_failure():
+    @outermost_only()
+    @validate_inputs(n=int)
+    @validate_outputs(-1, "even")
+    def countdown(n):
+        return 0 if n <= 0 else countdown(n - 1.5)
+
+    # Inner calls (with floats) are not validated.
+    assert countdown(10) == 0
+
+    msg = "Incorrect type for variable 'n'"
+    assert_raises(TypeError, msg, countdown, 1.5)
+
+    @outermost_only()
+    @validate_outputs(-1, "even")
+    def odd(n):
+        return 1 if n <= 0 else odd(n - 1)
+
+    assert_raises(ValueError, "Failed validation", odd, 3)
+
+    # Validation works again after a failure.
+    assert countdown(10) == 0
+    assert_raises(TypeError, msg, countdown, 1.5)
+
+
+def test_mutual_recursion():
+    is_even_check = CountingCheck()
+    is_odd_check = CountingCheck()
+
+    @outermost_only()
+    @validate_inputs(n=is_even_check)
+    def is_even(n):
+        return True if n == 0 else is_odd(n - 1)
+
+    @outermost_only()
+    @validate_inputs(n=is_odd_check)
+    def is_odd(n):
+        return False if n == 0 else is_even(n - 1)
+
+    assert is_even(10)
+
+    # Each function validates its own outermost call.
+    assert is_even_check.calls == 1
+    assert is_odd_check.calls == 1
+
+
+def test_per_thread():
+    check = CountingCheck()
+    main = threading.current_thread()
+    started = threading.Event()
+    inside = threading.Event()
+    released = []
+
+    @outermost_only()
+    @validate_inputs(n=check)
+    def blocking(n):
+        if n == 0:
+            if threading.current_thread() is main:
+                inside.set()
+            else:
+                started.set()
+                released.append(inside.wait(5))
+
+            return 0
+
+        return blocking(n - 1)
+
+    thread = threading.Thread(target=blocking, args=(5,))
+    thread.start()
+    assert started.wait(5)
+
+    # The other thread is inside `blocking` until this call gets there too,
+    # but this call is outermost in this thread, so it is validated.
+    assert blocking(3) == 0
+
+    thread.join()
+    assert released == [True]
+    assert check.calls == 2
+
+
+def test_async():
+    check = CountingCheck()
+
+    @outermost_only()
+    @validate_inputs(n=check)
+    async def countdown(n):
+        await asyncio.sleep(0)
+        return 0 if n == 0 else await countdown(n - 1)
+
+    async def main():
+        return await asyncio.gather(countdown(10), countdown(5))
+
+    assert asyncio.run(main()) == [0, 0]
+
+    # Only the two top-level calls are validated, not the recursive
+    # calls that they await, even though they run concurrently.
+    assert check.calls == 2
+
+
+def test_set_outermost_only():
+    check = CountingCheck()
+    tree_sum = make_sum(True, check)
+
+    tree_sum.set_outermost_only(False)
+    tree_sum(make_tree(10))
+
+    assert check.calls == 10
+
+
+def test_deep_recursion():
+    depth = 500
+    tree = make_tree(depth)
+
+    limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(max(limit, 10 * depth))
+
+    try:
+        calls = []
+
+        for outermost in (False, True):
+            check = CountingCheck()
+            tree_sum = make_sum(outermost, check)
+
+            assert tree_sum(tree) == depth * (depth - 1) // 2
+            calls.append(check.calls)
+    finally:
+        sys.setrecursionlimit(limit)
+
+    # Only the outermost call of a 500-deep recursion is validated.
+    assert calls == [depth, 1]
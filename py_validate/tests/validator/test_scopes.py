@@ -0,0 +1,67 @@
+"""
+Unittests for scopes that change how validated functions are called.
+"""
+
+from py_validate.api import trusted, validate_inputs, validate_outputs
+from py_validate.tests import assert_raises
+
+import threading
+
+
+@validate_inputs(a=int)
+@validate_outputs(None, "even")
+def wrapper(a):
+    return a
+
+
+def test_trusted():
+    msg = "Incorrect type for variable 'a'"
+    assert_raises(TypeError, msg, wrapper, 2.5)
+
+    with trusted():
+        assert wrapper(2.5) == 2.5
+        assert wrapper(3) == 3
+
+        # Scopes can be nested.
+        with trusted():
+            assert wrapper(2.5) == 2.5
+
+        assert wrapper(2.5) == 2.5
+
+    assert_raises(TypeError, msg, wrapper, 2.5)
+
+
+def test_trusted_exception():
+    try:
+        with trusted():
+            raise RuntimeError
+    except RuntimeError:
+        pass
+
+    msg = "Incorrect type for variable 'a'"
+    assert_raises(TypeError, msg, wrapper, 2.5)
+
+
+def test_trusted_thread_local():
+    errors = []
+
+    def call():
+        try:
+            wrapper(2.5)
+        except TypeError as e:
+            errors.append(e)
+
+    with trusted():
+        thread = threading.Thread(target=call)
+        thread.start()
+        thread.join()
+
+    assert len(errors) == 1
+
+
+def test_unchecked():
+    assert wrapper.unchecked(2.5) == 2.5
+    assert wrapper.unchecked(a=3) == 3
+
+    msg = "Failed validation for input 'Output 0'"
+    assert_raises(ValueError, msg, wrapper, 3)
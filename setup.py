@@ -10,6 +10,7 @@ setup(
               "py_validate.tests.backend",
               "py_validate.tests.validator"],
     include_package_data=True,
+    python_requires=">=3.10",
     license="MIT License",
     description="Python function validators",
     long_description="py-validate is a library that provides easy-to-use\n"
@@ -29,11 +30,11 @@ setup(
         "Intended Audience :: End Users/Desktop",
         "License :: OSI Approved :: MIT License",
         "Programming Language :: Python",
-        "Programming Language :: Python :: 2",
         "Programming Language :: Python :: 3",
-        "Programming Language :: Python :: 2.7",
-        "Programming Language :: Python :: 3.5",
-        "Programming Language :: Python :: 3.6",
+        "Programming Language :: Python :: 3 :: Only",
+        "Programming Language :: Python :: 3.10",
+        "Programming Language :: Python :: 3.11",
+        "Programming Language :: Python :: 3.12",
         "Natural Language :: English",
         "Topic :: Software Development :: Libraries",
         "Topic :: Software Development :: Pre-processors",